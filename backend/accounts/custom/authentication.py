@@ -0,0 +1,91 @@
+"""
+JWT authentication without a per-request user query.
+
+Access tokens issued by ``CustomTokenObtainPairSerializer`` carry the
+user's username and permission flags as claims. ``CachedJWTAuthentication``
+serves ``request.user`` from a short-lived in-process cache of ``User``
+rows and goes to the database only when the entry is missing, older than
+``BLOG_AUTH_USER_CACHE_TIMEOUT`` seconds, or disagrees with the token's
+claims (the user changed since the cache was filled, e.g. in another
+process). Changes made in this process evict the entry right away, see
+``accounts.signals``.
+"""
+import copy
+import threading
+import time
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+# Claims copied from the user into the token
+USER_CLAIMS = ('username', 'is_staff', 'is_superuser')
+
+
+def add_user_claims(token, user):
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+def claims_match(user, validated_token):
+    return all(validated_token[claim] == getattr(user, claim) for claim in USER_CLAIMS)
+
+
+class UserCache:
+    """
+    Per-process ``{user id: (loaded at, user)}``. Ids are kept as strings,
+    the way tokens carry them.
+    """
+
+    def __init__(self):
+        self._users = {}
+        self._lock = threading.Lock()
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'BLOG_AUTH_USER_CACHE_TIMEOUT', 30)
+
+    def get(self, user_id):
+        entry = self._users.get(str(user_id))
+        if entry is None or time.monotonic() - entry[0] > self.timeout:
+            return None
+        # Views may modify request.user; they get their own copy
+        return copy.copy(entry[1])
+
+    def set(self, user):
+        with self._lock:
+            self._users[str(user.pk)] = (time.monotonic(), copy.copy(user))
+
+    def discard(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._users.pop(str(user_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` backed by ``user_cache``. Tokens without the user
+    claims (issued before they were added) are checked against the database
+    every time, as before.
+    """
+
+    def get_user(self, validated_token):
+        if not all(claim in validated_token for claim in USER_CLAIMS):
+            return super().get_user(validated_token)
+
+        user = user_cache.get(validated_token.get(api_settings.USER_ID_CLAIM))
+        if user is not None and claims_match(user, validated_token):
+            return user
+
+        # Raises AuthenticationFailed for missing and inactive users
+        user = super().get_user(validated_token)
+        user_cache.set(user)
+        return user
@@ -4,8 +4,15 @@ from rest_framework_simplejwt.serializers import *
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth.models import User
 
+from .authentication import add_user_claims
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
+    @classmethod
+    def get_token(cls, user):
+        # Copied into every access token minted from this refresh token
+        return add_user_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         authenticate_kwargs = {
             self.username_field: attrs[self.username_field],
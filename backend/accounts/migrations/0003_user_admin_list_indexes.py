@@ -0,0 +1,25 @@
+# Indexes on auth_user for the paginated admin user list. auth.User belongs
+# to another app, so they are plain SQL rather than Meta.indexes, and the
+# model state does not know about them; IF [NOT] EXISTS keeps the
+# migration safe to re-apply.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_delete_userprofile'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS auth_user_date_joined_idx ON auth_user (date_joined, id)',
+            'DROP INDEX IF EXISTS auth_user_date_joined_idx',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS auth_user_admin_filter_idx ON auth_user (is_staff, is_active, date_joined, id)',
+            'DROP INDEX IF EXISTS auth_user_admin_filter_idx',
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .custom.authentication import user_cache
+
+
+def evict_users(*user_ids):
+    # Now for this request, and again after commit in case another request
+    # cached the old row in between
+    user_cache.discard(*user_ids)
+    transaction.on_commit(lambda: user_cache.discard(*user_ids))
+
+
+@receiver(post_save, sender=User)
+def evict_saved_user(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    evict_users(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def evict_deleted_user(sender, instance, **kwargs):
+    evict_users(instance.pk)
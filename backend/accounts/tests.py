@@ -1,3 +1,46 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .custom.authentication import user_cache
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='secret-password', is_staff=True)
+        cls.editor = User.objects.create_user('editor', password='secret-password')
+
+    def setUp(self):
+        user_cache.clear()
+
+    def login(self, username):
+        response = self.client.post('/api/auth/get-access-token/',
+                                    {'username': username, 'password': 'secret-password'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return {'HTTP_AUTHORIZATION': f'Bearer {response.data["access"]}'}
+
+    def get(self, auth, path='/api/admin/categories/'):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path, **auth)
+        user_queries = [query for query in queries if 'FROM "auth_user"' in query['sql']]
+        return response.status_code, len(user_queries)
+
+    def test_user_is_loaded_once_and_evicted_on_change(self):
+        admin, editor = self.login('admin'), self.login('editor')
+        self.assertEqual(self.get(admin), (200, 1))
+        self.assertEqual(self.get(admin), (200, 0))
+        self.assertEqual(self.get(editor), (403, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/admin/users/{self.editor.id}/deactivate/', **admin)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get(editor)[0], 401)
+
+    def test_token_claims_newer_than_the_cached_user_reload_it(self):
+        self.assertEqual(self.get(self.login('editor')), (403, 1))
+        # Promoted without signals, as if by another process
+        User.objects.filter(id=self.editor.id).update(is_staff=True)
+        self.assertEqual(self.get(self.login('editor')), (200, 1))
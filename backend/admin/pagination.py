@@ -0,0 +1,42 @@
+import functools
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+
+class CountedPaginator(Paginator):
+    """
+    Django paginator that takes the total from ``count`` (a callable)
+    instead of running COUNT(*) on the queryset
+    """
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._count = count
+
+    @cached_property
+    def count(self):
+        if self._count is None:
+            return super().count
+        return self._count()
+
+
+class AdminPageNumberPagination(PageNumberPagination):
+    """
+    Numbered pages with a total count, for the admin tables. Views can
+    provide a cheaper total than COUNT(*) with ``get_count(queryset)``.
+    """
+    page_size_query_param = 'page_size'
+
+    def __init__(self):
+        self.page_size = getattr(settings, 'BLOG_ADMIN_PAGE_SIZE', 20)
+        self.max_page_size = getattr(settings, 'BLOG_ADMIN_MAX_PAGE_SIZE', 100)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        get_count = getattr(view, 'get_count', None)
+        self.django_paginator_class = functools.partial(
+            CountedPaginator, count=get_count and functools.partial(get_count, queryset)
+        )
+        return super().paginate_queryset(queryset, request, view)
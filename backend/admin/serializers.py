@@ -1,8 +1,25 @@
+from django.conf import settings
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from blog.models import Category, Article
 
+class AdminUserListSerializer(serializers.ModelSerializer):
+    """
+    Table row for the admin user list
+    """
+    permission = serializers.SerializerMethodField()
+    isActive = serializers.BooleanField(source='is_active')
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'first_name', 'last_name', 'permission', 'isActive', 'date_joined']
+        read_only_fields = fields
+
+    def get_permission(self, obj):
+        return 'admin' if obj.is_staff else 'user'
+
+
 class AdminUserSerializer(serializers.ModelSerializer):
     permission = serializers.SerializerMethodField()
     isActive = serializers.BooleanField(source='is_active')
@@ -10,6 +27,8 @@ class AdminUserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username', 'password', 'email', 'first_name', 'last_name', 'permission', 'isActive', 'date_joined']
+        # The hash is never sent back to the client
+        extra_kwargs = {'password': {'write_only': True}}
 
     def get_permission(self, obj):
         return 'admin' if obj.is_staff else 'user'
@@ -52,6 +71,25 @@ class AdminCategorySerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
+class AdminArticleListSerializer(serializers.ModelSerializer):
+    """
+    Table row for the admin article list: no content
+    """
+    category_data = AdminCategorySerializer(source='category', read_only=True)
+    author_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Article
+        fields = ['id', 'title', 'excerpt', 'author', 'author_name', 'date', 'read_time',
+                  'category', 'category_data', 'status', 'publish_at', 'featured', 'created_at', 'updated_at']
+        read_only_fields = fields
+
+    def get_author_name(self, obj):
+        if obj.author.first_name and obj.author.last_name:
+            return f"{obj.author.first_name} {obj.author.last_name}"
+        return obj.author.username
+
+
 class AdminArticleSerializer(serializers.ModelSerializer):
     category_data = AdminCategorySerializer(source='category', read_only=True)
     author_name = serializers.SerializerMethodField()
@@ -59,7 +97,9 @@ class AdminArticleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Article
         fields = ['id', 'title', 'excerpt', 'content', 'author', 'author_name', 'date', 'read_time', 
-                 'image', 'category', 'category_data', 'status', 'created_at', 'updated_at']
+                 'image', 'category', 'category_data', 'status', 'publish_at', 'featured', 'created_at', 'updated_at']
+        # Uniqueness is checked (with our own message) in validate_title
+        extra_kwargs = {'title': {'validators': []}}
     
     def get_author_name(self, obj):
         if obj.author.first_name and obj.author.last_name:
@@ -72,22 +112,40 @@ class AdminArticleSerializer(serializers.ModelSerializer):
         return value
 
     def update(self, instance, validated_data):
-        
-        # Update category if provided
-        category_id = validated_data.get('category')
-        if category_id:
-            instance.category_id = category_id.id if hasattr(category_id, 'id') else category_id
-            
-        # Update author if provided
-        author_id = validated_data.get('author')
-        if author_id:
-            instance.author_id = author_id.id if hasattr(author_id, 'id') else author_id
-            
-        # Update title if provided
+        # Every sent field is applied, falsy ones too: featured=False and
+        # publish_at=None are how an article is un-featured or unscheduled
         for key, value in validated_data.items():
-            if value:
-                setattr(instance, key, value)
+            setattr(instance, key, value)
 
         instance.save()
         return instance
         
+
+
+class BulkIdsField(serializers.ListField):
+
+    def __init__(self, **kwargs):
+        super().__init__(
+            child=serializers.IntegerField(min_value=1), allow_empty=False,
+            max_length=getattr(settings, 'BLOG_ADMIN_BULK_MAX_IDS', 1000), **kwargs
+        )
+
+    def to_internal_value(self, data):
+        # Drop duplicates, keep the request order for the per-item results
+        return list(dict.fromkeys(super().to_internal_value(data)))
+
+
+class AdminArticleBulkSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=['publish', 'unpublish', 'delete', 'move'])
+    ids = BulkIdsField()
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all(), required=False)
+
+    def validate(self, attrs):
+        if attrs['action'] == 'move' and 'category' not in attrs:
+            raise serializers.ValidationError({'category': 'category is required to move articles'})
+        return attrs
+
+
+class AdminUserBulkSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=['activate', 'deactivate'])
+    ids = BulkIdsField()
@@ -0,0 +1,82 @@
+"""
+Server-sent event stream of content changes for the admin panel.
+
+``GET /api/admin/events/`` streams the events of ``blog.events`` as
+``text/event-stream``, one JSON ``data:`` line per event. Browsers'
+``EventSource`` cannot send headers, so the access token may be passed as
+``?token=`` instead of the Authorization header.
+
+The stream is an async generator that waits on the event loop without
+holding a thread, so it needs an ASGI server
+(``uvicorn core.asgi:application``); WSGI servers would buffer it forever.
+"""
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import APIException
+
+from accounts.custom.authentication import CachedJWTAuthentication
+from blog.events import broadcaster
+
+
+async def authenticate(request):
+    """
+    The staff user the request's access token belongs to; raises
+    AuthenticationFailed/InvalidToken like the DRF views
+    """
+    authentication = CachedJWTAuthentication()
+    raw_token = request.GET.get('token')
+    if raw_token is None:
+        header = authentication.get_header(request)
+        raw_token = authentication.get_raw_token(header) if header else None
+    else:
+        raw_token = raw_token.encode()
+    if raw_token is None:
+        return None
+    validated_token = authentication.get_validated_token(raw_token)
+    return await sync_to_async(authentication.get_user)(validated_token)
+
+
+def format_event(sequence, event):
+    return f'id: {sequence}\ndata: {json.dumps(event, separators=(",", ":"))}\n\n'
+
+
+async def stream_events():
+    # Subscribed on the loop that consumes the stream
+    subscription = broadcaster.subscribe()
+    keepalive = getattr(settings, 'BLOG_EVENTS_KEEPALIVE', 15)
+    try:
+        yield 'retry: 5000\n\n'
+        yield format_event(0, {'type': 'ready'})
+        while True:
+            item = await subscription.get(keepalive)
+            # Comment lines keep proxies from closing an idle connection
+            yield ': keepalive\n\n' if item is None else format_event(*item)
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+@require_safe
+async def event_stream(request):
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"error": "The event stream needs an ASGI server (uvicorn core.asgi:application)"}, status=501
+        )
+    try:
+        user = await authenticate(request)
+    except APIException as exc:
+        return JsonResponse({'detail': exc.detail}, status=exc.status_code)
+    if user is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided.'}, status=401)
+    if not user.is_staff:
+        return JsonResponse({'detail': 'You do not have permission to perform this action.'}, status=403)
+
+    response = StreamingHttpResponse(stream_events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,15 +1,19 @@
 from django.urls import path
-from . import views
+from . import stream, views
 
 urlpatterns = [
     path('stats/', views.get_stats, name='admin-stats'),
+    path('cache-stats/', views.get_cache_stats, name='admin-cache-stats'),
     path('admin-access/', views.check_admin_access, name='admin-access-check'),
+    path('events/', stream.event_stream, name='admin-event-stream'),
     path('users/', views.AdminUserListView.as_view(), name='admin-user-list'),
+    path('users/bulk/', views.AdminUserBulkView.as_view(), name='admin-user-bulk'),
     path('users/<int:pk>/', views.AdminUserDetailView.as_view(), name='admin-user-detail'),
     path('users/<int:pk>/deactivate/', views.AdminUserDeactivateView.as_view(), name='admin-user-deactivate'),
     path('categories/', views.AdminCategoryListView.as_view(), name='admin-category-list'),
     path('categories/<int:pk>/', views.AdminCategoryDetailView.as_view(), name='admin-category-detail'),
     path('articles/', views.AdminArticleListView.as_view(), name='admin-article-list'),
+    path('articles/bulk/', views.AdminArticleBulkView.as_view(), name='admin-article-bulk'),
     path('articles/<int:pk>/', views.AdminArticleDetailView.as_view(), name='admin-article-detail'),
     path('articles/<int:pk>/publish/', views.AdminArticlePublishView.as_view(), name='admin-article-publish'),
 ] 
\ No newline at end of file
@@ -1,10 +1,20 @@
+import hashlib
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from django.contrib.auth.models import User
+from django.db.models import Q
 from blog.models import Article, Category
+from blog import bulk
+from blog.cache import USERS, response_cache
+from blog.counters import count_users, read_stats
+from blog.filters import id_param
 from rest_framework import status
 from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter, SearchFilter
+from .pagination import AdminPageNumberPagination
 from .serializers import *
 from rest_framework.views import APIView
 
@@ -23,27 +33,73 @@ def check_admin_access(request):
 @permission_classes([IsAdminUser])
 def get_stats(request):
     """
-    Get statistics for the admin dashboard
+    Get statistics for the admin dashboard, read from the maintained counters
     """
-    stats = {
-        'normalUsers': User.objects.filter(is_staff=False).count(),
-        'adminUsers': User.objects.filter(is_staff=True).count(),
-        'articles': Article.objects.count(),
-        'categories': Category.objects.count()
-    }
-    
-    return Response(stats) 
+    return Response(read_stats())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_cache_stats(request):
+    """
+    Hit/miss counters of the public blog response cache
+    """
+    return Response(response_cache.stats())
+
+
+def boolean_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    if value.lower() in ('true', '1'):
+        return True
+    if value.lower() in ('false', '0'):
+        return False
+    raise ValidationError({name: f"{name} must be true or false"})
 
 
 class AdminUserListView(generics.ListAPIView):
     """
-    Returns a list of all users for admin panel
+    Returns a paginated list of users for admin panel, filterable by
+    is_active/is_staff and searchable by username/email prefix
     """
-    serializer_class = AdminUserSerializer
+    serializer_class = AdminUserListSerializer
     permission_classes = [IsAdminUser]
-    
+    pagination_class = AdminPageNumberPagination
+    LIST_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name', 'is_staff', 'is_active', 'date_joined')
+
     def get_queryset(self):
-        return User.objects.all().order_by('-date_joined')
+        params = self.request.query_params
+        queryset = User.objects.only(*self.LIST_FIELDS).order_by('-date_joined', '-id')
+        for name in ('is_active', 'is_staff'):
+            value = boolean_param(params, name)
+            if value is not None:
+                queryset = queryset.filter(**{name: value})
+        search = params.get('search', '').strip()
+        if search:
+            queryset = queryset.filter(Q(username__istartswith=search) | Q(email__istartswith=search))
+        return queryset
+
+    def get_count(self, queryset):
+        """
+        Total for the paginator: the user counters when only is_staff is
+        filtered, otherwise a COUNT cached until the next user change
+        """
+        params = self.request.query_params
+        if not params.get('search', '').strip() and boolean_param(params, 'is_active') is None:
+            count = count_users(boolean_param(params, 'is_staff'))
+            if count is not None:
+                return count
+
+        digest = hashlib.md5(repr(sorted(
+            (name, params.get(name, '').strip().lower()) for name in ('is_active', 'is_staff', 'search')
+        )).encode()).hexdigest()
+        key = f'admin:user-count:{response_cache.generation(USERS)}:{digest}'
+        count = response_cache.cache.get(key)
+        if count is None:
+            count = queryset.count()
+            response_cache.cache.set(key, count, response_cache.timeout)
+        return count
 
 
 class AdminUserDetailView(generics.RetrieveUpdateAPIView):
@@ -97,13 +153,44 @@ class AdminCategoryDetailView(generics.RetrieveUpdateAPIView):
     
 class AdminArticleListView(generics.ListCreateAPIView):
     """
-    Returns a list of all articles for admin panel and allows creation of new articles
+    Returns a paginated list of articles for admin panel (without content,
+    filterable by status/category/author) and allows creation of new articles
     """
-    serializer_class = AdminArticleSerializer
     permission_classes = [IsAdminUser]
-    
+    pagination_class = AdminPageNumberPagination
+    filter_backends = [SearchFilter, OrderingFilter]
+    search_fields = ['title', 'excerpt']
+    ordering_fields = ['created_at', 'updated_at', 'date', 'title', 'status', 'publish_at']
+    ordering = ['-created_at', '-id']
+
+    # Columns of AdminArticleListSerializer; content stays in the database
+    LIST_FIELDS = (
+        'id', 'title', 'excerpt', 'date', 'read_time', 'status', 'publish_at', 'featured', 'created_at', 'updated_at',
+        'category__id', 'category__name', 'category__description',
+        'author__id', 'author__username', 'author__first_name', 'author__last_name',
+    )
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET':
+            return AdminArticleListSerializer
+        return AdminArticleSerializer
+
     def get_queryset(self):
-        return Article.objects.all().select_related('category', 'author').order_by('-created_at')
+        queryset = Article.objects.select_related('category', 'author').only(*self.LIST_FIELDS)
+        params = self.request.query_params
+        status_filter = params.get('status')
+        if status_filter:
+            if status_filter not in ('draft', 'published'):
+                raise ValidationError({"status": "status must be draft or published"})
+            queryset = queryset.filter(status=status_filter)
+        for param in ('category', 'author'):
+            value = id_param(params, param)
+            if value is not None:
+                queryset = queryset.filter(**{f'{param}_id': value})
+        featured = boolean_param(params, 'featured')
+        if featured is not None:
+            queryset = queryset.filter(featured=featured)
+        return queryset
     
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
@@ -132,5 +219,57 @@ class AdminArticlePublishView(APIView):
         """
         article = Article.objects.get(id=kwargs['pk'])
         article.status = 'published' if article.status == 'draft' else 'draft'
+        if article.status == 'published':
+            article.publish_at = None
         article.save()
         return Response({"message": "article status changed successfully!"}, status=status.HTTP_200_OK)
+
+
+def bulk_response(results):
+    """
+    Per-item results of a bulk operation in request order, with a tally
+    """
+    summary = {}
+    for result in results.values():
+        summary[result] = summary.get(result, 0) + 1
+    return Response({
+        'results': [{'id': item_id, 'result': result} for item_id, result in results.items()],
+        'summary': summary,
+    })
+
+
+class AdminArticleBulkView(APIView):
+    """
+    Publish, unpublish, delete or move (to ``category``) a list of articles
+    in one transaction
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = AdminArticleBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        action, ids = serializer.validated_data['action'], serializer.validated_data['ids']
+        if action == 'delete':
+            results = bulk.delete_articles(ids)
+        elif action == 'move':
+            results = bulk.move_articles(ids, serializer.validated_data['category'])
+        else:
+            results = bulk.set_article_status(ids, 'published' if action == 'publish' else 'draft')
+        return bulk_response(results)
+
+
+class AdminUserBulkView(APIView):
+    """
+    Activate or deactivate a list of users in one transaction
+    """
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        serializer = AdminUserBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk.set_users_active(
+            serializer.validated_data['ids'],
+            serializer.validated_data['action'] == 'activate',
+            acting_user=request.user,
+        )
+        return bulk_response(results)
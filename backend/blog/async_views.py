@@ -0,0 +1,158 @@
+"""
+Async-native versions of the public article read endpoints, for ASGI
+deployments (``uvicorn core.asgi:application``).
+
+They return the same JSON as the DRF viewset actions in ``blog.views`` and
+share its pagination, validators and response cache, but read through
+Django's async ORM so the event loop is free while a query is running.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework.exceptions import APIException, NotFound
+
+from core.renderers import FastJSONRenderer
+
+from .cache import ARTICLES, Validators, async_cached_response
+from .feed import feed_snapshots
+from .filters import facet_counts, filter_articles, is_filtered, wants_facets
+from .models import Article
+from .pagination import ArticleCursorPagination
+from .related import related_count
+from .search import get_search_backend
+from .serializers import ArticleSerializer, ArticleListValuesSerializer
+
+
+renderer = FastJSONRenderer()
+
+
+def json_response(data, status=200):
+    # Rendered like the DRF views' responses, not with DjangoJSONEncoder
+    return HttpResponse(renderer.render(data), status=status, content_type='application/json')
+
+
+def api_view(view):
+    """
+    Turn DRF exceptions raised by the shared helpers into the JSON error
+    bodies the DRF views would have returned
+    """
+    @require_safe
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            return await view(request, *args, **kwargs)
+        except APIException as exc:
+            detail = exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail}
+            return json_response(detail, status=exc.status_code)
+    return wrapper
+
+
+def published_articles():
+    return Article.objects.published().for_listing()
+
+
+async def facets(queryset, request):
+    # Same thread as the async ORM, like the search backends
+    return await sync_to_async(facet_counts)(filter_articles(queryset, request.GET, category=False), request.GET)
+
+
+@api_view
+@async_cached_response(ARTICLES)
+async def article_list(request):
+    """
+    Paginated list of published articles, revalidated with ETag/Last-Modified
+    """
+    snapshot = await sync_to_async(feed_snapshots.response, thread_sensitive=False)(request)
+    if snapshot is not None:
+        return snapshot
+
+    queryset = filter_articles(published_articles(), request.GET)
+
+    summary = await queryset.aaggregate(count=Count('id'), last_modified=Max('updated_at'))
+    validators = await sync_to_async(Validators)(
+        ARTICLES, request, summary['last_modified'], summary['count']
+    )
+    not_modified = validators.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+
+    paginator = ArticleCursorPagination()
+    page = paginator.finish_page([
+        row async for row in paginator.page_queryset(queryset.listing_values(), request)
+    ])
+    data = {
+        'next': paginator.get_next_link(),
+        'results': ArticleListValuesSerializer(page, many=True).data,
+    }
+    if wants_facets(request.GET):
+        data['facets'] = await facets(Article.objects.published(), request)
+    return validators.apply(json_response(data))
+
+
+@api_view
+@async_cached_response(ARTICLES)
+async def article_detail(request, pk):
+    """
+    Get a single article with related articles
+    """
+    try:
+        instance = await published_articles().aget(pk=pk)
+    except Article.DoesNotExist:
+        raise NotFound()
+    validators = await sync_to_async(Validators)(
+        ARTICLES, request, instance.updated_at, instance.id
+    )
+    not_modified = validators.not_modified(request)
+    if not_modified is not None:
+        return not_modified
+
+    related_articles = [
+        article async for article in published_articles().filter(
+            related_by__article_id=instance.id
+        ).order_by('-related_by__score').listing_values()[:related_count()]
+    ]
+    return validators.apply(json_response({
+        'article': ArticleSerializer(instance).data,
+        'relatedArticles': ArticleListValuesSerializer(related_articles, many=True).data,
+    }))
+
+
+@api_view
+@async_cached_response(ARTICLES)
+async def article_search(request):
+    """
+    Full-text search, best matches first
+    """
+    search_term = request.GET.get('q', '').lower()
+    if not search_term:
+        return json_response({"error": "Search term is required"}, status=400)
+
+    # The search backends run raw SQL on the request's connection, so they
+    # go through the same thread as the async ORM
+    backend = get_search_backend()
+    queryset = filter_articles(published_articles(), request.GET)
+    within = queryset if is_filtered(request.GET) else None
+    paginator = ArticleCursorPagination()
+    ranked_ids = await sync_to_async(paginator.paginate_ranked)(
+        lambda offset, limit: backend.search(search_term, limit=limit, offset=offset, within=within),
+        request
+    )
+    positions = {article_id: position for position, article_id in enumerate(ranked_ids)}
+    search_results = sorted(
+        [row async for row in queryset.filter(id__in=ranked_ids).listing_values()],
+        key=lambda article: positions[article.id]
+    )
+
+    if not search_results and paginator.decode_cursor(request) is None:
+        return json_response({"error": "No articles found!"}, status=404)
+
+    data = {
+        'next': paginator.get_next_link(),
+        'results': ArticleListValuesSerializer(search_results, many=True).data,
+    }
+    if wants_facets(request.GET):
+        data['facets'] = await facets(backend.filter(Article.objects.published(), search_term), request)
+    return json_response(data)
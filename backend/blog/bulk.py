@@ -0,0 +1,176 @@
+"""
+Batch moderation of articles and users for the admin bulk endpoints.
+
+Each operation runs in one transaction and writes with ``QuerySet.update``
+(or a single ``delete``), which skips the per-object model signals. The
+maintenance those signals do (counters, search and suggestion indexes,
+related articles, response cache, feed snapshots) is done here once for
+the whole batch instead.
+
+Operations return ``{id: result}`` with ``UPDATED``, ``DELETED``,
+``UNCHANGED``, ``NOT_FOUND`` or ``SKIPPED`` for every requested id.
+"""
+from collections import Counter as Tally
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.signals import evict_users
+
+from . import counters, events, feed
+from .cache import ARTICLES, USERS
+from .changes import record_tombstones
+from .models import Article, RelatedArticle
+from .related import update_related_articles_many
+from .search import get_search_backend
+from .signals import bulk_operation, invalidate_after_commit, rebuild_feeds_after_commit
+from .suggest import suggestion_index
+
+UPDATED = 'updated'
+DELETED = 'deleted'
+UNCHANGED = 'unchanged'
+NOT_FOUND = 'not_found'
+SKIPPED = 'skipped'
+
+
+def _results(ids, found, changed, done=UPDATED):
+    return {
+        item_id: done if item_id in changed else UNCHANGED if item_id in found else NOT_FOUND
+        for item_id in ids
+    }
+
+
+def _after_article_changes(changed_ids, category_ids, affected_ids=()):
+    update_related_articles_many(changed_ids, affected_ids)
+    invalidate_after_commit(ARTICLES)
+    rebuild_feeds_after_commit(feed.ALL, *category_ids)
+
+
+def _stamp_changes(updated_ids=(), removed_ids=()):
+    """
+    Timestamp the batch for the changes feed as the transaction's last
+    writes. The feed only trusts rows older than BLOG_CHANGES_SETTLE, so the
+    stamps must sit next to the commit, not at the start of a long batch.
+    """
+    if updated_ids:
+        Article.objects.filter(id__in=updated_ids).update(updated_at=timezone.now())
+    record_tombstones(removed_ids)
+
+
+@transaction.atomic
+def set_article_status(ids, status):
+    """
+    Publish (``status='published'``) or unpublish (``'draft'``) articles.
+    Publishing clears any pending ``publish_at``.
+    """
+    articles = {
+        article.id: article
+        for article in Article.objects.select_for_update().filter(id__in=ids).only('id', 'status', 'category_id')
+    }
+    changed = [article for article in articles.values() if article.status != status]
+    changed_ids = [article.id for article in changed]
+    if changed:
+        extra = {'publish_at': None} if status == 'published' else {}
+        Article.objects.filter(id__in=changed_ids).update(status=status, **extra)
+
+        for old_status, count in Tally(article.status for article in changed).items():
+            counters.adjust(counters.ARTICLES_BY_STATUS.get(old_status), -count)
+        counters.adjust(counters.ARTICLES_BY_STATUS.get(status), len(changed))
+
+        fresh = list(Article.objects.filter(id__in=changed_ids).only(
+            'id', 'title', 'excerpt', 'content', 'status', 'featured', 'category_id'
+        ))
+        if status == 'published':
+            get_search_backend().index_many(fresh)
+        else:
+            get_search_backend().remove_many(changed_ids)
+        suggestion_index.update_articles(fresh)
+        events.broadcaster.publish_after_commit(events.ARTICLE, events.UPDATED, fresh, events.article_state)
+
+        _after_article_changes(changed_ids, {article.category_id for article in changed})
+        _stamp_changes(changed_ids, changed_ids if status != 'published' else ())
+    return _results(ids, articles, set(changed_ids))
+
+
+@transaction.atomic
+def move_articles(ids, category):
+    """
+    Move articles to ``category``
+    """
+    articles = {
+        article.id: article
+        for article in Article.objects.select_for_update().filter(id__in=ids).only('id', 'category_id')
+    }
+    changed = [article for article in articles.values() if article.category_id != category.id]
+    changed_ids = [article.id for article in changed]
+    if changed:
+        Article.objects.filter(id__in=changed_ids).update(category=category)
+
+        for old_category_id, count in Tally(article.category_id for article in changed).items():
+            counters.adjust(counters.category_key(old_category_id), -count)
+        counters.adjust(counters.category_key(category.id), len(changed))
+
+        fresh = list(Article.objects.filter(id__in=changed_ids).only(
+            'id', 'title', 'status', 'featured', 'category_id'
+        ))
+        suggestion_index.update_articles(fresh)
+        events.broadcaster.publish_after_commit(events.ARTICLE, events.UPDATED, fresh, events.article_state)
+
+        _after_article_changes(changed_ids, {category.id, *(article.category_id for article in changed)})
+        _stamp_changes(changed_ids)
+    return _results(ids, articles, set(changed_ids))
+
+
+@transaction.atomic
+def delete_articles(ids):
+    articles = list(Article.objects.select_for_update().filter(id__in=ids).only('id', 'status', 'category_id'))
+    deleted_ids = [article.id for article in articles]
+    if articles:
+        # The cascade drops these rows; their owners need a replacement entry
+        owner_ids = set(RelatedArticle.objects.filter(
+            related_id__in=deleted_ids
+        ).values_list('article_id', flat=True)) - set(deleted_ids)
+
+        with bulk_operation():
+            Article.objects.filter(id__in=deleted_ids).delete()
+
+        counters.adjust(counters.ARTICLES, -len(articles))
+        for status, count in Tally(article.status for article in articles).items():
+            counters.adjust(counters.ARTICLES_BY_STATUS.get(status), -count)
+        for category_id, count in Tally(article.category_id for article in articles).items():
+            counters.adjust(counters.category_key(category_id), -count)
+
+        get_search_backend().remove_many(deleted_ids)
+        suggestion_index.remove_articles(deleted_ids)
+        events.broadcaster.publish_after_commit(events.ARTICLE, events.DELETED, articles)
+
+        _after_article_changes(deleted_ids, {article.category_id for article in articles}, owner_ids)
+        _stamp_changes(removed_ids=[article.id for article in articles if article.status == 'published'])
+    return _results(ids, deleted_ids, set(deleted_ids), done=DELETED)
+
+
+@transaction.atomic
+def set_users_active(ids, is_active, acting_user=None):
+    """
+    Activate or deactivate users. The acting admin cannot deactivate
+    themselves.
+    """
+    found = set(User.objects.filter(id__in=ids).values_list('id', flat=True))
+    queryset = User.objects.filter(id__in=found).exclude(is_active=is_active)
+    if not is_active and acting_user is not None:
+        queryset = queryset.exclude(id=acting_user.id)
+    changed = set(queryset.values_list('id', flat=True))
+    if changed:
+        User.objects.filter(id__in=changed).update(is_active=is_active)
+        invalidate_after_commit(USERS)
+        evict_users(*changed)
+        events.broadcaster.publish_after_commit(
+            events.USER, events.UPDATED,
+            User.objects.filter(id__in=changed).only('id', 'username', 'is_active', 'is_staff'), events.user_state
+        )
+
+    results = _results(ids, found, changed)
+    if not is_active and acting_user is not None and acting_user.id in found:
+        results[acting_user.id] = SKIPPED
+    return results
@@ -0,0 +1,223 @@
+import functools
+import hashlib
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from .models import ContentVersion
+
+ARTICLES = 'articles'
+CATEGORIES = 'categories'
+SCOPES = (ARTICLES, CATEGORIES)
+# No responses are cached under this one; its generation versions the
+# cached admin user counts
+USERS = 'users'
+
+# Headers worth replaying from a cached response
+REPLAYED_HEADERS = ('Content-Type', 'Vary', 'Allow', 'ETag', 'Last-Modified')
+
+
+class ResponseCache:
+    """
+    Rendered-response cache for the public blog endpoints.
+
+    Entries are keyed by scope, the scope's current generation and the
+    request path/query string. Invalidating a scope just moves its
+    generation on, which orphans every entry built from the old data in a
+    single cache write; the orphans age out with the timeout.
+    """
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'BLOG_CACHE_ALIAS', 'default')]
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'BLOG_CACHE_TIMEOUT', 300)
+
+    @staticmethod
+    def _generation_key(scope):
+        return f'blog:generation:{scope}'
+
+    def generation(self, scope):
+        key = self._generation_key(scope)
+        generation = self.cache.get(key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not self.cache.add(key, generation, None):
+                generation = self.cache.get(key)
+        return generation
+
+    def key(self, scope, request):
+        digest = hashlib.md5(
+            f"{request.get_full_path()}|{request.META.get('HTTP_ACCEPT', '')}".encode()
+        ).hexdigest()
+        return f'blog:response:{scope}:{self.generation(scope)}:{digest}'
+
+    def get(self, scope, request):
+        entry = self.cache.get(self.key(scope, request))
+        self._count(scope, 'hits' if entry is not None else 'misses')
+        if entry is None:
+            return None
+        content, headers = entry
+        response = HttpResponse(content)
+        for header, value in headers:
+            response[header] = value
+        return response
+
+    def set(self, scope, request, response):
+        headers = [(header, response[header]) for header in REPLAYED_HEADERS if response.has_header(header)]
+        self.cache.set(self.key(scope, request), (response.content, headers), self.timeout)
+
+    def invalidate(self, *scopes):
+        self.cache.set_many({self._generation_key(scope): uuid.uuid4().hex for scope in scopes}, None)
+
+    def _count(self, scope, counter):
+        key = f'blog:stats:{scope}:{counter}'
+        if not self.cache.add(key, 1, None):
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                # evicted between add() and incr()
+                self.cache.add(key, 1, None)
+
+    def stats(self):
+        keys = [f'blog:stats:{scope}:{counter}' for scope in SCOPES for counter in ('hits', 'misses')]
+        values = self.cache.get_many(keys)
+        return {
+            scope: {
+                counter: values.get(f'blog:stats:{scope}:{counter}', 0)
+                for counter in ('hits', 'misses')
+            }
+            for scope in SCOPES
+        }
+
+
+response_cache = ResponseCache()
+
+
+def content_version(scope):
+    """
+    The scope's ``ContentVersion``, read from the database
+    """
+    version = ContentVersion.objects.filter(scope=scope).values_list('value', flat=True)[:1]
+    return version[0] if version else 0
+
+
+def bump_content_version(scope):
+    """
+    Move the scope's version on; call inside the writing transaction so the
+    new version becomes visible together with the change
+    """
+    if not ContentVersion.objects.filter(scope=scope).update(value=F('value') + 1):
+        ContentVersion.objects.get_or_create(scope=scope, defaults={'value': 1})
+
+
+class Validators:
+    """
+    ETag / Last-Modified pair for a response, computed from cheap aggregates
+    instead of the serialized body.
+
+    The ETag covers the scope's ``content_version`` (bumped by every
+    relevant write, including category and author renames), the request
+    path and Accept header and the given fingerprint, e.g.
+    ``(count, max(updated_at))``. All of it comes from the database, so
+    every process computes the same ETag for the same data.
+    """
+
+    def __init__(self, scope, request, last_modified, *fingerprint):
+        digest = hashlib.md5(
+            '|'.join(str(part) for part in (
+                content_version(scope),
+                request.get_full_path(),
+                request.META.get('HTTP_ACCEPT', ''),
+                last_modified,
+                *fingerprint,
+            )).encode()
+        ).hexdigest()
+        self.etag = f'"{digest}"'
+        self.last_modified = int(last_modified.timestamp()) if last_modified else None
+
+    def not_modified(self, request):
+        """
+        Return a 304 response when the client's copy is still current
+        """
+        if request.method not in ('GET', 'HEAD'):
+            return None
+        return get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+
+    def apply(self, response):
+        if response.status_code == 200:
+            response['ETag'] = self.etag
+            if self.last_modified is not None:
+                response['Last-Modified'] = http_date(self.last_modified)
+        return response
+
+
+class CachedResponseMixin:
+    """
+    Serve GET requests of a viewset from ``response_cache``.
+
+    Only successful JSON responses are stored. Set ``cache_scope`` to the
+    scope whose invalidation must drop the viewset's responses, and list
+    actions whose responses depend on more than the data (e.g. the clock)
+    in ``uncached_actions``. ``self.action`` is only set inside dispatch,
+    so the action is looked up in ``action_map``.
+    """
+
+    cache_scope = None
+    uncached_actions = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        if (request.method != 'GET' or not getattr(settings, 'BLOG_CACHE_ENABLED', True)
+                or getattr(self, 'action_map', {}).get(request.method.lower()) in self.uncached_actions):
+            return super().dispatch(request, *args, **kwargs)
+
+        cached = response_cache.get(self.cache_scope, request)
+        if cached is not None:
+            return get_conditional_response(
+                request,
+                etag=cached.get('ETag'),
+                last_modified=parse_http_date_safe(cached.get('Last-Modified')),
+                response=cached,
+            )
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and getattr(response, 'accepted_media_type', '') == 'application/json':
+            response.render()
+            response_cache.set(self.cache_scope, request, response)
+        return response
+
+
+def async_cached_response(scope):
+    """
+    ``CachedResponseMixin`` for async function views. Cache calls run in a
+    worker thread so a networked backend never blocks the event loop.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or not getattr(settings, 'BLOG_CACHE_ENABLED', True):
+                return await view(request, *args, **kwargs)
+
+            cached = await sync_to_async(response_cache.get, thread_sensitive=False)(scope, request)
+            if cached is not None:
+                return get_conditional_response(
+                    request,
+                    etag=cached.get('ETag'),
+                    last_modified=parse_http_date_safe(cached.get('Last-Modified')),
+                    response=cached,
+                )
+
+            response = await view(request, *args, **kwargs)
+            if response.status_code == 200 and response.get('Content-Type', '').startswith('application/json'):
+                await sync_to_async(response_cache.set, thread_sensitive=False)(scope, request, response)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,138 @@
+"""
+Delta sync of the public article list.
+
+``GET /api/blog/articles/changes/?since=<token>`` returns the published
+articles created or updated after the token (listing payload, oldest
+change first), the ids of articles deleted or unpublished since then
+(tombstones) and a new token. Without ``since`` every published article
+is returned, in pages. While ``more`` is true the client should call again
+with the new token straight away. Apply ``deleted`` before ``changed``.
+
+Changes are only read up to ``BLOG_CHANGES_SETTLE`` seconds ago, so a
+write whose transaction is still open when a token is handed out is not
+skipped by it. That holds as long as timestamps are written close to the
+commit: ``blog.bulk`` stamps ``updated_at`` and tombstones as the last
+writes of a batch, after its index and related-article maintenance.
+Tombstones are kept for ``BLOG_CHANGES_RETENTION_DAYS``
+(see ``prune_article_tombstones``); older tokens get a 410 and the client
+starts over without ``since``.
+
+The payload embeds category and author names, but renaming those does not
+touch the articles, so clients refresh categories from their own endpoint.
+"""
+import base64
+import binascii
+import datetime
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Article, ArticleTombstone
+from .serializers import ArticleListValuesSerializer
+
+
+class TokenExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'The sync token has expired; sync again without since.'
+    default_code = 'token_expired'
+
+
+def record_tombstones(article_ids):
+    ArticleTombstone.objects.bulk_create([
+        ArticleTombstone(article_id=article_id) for article_id in article_ids
+    ])
+
+
+def prune_tombstones(now=None):
+    """
+    Delete the tombstones no valid token can ask for any more
+    """
+    retention = datetime.timedelta(days=getattr(settings, 'BLOG_CHANGES_RETENTION_DAYS', 30))
+    deleted, _ = ArticleTombstone.objects.filter(removed_at__lt=(now or timezone.now()) - retention).delete()
+    return deleted
+
+
+def encode_token(state):
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(',', ':')).encode()).decode('ascii')
+
+
+def aware_datetime(value):
+    moment = datetime.datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        # Tokens are only ever issued with UTC offsets
+        raise ValueError('naive datetime in sync token')
+    return moment
+
+
+def decode_token(encoded):
+    """
+    ``(changed position, deleted position, synced up to)``; positions are
+    ``(timestamp, id)`` pairs or None
+    """
+    try:
+        state = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        positions = [
+            (aware_datetime(state[key][0]), int(state[key][1])) if state[key] else None
+            for key in ('c', 'd')
+        ]
+        return positions[0], positions[1], aware_datetime(state['at'])
+    except (TypeError, ValueError, KeyError, IndexError, binascii.Error):
+        raise ValidationError({"since": "Invalid sync token"})
+
+
+def after(field, position):
+    """
+    Keyset filter: rows strictly after ``position`` in (field, id) order
+    """
+    if position is None:
+        return Q()
+    value, last_id = position
+    return Q(**{f'{field}__gt': value}) | Q(**{field: value, 'id__gt': last_id})
+
+
+def changes_since(token=None, limit=None, now=None):
+    limit = limit or getattr(settings, 'BLOG_CHANGES_LIMIT', 500)
+    now = now or timezone.now()
+    cutoff = now - datetime.timedelta(seconds=getattr(settings, 'BLOG_CHANGES_SETTLE', 2))
+
+    changed_position = deleted_position = None
+    synced_at = cutoff
+    if token:
+        changed_position, deleted_position, synced_at = decode_token(token)
+        retention = datetime.timedelta(days=getattr(settings, 'BLOG_CHANGES_RETENTION_DAYS', 30))
+        if synced_at < now - retention:
+            raise TokenExpired()
+
+    # (status, updated_at) index; its implicit id breaks ties in order
+    changed = list(
+        Article.objects.published().filter(after('updated_at', changed_position), updated_at__lte=cutoff)
+        .order_by('updated_at', 'id').listing_values('updated_at')[:limit + 1]
+    )
+    # Articles published again since are in the changed stream instead
+    tombstones = list(
+        ArticleTombstone.objects.filter(after('removed_at', deleted_position), removed_at__lte=cutoff)
+        .exclude(article_id__in=Article.objects.published().values('id'))
+        .order_by('removed_at', 'id').values_list('id', 'removed_at', 'article_id')[:limit + 1]
+    )
+    more = len(changed) > limit or len(tombstones) > limit
+    changed, tombstones = changed[:limit], tombstones[:limit]
+
+    if changed:
+        changed_position = (changed[-1].updated_at, changed[-1].id)
+    if tombstones:
+        deleted_position = (tombstones[-1][1], tombstones[-1][0])
+    return {
+        'changed': ArticleListValuesSerializer(changed, many=True).data,
+        'deleted': list(dict.fromkeys(article_id for _, _, article_id in tombstones)),
+        'token': encode_token({
+            'c': [changed_position[0].isoformat(), changed_position[1]] if changed_position else None,
+            'd': [deleted_position[0].isoformat(), deleted_position[1]] if deleted_position else None,
+            # Deletes are complete up to here once the client has drained every page
+            'at': (synced_at if more else cutoff).isoformat(),
+        }),
+        'more': more,
+    }
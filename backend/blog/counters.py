@@ -0,0 +1,111 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Category, Article, Counter
+
+NORMAL_USERS = 'users:normal'
+ADMIN_USERS = 'users:admin'
+ARTICLES = 'articles:total'
+CATEGORIES = 'categories:total'
+ARTICLES_BY_STATUS = {'draft': 'articles:draft', 'published': 'articles:published'}
+
+
+def category_key(category_id):
+    return f'articles:category:{category_id}'
+
+
+def user_key(is_staff):
+    return ADMIN_USERS if is_staff else NORMAL_USERS
+
+
+def adjust(key, delta):
+    """
+    Atomically add ``delta`` to a counter. Missing counters are left alone:
+    they are created with their true value by ``reconcile``.
+    """
+    if key and delta:
+        Counter.objects.filter(key=key).update(value=F('value') + delta)
+
+
+def add_category(category):
+    Counter.objects.get_or_create(key=category_key(category.id), defaults={'category': category, 'value': 0})
+    adjust(CATEGORIES, 1)
+
+
+def actual_counts():
+    """
+    The true values, counted from the tables
+    """
+    counts = {
+        NORMAL_USERS: 0, ADMIN_USERS: 0, ARTICLES: 0, CATEGORIES: Category.objects.count(),
+        **{key: 0 for key in ARTICLES_BY_STATUS.values()},
+    }
+    for is_staff, count in User.objects.values_list('is_staff').annotate(count=Count('id')).order_by():
+        counts[user_key(is_staff)] += count
+    for status, count in Article.objects.values_list('status').annotate(count=Count('id')).order_by():
+        counts[ARTICLES] += count
+        if status in ARTICLES_BY_STATUS:
+            counts[ARTICLES_BY_STATUS[status]] += count
+    per_category = dict(Article.objects.values_list('category_id').annotate(count=Count('id')).order_by())
+    for category_id in Category.objects.values_list('id', flat=True):
+        counts[category_key(category_id)] = per_category.get(category_id, 0)
+    return counts
+
+
+@transaction.atomic
+def reconcile():
+    """
+    Rewrite every counter from the tables and return the drift that was
+    corrected as ``{key: (stored, actual)}``
+    """
+    counts = actual_counts()
+    stored = {counter.key: counter for counter in Counter.objects.select_for_update()}
+    drift = {}
+    for key, value in counts.items():
+        counter = stored.pop(key, None)
+        if counter is None:
+            category_id = int(key.rsplit(':', 1)[1]) if key.startswith('articles:category:') else None
+            Counter.objects.create(key=key, category_id=category_id, value=value)
+            drift[key] = (None, value)
+        elif counter.value != value:
+            drift[key] = (counter.value, value)
+            counter.value = value
+            counter.save(update_fields=['value'])
+    for key, counter in stored.items():
+        drift[key] = (counter.value, None)
+        counter.delete()
+    return drift
+
+
+def count_users(is_staff=None):
+    """
+    Number of users (only staff or non-staff ones when ``is_staff`` is
+    given) from the counters, or None when they have not been created yet
+    """
+    keys = [user_key(is_staff)] if is_staff is not None else [NORMAL_USERS, ADMIN_USERS]
+    values = list(Counter.objects.filter(key__in=keys).values_list('value', flat=True))
+    return sum(values) if len(values) == len(keys) else None
+
+
+def read_stats():
+    """
+    Dashboard statistics from the counters table in a single query
+    """
+    counters = list(Counter.objects.select_related('category').order_by('key'))
+    if not counters:
+        reconcile()
+        counters = list(Counter.objects.select_related('category').order_by('key'))
+    values = {counter.key: counter.value for counter in counters}
+    return {
+        'normalUsers': values.get(NORMAL_USERS, 0),
+        'adminUsers': values.get(ADMIN_USERS, 0),
+        'articles': values.get(ARTICLES, 0),
+        'categories': values.get(CATEGORIES, 0),
+        'publishedArticles': values.get(ARTICLES_BY_STATUS['published'], 0),
+        'draftArticles': values.get(ARTICLES_BY_STATUS['draft'], 0),
+        'articlesPerCategory': [
+            {'id': counter.category_id, 'name': counter.category.name, 'articles': counter.value}
+            for counter in counters if counter.category_id is not None
+        ],
+    }
@@ -0,0 +1,136 @@
+"""
+In-process broadcaster of content changes, behind the admin panel's
+server-sent event stream (``/api/admin/events/``, see ``admin.stream``).
+
+Once a change has committed, the receivers in ``blog.signals`` (and
+``blog.bulk`` for batch operations) publish a compact event::
+
+    {"type": "article", "id": 5, "action": "updated",
+     "state": {"title": ..., "status": ..., "featured": ..., "category": ...}}
+
+``action`` is ``created``, ``updated`` or ``deleted`` (no state). A stream
+that falls ``BLOG_EVENTS_QUEUE_SIZE`` events behind gets a single
+``{"type": "reset"}`` instead, meaning "refetch what you show".
+
+Events only reach streams served by the process that made the change, so
+deployments with several workers should serve the stream from one ASGI
+worker that also handles the admin API, or clients will miss some events.
+"""
+import asyncio
+import itertools
+import threading
+
+from django.conf import settings
+from django.db import transaction
+
+ARTICLE = 'article'
+CATEGORY = 'category'
+USER = 'user'
+RESET = 'reset'
+
+CREATED = 'created'
+UPDATED = 'updated'
+DELETED = 'deleted'
+
+
+def article_state(article):
+    return {
+        'title': article.title,
+        'status': article.status,
+        'featured': article.featured,
+        'category': article.category_id,
+    }
+
+
+def category_state(category):
+    return {'name': category.name}
+
+
+def user_state(user):
+    return {'username': user.username, 'is_active': user.is_active, 'is_staff': user.is_staff}
+
+
+class Subscription:
+    """
+    One open stream: a bounded queue owned by the event loop serving it
+    """
+
+    def __init__(self, loop, size):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=size)
+
+    def deliver(self, item):
+        # Runs in self.loop
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            item = (item[0], {'type': RESET})
+        self.queue.put_nowait(item)
+
+    async def get(self, timeout):
+        """
+        ``(sequence number, event)``, or None when nothing came in ``timeout`` seconds
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroadcaster:
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count(1)
+
+    @property
+    def subscriber_count(self):
+        return len(self._subscriptions)
+
+    def subscribe(self):
+        """
+        Open a subscription for the running event loop
+        """
+        subscription = Subscription(asyncio.get_running_loop(), getattr(settings, 'BLOG_EVENTS_QUEUE_SIZE', 100))
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def publish(self, event):
+        """
+        Hand ``event`` to every subscription. Safe to call from any thread.
+        """
+        event = (next(self._sequence), event)
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # Its loop has closed under it
+                self.unsubscribe(subscription)
+
+    def publish_after_commit(self, kind, action, objects, state=None):
+        """
+        Publish one event per object once the transaction commits.
+        ``state(obj)`` is read now, while the objects are at hand.
+        """
+        if not self._subscriptions:
+            return
+        events = [
+            {'type': kind, 'id': obj.pk, 'action': action, **({'state': state(obj)} if state else {})}
+            for obj in objects
+        ]
+
+        def publish_all():
+            for event in events:
+                self.publish(event)
+        transaction.on_commit(publish_all)
+
+
+broadcaster = EventBroadcaster()
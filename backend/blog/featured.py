@@ -0,0 +1,62 @@
+"""
+Home page articles.
+
+``BLOG_FEATURED_COUNT`` published articles: the ones admins flagged as
+featured first, then the newest, read with one LIMIT query on
+``article_featured_idx``. The rendered JSON is kept in the response cache
+and rebuilt as soon as cached article responses are invalidated, so home
+page requests are answered from the cache even right after a write. The
+entry expires with ``BLOG_CACHE_TIMEOUT`` like the cached responses, so
+processes that did not see the write (another worker, the scheduler)
+pick it up within that time.
+"""
+import hashlib
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+from core.renderers import FastJSONRenderer
+
+from .cache import response_cache
+from .models import Article
+from .serializers import ArticleListValuesSerializer
+
+
+class FeaturedArticles:
+
+    KEY = 'blog:featured'
+
+    @property
+    def count(self):
+        return getattr(settings, 'BLOG_FEATURED_COUNT', 3)
+
+    @staticmethod
+    def cache_enabled():
+        return getattr(settings, 'BLOG_CACHE_ENABLED', True)
+
+    def data(self):
+        articles = Article.objects.published().order_by('-featured', '-date', '-id').listing_values()[:self.count]
+        return {'results': ArticleListValuesSerializer(articles, many=True).data}
+
+    def rebuild(self):
+        content = FastJSONRenderer().render(self.data())
+        if self.cache_enabled():
+            response_cache.cache.set(self.KEY, content, response_cache.timeout)
+        return content
+
+    def content(self):
+        content = response_cache.cache.get(self.KEY) if self.cache_enabled() else None
+        if content is None:
+            content = self.rebuild()
+        return content
+
+    def response(self, request):
+        content = self.content()
+        etag = '"%s"' % hashlib.md5(content).hexdigest()
+        response = HttpResponse(content, content_type='application/json')
+        response['ETag'] = etag
+        return get_conditional_response(request, etag=etag, response=response)
+
+
+featured_articles = FeaturedArticles()
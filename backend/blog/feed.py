@@ -0,0 +1,145 @@
+"""
+Materialized article feed.
+
+With ``BLOG_FEED_SNAPSHOTS`` on, the first ``BLOG_FEED_SNAPSHOT_PAGES``
+pages of the public article list (default page size, overall and per
+category) are serialized to JSON bytes whenever an article, category or
+author changes, and list requests for those pages are answered from the
+stored bytes without touching the ORM or the serializer.
+
+Snapshots live in the ``BLOG_FEED_CACHE_ALIAS`` cache. Every process must
+see the same store, so multi-process deployments need a shared backend
+(e.g. ``FileBasedCache`` for on-disk snapshots, or Redis/Memcached).
+"""
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework.exceptions import ValidationError
+
+from core.renderers import FastJSONRenderer
+
+from .filters import id_param
+from .models import Article, Category
+from .pagination import ArticleCursorPagination
+from .serializers import ArticleListValuesSerializer
+
+ALL = 'all'
+SNAPSHOT_QUERY_PARAMS = frozenset(('category', 'cursor', 'page_size'))
+
+
+def enabled():
+    return getattr(settings, 'BLOG_FEED_SNAPSHOTS', False)
+
+
+class FeedSnapshots:
+    """
+    Pre-rendered pages per feed ("all" or a category id), keyed by the
+    cursor that leads to them. A rebuild writes the pages under a fresh
+    version and then flips the feed's version pointer, so readers never see
+    a half-written feed and pages of the previous version (including
+    cursors that no longer exist) are orphaned in one write.
+    """
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'BLOG_FEED_CACHE_ALIAS', 'default')]
+
+    @property
+    def pages(self):
+        return getattr(settings, 'BLOG_FEED_SNAPSHOT_PAGES', 5)
+
+    @staticmethod
+    def _version_key(feed):
+        return f'blog:feed:{feed}:version'
+
+    @staticmethod
+    def _page_key(feed, version, cursor):
+        return f'blog:feed:{feed}:{version}:{cursor or ""}'
+
+    def rebuild(self, feed):
+        """
+        Render the first pages of one feed and publish them
+        """
+        queryset = Article.objects.published().listing_values()
+        if feed != ALL:
+            queryset = queryset.filter(category_id=feed)
+        paginator = ArticleCursorPagination()
+        renderer = FastJSONRenderer()
+        version = uuid.uuid4().hex
+
+        entries = {}
+        cursor = None
+        for _ in range(self.pages):
+            articles = list(paginator.page_queryset(queryset, SnapshotRequest(cursor)))
+            articles = paginator.finish_page(articles)
+            results = renderer.render(ArticleListValuesSerializer(articles, many=True).data)
+            entries[self._page_key(feed, version, cursor)] = (results, paginator.next_cursor)
+            if paginator.next_cursor is None:
+                break
+            cursor = paginator.next_cursor
+
+        self.cache.set_many(entries, None)
+        self.cache.set(self._version_key(feed), version, None)
+
+    def rebuild_all(self):
+        feeds = [ALL, *Category.objects.values_list('id', flat=True)]
+        for feed in feeds:
+            self.rebuild(feed)
+        return len(feeds)
+
+    def remove(self, feed):
+        self.cache.delete(self._version_key(feed))
+
+    def get(self, feed, cursor):
+        version = self.cache.get(self._version_key(feed))
+        if version is None:
+            return None
+        return self.cache.get(self._page_key(feed, version, cursor))
+
+    def response(self, request):
+        """
+        The stored page for a list request, or None when the request is not
+        for a materialized page (filters, another page size, a deep cursor)
+        """
+        params = request.GET
+        if not enabled() or not set(params) <= SNAPSHOT_QUERY_PARAMS:
+            return None
+        paginator = ArticleCursorPagination()
+        if params.get('page_size') and params['page_size'] != str(paginator.page_size):
+            return None
+        try:
+            category = id_param(params, 'category')
+        except ValidationError:
+            # Left to the view, which answers with the 400
+            return None
+
+        entry = self.get(category if category is not None else ALL, params.get('cursor'))
+        if entry is None:
+            return None
+        results, next_cursor = entry
+        paginator.request, paginator.next_cursor = request, next_cursor
+        etag = '"%s"' % hashlib.md5(results + (next_cursor or '').encode()).hexdigest()
+
+        response = HttpResponse(
+            b'{"next":' + json.dumps(paginator.get_next_link()).encode() + b',"results":' + results + b'}',
+            content_type='application/json'
+        )
+        response['ETag'] = etag
+        return get_conditional_response(request, etag=etag, response=response)
+
+
+class SnapshotRequest:
+    """
+    Just enough of a request for the paginator to render a page offline
+    """
+
+    def __init__(self, cursor):
+        self.GET = {'cursor': cursor} if cursor else {}
+
+
+feed_snapshots = FeedSnapshots()
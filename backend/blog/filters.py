@@ -0,0 +1,97 @@
+"""
+Query-string filters of the public article list and search endpoints, and
+the facet counts shown next to their results.
+
+``?category=`` and ``?author=`` take ids, ``?date_from=``/``?date_to=``
+ISO dates (both inclusive). With ``?facets=true`` the response gets a
+``facets`` block with per-category and per-month article counts, computed
+in a single grouped query.
+"""
+import datetime
+
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from rest_framework.exceptions import ValidationError
+
+FILTER_PARAMS = ('category', 'author', 'date_from', 'date_to')
+# Largest value a SQLite INTEGER column (and so a primary key) can hold
+MAX_ID = 2 ** 63 - 1
+
+
+def id_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = int(value)
+    except ValueError:
+        parsed = None
+    if parsed is None or not 0 < parsed <= MAX_ID:
+        raise ValidationError({name: f"{name} must be an integer id"})
+    return parsed
+
+
+def date_param(params, name):
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError({name: f"{name} must be a date (YYYY-MM-DD)"})
+
+
+def wants_facets(params):
+    return params.get('facets', '').lower() in ('true', '1')
+
+
+def is_filtered(params):
+    return any(params.get(name) for name in FILTER_PARAMS)
+
+
+def filter_articles(queryset, params, category=True):
+    """
+    Apply the filters in ``params``. Facets pass ``category=False``: the
+    category counts are wanted for every category, not just the chosen one.
+    """
+    author = id_param(params, 'author')
+    if author is not None:
+        queryset = queryset.filter(author_id=author)
+    date_from, date_to = date_param(params, 'date_from'), date_param(params, 'date_to')
+    if date_from is not None:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to is not None:
+        queryset = queryset.filter(date__lte=date_to)
+    if category:
+        category_id = id_param(params, 'category')
+        if category_id is not None:
+            queryset = queryset.filter(category_id=category_id)
+    return queryset
+
+
+def facet_counts(queryset, params):
+    """
+    ``{'categories': [...], 'months': [...]}`` for ``queryset`` (filtered
+    with ``category=False``), from one GROUP BY (category, month). Category
+    counts ignore the category filter so the other categories stay
+    reachable; month counts respect it.
+    """
+    rows = queryset.order_by().values(
+        'category_id', 'category__name', month=TruncMonth('date')
+    ).annotate(count=Count('id'))
+    category_id = id_param(params, 'category')
+
+    categories, months = {}, {}
+    for row in rows:
+        entry = categories.setdefault(row['category_id'], {
+            'id': row['category_id'], 'name': row['category__name'], 'count': 0,
+        })
+        entry['count'] += row['count']
+        if category_id is None or row['category_id'] == category_id:
+            month = row['month'].strftime('%Y-%m')
+            months[month] = months.get(month, 0) + row['count']
+
+    return {
+        'categories': sorted(categories.values(), key=lambda entry: (entry['name'], entry['id'])),
+        'months': [{'month': month, 'count': count} for month, count in sorted(months.items(), reverse=True)],
+    }
@@ -0,0 +1,230 @@
+import datetime
+import json
+import os
+import random
+import secrets
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.db import connection, connections
+
+from blog.models import Article
+from blog.synthetic import TOPICS
+
+BENCHMARK_ADMIN_PREFIX = 'benchmark_admin_'
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class QueryCountingApplication:
+    """
+    WSGI wrapper reporting the number of SQL queries each request ran in an
+    X-Query-Count response header
+    """
+
+    def __init__(self, application):
+        self.application = application
+
+    def __call__(self, environ, start_response):
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        def counting_start_response(status, headers, exc_info=None):
+            headers = list(headers) + [('X-Query-Count', str(len(queries)))]
+            return start_response(status, headers, exc_info)
+
+        with connection.execute_wrapper(count):
+            return self.application(environ, counting_start_response)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class Command(BaseCommand):
+    help = 'Boots the API on a local threaded server and load-tests the main endpoints with concurrent clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fresh', type=int, default=None, metavar='N',
+                            help='Run against a temporary SQLite database seeded with N synthetic articles')
+        parser.add_argument('--requests', type=int, default=300, help='Requests per scenario')
+        parser.add_argument('--token-requests', type=int, default=20,
+                            help='Requests for the token-obtain scenario (password hashing is slow by design)')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client threads')
+        parser.add_argument('--no-cache', action='store_true', help='Disable the public response cache')
+        parser.add_argument('--scenario', action='append', dest='scenarios',
+                            help='Only run the named scenario (repeatable)')
+        parser.add_argument('--output', default='benchmark_results.json', help='Where to write the JSON results')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        temp_dir = None
+        if options['fresh'] is not None:
+            temp_dir = tempfile.TemporaryDirectory()
+            self._use_fresh_database(os.path.join(temp_dir.name, 'benchmark.sqlite3'), options['fresh'])
+        if options['no_cache']:
+            settings.BLOG_CACHE_ENABLED = False
+
+        server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler, allow_reuse_address=False)
+        server.set_app(QueryCountingApplication(get_internal_wsgi_application()))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{server.server_port}'
+
+        # A throwaway admin with a random password, deleted again below
+        self.admin_username = BENCHMARK_ADMIN_PREFIX + secrets.token_hex(4)
+        self.admin_password = secrets.token_urlsafe(24)
+        admin = User.objects.create_user(self.admin_username, password=self.admin_password, is_staff=True)
+        try:
+            results = self._run_scenarios(options)
+        finally:
+            server.shutdown()
+            server.server_close()
+            admin.delete()
+            if temp_dir:
+                connections.close_all()
+                temp_dir.cleanup()
+
+        report = {
+            'commit': self._git_commit(),
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'database': {
+                'vendor': connection.vendor,
+                'articles': results.pop('_articles'),
+            },
+            'config': {
+                'requests': options['requests'],
+                'token_requests': options['token_requests'],
+                'concurrency': options['concurrency'],
+                'response_cache': not options['no_cache'],
+            },
+            'scenarios': results,
+        }
+        with open(options['output'], 'w') as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+
+    def _use_fresh_database(self, path, articles):
+        connections.close_all()
+        settings.DATABASES['default']['NAME'] = path
+        connection.settings_dict['NAME'] = path
+        call_command('migrate', verbosity=0)
+        if articles:
+            call_command('seed_articles', count=articles, users=50, categories=20, verbosity=0)
+
+    def _scenarios(self):
+        article_ids = list(Article.objects.published().values_list('id', flat=True)[:5000]) or [0]
+        tokens = self._request('POST', '/api/auth/get-access-token/', {
+            'username': self.admin_username, 'password': self.admin_password,
+        })[2]
+        auth = {'Authorization': f'Bearer {tokens["access"]}'}
+        return {
+            'articles_list': lambda: ('GET', '/api/blog/articles/', None, {}),
+            'articles_list_page_50': lambda: ('GET', '/api/blog/articles/?page_size=50', None, {}),
+            'articles_search': lambda: ('GET', f'/api/blog/articles/search/?q={self.rng.choice(TOPICS).split()[0]}', None, {}),
+            'articles_suggest': lambda: ('GET', f'/api/blog/articles/suggest/?q={self.rng.choice(TOPICS)[:3]}', None, {}),
+            'articles_retrieve': lambda: ('GET', f'/api/blog/articles/{self.rng.choice(article_ids)}/', None, {}),
+            'admin_articles': lambda: ('GET', '/api/admin/articles/', None, auth),
+            'token_refresh': lambda: ('POST', '/api/auth/get-refresh-token/', {'refresh': tokens['refresh']}, {}),
+            'token_obtain': lambda: ('POST', '/api/auth/get-access-token/', {
+                'username': self.admin_username, 'password': self.admin_password,
+            }, {}),
+        }
+
+    def _run_scenarios(self, options):
+        scenarios = self._scenarios()
+        selected = options['scenarios'] or list(scenarios)
+        results = {'_articles': Article.objects.count()}
+        for name in selected:
+            count = options['token_requests'] if name == 'token_obtain' else options['requests']
+            results[name] = self._run(scenarios[name], count, options['concurrency'])
+            summary = results[name]
+            self.stdout.write(
+                f'{name:<24} {summary["throughput_rps"]:8.1f} req/s  '
+                f'p50 {summary["latency_ms"]["p50"]:8.2f}  p95 {summary["latency_ms"]["p95"]:8.2f}  '
+                f'p99 {summary["latency_ms"]["p99"]:8.2f} ms  '
+                f'{summary["queries_per_request"]["mean"]:5.1f} queries/req  {summary["errors"]} errors'
+            )
+        return results
+
+    def _run(self, build_request, count, concurrency):
+        requests = [build_request() for _ in range(count)]
+
+        def send(request):
+            method, path, body, headers = request
+            start = time.perf_counter()
+            status, query_count, _ = self._request(method, path, body, headers)
+            return (time.perf_counter() - start) * 1000, status, query_count
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(send, requests))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(sample[0] for sample in samples)
+        query_counts = [sample[2] for sample in samples if sample[2] is not None]
+        return {
+            'requests': count,
+            'errors': sum(1 for sample in samples if sample[1] >= 400),
+            'throughput_rps': count / elapsed,
+            'latency_ms': {
+                'mean': sum(latencies) / len(latencies),
+                'p50': percentile(latencies, 0.50),
+                'p95': percentile(latencies, 0.95),
+                'p99': percentile(latencies, 0.99),
+                'max': latencies[-1],
+            },
+            'queries_per_request': {
+                'mean': sum(query_counts) / len(query_counts) if query_counts else 0,
+                'max': max(query_counts, default=0),
+            },
+        }
+
+    def _request(self, method, path, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(
+            self.base_url + path, data=data, method=method,
+            headers={'Content-Type': 'application/json', 'Accept': 'application/json', **(headers or {})}
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                payload = response.read()
+                status, query_count = response.status, response.headers.get('X-Query-Count')
+        except urllib.error.HTTPError as error:
+            payload = error.read()
+            status, query_count = error.code, error.headers.get('X-Query-Count')
+        try:
+            parsed = json.loads(payload) if payload else None
+        except ValueError:
+            parsed = None
+        return status, int(query_count) if query_count is not None else None, parsed
+
+    @staticmethod
+    def _git_commit():
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                cwd=settings.BASE_DIR
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,167 @@
+import datetime
+import importlib.util
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.models import Article
+from blog.synthetic import TOPICS
+
+from .benchmark_api import percentile
+
+# (name, server, path prefix): the DRF views under gunicorn (core/wsgi.py),
+# the same DRF views under uvicorn, and the async views under uvicorn
+DEPLOYMENTS = (
+    ('wsgi', 'gunicorn', '/api/blog/articles/'),
+    ('asgi_sync_views', 'uvicorn', '/api/blog/articles/'),
+    ('asgi_async_views', 'uvicorn', '/api/blog/async/articles/'),
+)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = ('Compares concurrent read throughput of the WSGI deployment (gunicorn) '
+            'with the ASGI deployment (uvicorn) and its async article views')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per scenario and deployment')
+        parser.add_argument('--concurrency', type=int, default=32, help='Concurrent client threads')
+        parser.add_argument('--workers', type=int, default=1, help='Server worker processes (same for both servers)')
+        parser.add_argument('--threads', type=int, default=4, help='gunicorn threads per worker')
+        parser.add_argument('--cache', action='store_true',
+                            help='Keep the response cache on (off by default so every request reads the database)')
+        parser.add_argument('--deployment', action='append', dest='deployments',
+                            choices=[name for name, _, _ in DEPLOYMENTS], help='Only run the named deployment (repeatable)')
+        parser.add_argument('--output', default='benchmark_asgi_results.json', help='Where to write the JSON results')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        for server in ('gunicorn', 'uvicorn'):
+            if importlib.util.find_spec(server) is None:
+                raise CommandError(f'{server} is not installed (pip install {server})')
+        article_ids = list(Article.objects.published().values_list('id', flat=True)[:5000])
+        if not article_ids:
+            raise CommandError('No published articles to read; run seed_articles --count N first')
+
+        rng = random.Random(options['seed'])
+        scenarios = {
+            'list': lambda: '',
+            'list_page_50': lambda: '?page_size=50',
+            'search': lambda: f'search/?q={rng.choice(TOPICS).split()[0]}',
+            'retrieve': lambda: f'{rng.choice(article_ids)}/',
+        }
+        selected = [deployment for deployment in DEPLOYMENTS
+                    if not options['deployments'] or deployment[0] in options['deployments']]
+
+        results = {}
+        for name, server, prefix in selected:
+            port = free_port()
+            process = self._start(server, port, options)
+            try:
+                self._wait_until_ready(port, prefix, process)
+                results[name] = {}
+                for scenario, build_suffix in scenarios.items():
+                    urls = [f'http://127.0.0.1:{port}{prefix}{build_suffix()}' for _ in range(options['requests'])]
+                    summary = self._run(urls, options['concurrency'])
+                    results[name][scenario] = summary
+                    self.stdout.write(
+                        f'{name:<18} {scenario:<14} {summary["throughput_rps"]:8.1f} req/s  '
+                        f'p50 {summary["latency_ms"]["p50"]:8.2f}  p95 {summary["latency_ms"]["p95"]:8.2f} ms  '
+                        f'{summary["errors"]} errors'
+                    )
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+
+        report = {
+            'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'articles': Article.objects.count(),
+            'config': {
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'workers': options['workers'],
+                'threads': options['threads'],
+                'response_cache': options['cache'],
+                'cpus': os.cpu_count(),
+            },
+            'deployments': results,
+        }
+        with open(options['output'], 'w') as output:
+            json.dump(report, output, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
+
+    def _start(self, server, port, options):
+        if server == 'gunicorn':
+            command = [
+                sys.executable, '-m', 'gunicorn', 'core.wsgi:application',
+                '--bind', f'127.0.0.1:{port}', '--workers', str(options['workers']),
+                '--threads', str(options['threads']), '--log-level', 'warning',
+            ]
+        else:
+            command = [
+                sys.executable, '-m', 'uvicorn', 'core.asgi:application',
+                '--host', '127.0.0.1', '--port', str(port), '--workers', str(options['workers']),
+                '--log-level', 'warning', '--no-access-log',
+            ]
+        environment = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'))
+        if not options['cache']:
+            environment['BLOG_CACHE_ENABLED'] = '0'
+        return subprocess.Popen(command, cwd=settings.BASE_DIR, env=environment)
+
+    @staticmethod
+    def _wait_until_ready(port, prefix, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'Server exited with code {process.returncode}')
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}{prefix}'):
+                    return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f'Server did not start within {timeout}s')
+
+    def _run(self, urls, concurrency):
+        def send(url):
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url) as response:
+                    response.read()
+                    status = response.status
+            except urllib.error.HTTPError as error:
+                status = error.code
+            return (time.perf_counter() - start) * 1000, status
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            samples = list(executor.map(send, urls))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(sample[0] for sample in samples)
+        return {
+            'requests': len(urls),
+            'errors': sum(1 for sample in samples if sample[1] >= 400),
+            'throughput_rps': len(urls) / elapsed,
+            'latency_ms': {
+                'mean': sum(latencies) / len(latencies),
+                'p50': percentile(latencies, 0.50),
+                'p95': percentile(latencies, 0.95),
+                'p99': percentile(latencies, 0.99),
+                'max': latencies[-1],
+            },
+        }
@@ -0,0 +1,152 @@
+import datetime
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from admin.views import AdminArticleListView
+from blog.feed import SnapshotRequest
+from blog.models import Category, Article
+from blog.pagination import ArticleCursorPagination
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Seeds N articles and reports query plans and latency of hot Article queries with and without the indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=50000, help='Synthetic articles to add (rolled back afterwards)')
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--authors', type=int, default=50)
+        parser.add_argument('--repeat', type=int, default=50, help='Runs per query')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('benchmark_indexes relies on SQLite EXPLAIN QUERY PLAN output')
+        self.repeat = options['repeat']
+        rng = random.Random(options['seed'])
+        try:
+            with transaction.atomic():
+                self._seed(options['articles'], options['categories'], options['authors'], rng)
+                cursor_row = Article.objects.published().order_by('-date', '-id').values_list('date', 'id')[
+                    min(options['articles'] // 4, 10000)
+                ]
+                queries = self._queries(cursor_row)
+
+                self.stdout.write(self.style.MIGRATE_HEADING('With indexes'))
+                with_indexes = self._run(queries)
+
+                self._drop_indexes()
+                self.stdout.write(self.style.MIGRATE_HEADING('Without indexes (schema before 0006)'))
+                without_indexes = self._run(queries, without_title_index=True)
+
+                self.stdout.write(self.style.MIGRATE_HEADING('Median latency (ms)'))
+                for name in queries:
+                    self.stdout.write(
+                        f'  {name:<28} {without_indexes[name]:9.3f} -> {with_indexes[name]:9.3f}'
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _queries(self, cursor_row):
+        """
+        The querysets the views run: full listing rows joined to category
+        and author, not just ids an index could answer on its own
+        """
+        category_id = Category.objects.values_list('id', flat=True).first()
+        title = Article.objects.values_list('title', flat=True).last()
+        paginator = ArticleCursorPagination()
+        listing = Article.objects.published().for_listing().listing_values()
+        deep_cursor = SnapshotRequest(paginator.encode_cursor({'d': cursor_row[0].isoformat(), 'i': cursor_row[1]}))
+        return {
+            'public list': paginator.page_queryset(listing, SnapshotRequest(None)),
+            'public list, deep cursor': paginator.page_queryset(listing, deep_cursor),
+            'category page': paginator.page_queryset(listing.filter(category_id=category_id), SnapshotRequest(None)),
+            'admin list': Article.objects.select_related('category', 'author').only(
+                *AdminArticleListView.LIST_FIELDS
+            ).order_by(*AdminArticleListView.ordering)[:getattr(settings, 'BLOG_ADMIN_PAGE_SIZE', 20)],
+            # AdminArticleSerializer.validate_title
+            'title uniqueness check': Article.objects.filter(title=title).exclude(id=0).query.exists(),
+            # what ArticleViewSet.list runs for its ETag / Last-Modified
+            'list validators': (
+                'SELECT COUNT("id"), MAX("updated_at") FROM "blog_article" WHERE "status" = %s', ['published']
+            ),
+        }
+
+    @staticmethod
+    def _drop_indexes():
+        """
+        Back to the schema before the composite indexes: the primary key and
+        foreign key indexes only. SQLite DDL is transactional, so they come
+        back with the rollback.
+        """
+        with connection.cursor() as cursor:
+            for index in Article._meta.indexes:
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+            cursor.execute('ANALYZE')
+
+    def _run(self, queries, without_title_index=False):
+        results = {}
+        for name, query in queries.items():
+            if isinstance(query, tuple):
+                sql, params = query
+            else:
+                sql, params = getattr(query, 'query', query).sql_with_params()
+            if without_title_index:
+                # The unique title constraint is part of the table and can't
+                # be dropped; a unary + keeps SQLite from using its index
+                sql = sql.replace('"blog_article"."title" =', '+"blog_article"."title" =')
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = [row[-1] for row in cursor.fetchall()]
+                timings = []
+                for _ in range(self.repeat):
+                    start = time.perf_counter()
+                    cursor.execute(sql, params)
+                    cursor.fetchall()
+                    timings.append((time.perf_counter() - start) * 1000)
+            results[name] = statistics.median(timings)
+            self.stdout.write(f'  {name} ({results[name]:.3f} ms)')
+            for step in plan:
+                self.stdout.write(f'      {step}')
+        return results
+
+    def _seed(self, count, category_count, author_count, rng):
+        # Several authors, so the planner sees joins shaped like production
+        authors = User.objects.bulk_create(
+            User(username=f'benchmark_author_{number}') for number in range(author_count)
+        )
+        categories = [
+            Category.objects.create(name=f'Benchmark {number}', description='Benchmark category')
+            for number in range(category_count)
+        ]
+        start = datetime.date(2015, 1, 1)
+        Article.objects.bulk_create(
+            (
+                Article(
+                    title=f'Benchmark article {number}',
+                    excerpt='Synthetic article used by benchmark_indexes',
+                    content='',
+                    author=rng.choice(authors),
+                    category=rng.choice(categories),
+                    date=start + datetime.timedelta(days=rng.randint(0, 3650)),
+                    read_time=5,
+                    image='https://example.com/image.jpg',
+                    status='published' if rng.random() < 0.8 else 'draft',
+                )
+                for number in range(count)
+            ),
+            batch_size=2000
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(f'Seeded {count} articles by {author_count} authors in {category_count} categories')
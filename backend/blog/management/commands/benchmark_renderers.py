@@ -0,0 +1,51 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from admin.serializers import AdminArticleSerializer
+from blog.models import Article
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    help = ('Compares DRF\'s stdlib JSON renderer/parser with the orjson-backed ones '
+            'on admin article payloads (AdminArticleSerializer, full content)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Articles in the payload')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write('orjson is not installed: FastJSONRenderer falls back to the stdlib renderer')
+        articles = Article.objects.select_related('category', 'author').order_by('-created_at')[:options['rows']]
+        data = AdminArticleSerializer(articles, many=True).data
+        if not data:
+            raise CommandError('No articles; run seed_articles --count N first')
+
+        stdlib, fast = JSONRenderer().render(data), FastJSONRenderer().render(data)
+        if stdlib != fast:
+            raise CommandError('FastJSONRenderer output differs from JSONRenderer')
+        self.stdout.write(
+            f'{len(data)} articles, {len(stdlib) / 1024 / 1024:.1f} MiB of JSON, best of {options["repeat"]} runs'
+        )
+
+        measurements = (
+            ('render  JSONRenderer', lambda: JSONRenderer().render(data)),
+            ('render  FastJSONRenderer', lambda: FastJSONRenderer().render(data)),
+            ('parse   JSONParser', lambda: JSONParser().parse(io.BytesIO(stdlib))),
+            ('parse   FastJSONParser', lambda: FastJSONParser().parse(io.BytesIO(stdlib))),
+        )
+        for label, run in measurements:
+            best = min(self._time(run) for _ in range(options['repeat']))
+            self.stdout.write(f'{label:<28} {best * 1000:9.1f} ms  {len(stdlib) / best / 1024 / 1024:8.1f} MiB/s')
+
+    @staticmethod
+    def _time(run):
+        started = time.perf_counter()
+        run()
+        return time.perf_counter() - started
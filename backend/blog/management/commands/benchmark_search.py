@@ -0,0 +1,97 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.models import Category, Article
+from blog.search import IContainsSearchBackend, SQLiteFTS5SearchBackend
+
+SYLLABLES = ('ba', 'ko', 're', 'mi', 'ta', 'lu', 'sen', 'dar', 'vo', 'pix', 'nel', 'qua', 'tor', 'ei', 'ux')
+
+
+def build_vocabulary(rng, size=5000):
+    """
+    Zipf-like synthetic vocabulary so that terms have realistic selectivity
+    """
+    words = sorted({''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)})
+    rng.shuffle(words)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    return words, weights
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compares search latency of the full-text index against the icontains scan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=0,
+                            help='Synthetic published articles to add for the run (rolled back afterwards)')
+        parser.add_argument('--queries', type=int, default=200, help='Number of queries per backend')
+        parser.add_argument('--vocabulary', type=int, default=5000, help='Synthetic words to draw text from')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        self.words, self.weights = build_vocabulary(rng, options['vocabulary'])
+        try:
+            with transaction.atomic():
+                if options['articles']:
+                    self._create_articles(options['articles'], rng)
+                fts = SQLiteFTS5SearchBackend()
+                if not fts.is_available():
+                    self.stderr.write('FTS5 index is not available on this database')
+                    raise Rollback
+                if options['articles']:
+                    fts.rebuild()
+
+                terms = rng.sample(self.words, options['queries'])
+                total = Article.objects.filter(status='published').count()
+                self.stdout.write(f'{total} published articles, {len(terms)} queries per backend')
+                for backend in (IContainsSearchBackend(), fts):
+                    self._report(backend, terms)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _report(self, backend, terms):
+        timings = []
+        for term in terms:
+            start = time.perf_counter()
+            backend.search(term, limit=100)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(
+            f'  {backend.__class__.__name__:<26} mean {statistics.mean(timings):8.3f} ms'
+            f'  p50 {statistics.median(timings):8.3f} ms  p95 {p95:8.3f} ms'
+        )
+
+    def _create_articles(self, count, rng):
+        author = User.objects.filter(is_staff=True).first() or User.objects.create_user('benchmark')
+        category = Category.objects.first() or Category.objects.create(name='Benchmark', description='Benchmark')
+
+        def text(words):
+            return ' '.join(rng.choices(self.words, self.weights, k=words))
+
+        articles = [
+            Article(
+                # Random titles collide at scale; the row number keeps them unique
+                title=f'{text(6).title()} #{number}',
+                excerpt=text(20),
+                content=text(400),
+                author=author,
+                category=category,
+                date='2024-01-01',
+                read_time=5,
+                image='https://example.com/image.jpg',
+                status='published',
+            )
+            for number in range(count)
+        ]
+        Article.objects.bulk_create(articles, batch_size=1000)
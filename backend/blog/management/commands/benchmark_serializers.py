@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.models import Article
+from blog.serializers import ArticleListSerializer, ArticleListValuesSerializer
+
+
+class Command(BaseCommand):
+    help = 'Compares rows/sec of ArticleListSerializer and the values() fast path, with and without the query'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Published articles per run')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement (best is reported)')
+
+    def handle(self, *args, **options):
+        queryset = Article.objects.published().order_by('-date', '-id')[:options['rows']]
+        rows = len(queryset.values_list('id'))
+        if not rows:
+            raise CommandError('No published articles; run seed_articles --count N first')
+        self.stdout.write(f'{rows} rows, best of {options["repeat"]} runs')
+
+        instances = list(Article.objects.published().for_listing().order_by('-date', '-id')[:rows])
+        values = list(Article.objects.published().listing_values().order_by('-date', '-id')[:rows])
+        measurements = (
+            ('ArticleListSerializer, serialize only',
+             lambda: ArticleListSerializer(instances, many=True).data),
+            ('ArticleListValuesSerializer, serialize only',
+             lambda: ArticleListValuesSerializer(values, many=True).data),
+            ('ArticleListSerializer, query + serialize',
+             lambda: ArticleListSerializer(
+                 Article.objects.published().for_listing().order_by('-date', '-id')[:rows], many=True
+             ).data),
+            ('ArticleListValuesSerializer, query + serialize',
+             lambda: ArticleListValuesSerializer(
+                 Article.objects.published().listing_values().order_by('-date', '-id')[:rows], many=True
+             ).data),
+        )
+        for label, run in measurements:
+            best = min(self._time(run) for _ in range(options['repeat']))
+            self.stdout.write(f'{label:<48} {rows / best:12,.0f} rows/s  ({best * 1000:.1f} ms)')
+
+    @staticmethod
+    def _time(run):
+        started = time.perf_counter()
+        run()
+        return time.perf_counter() - started
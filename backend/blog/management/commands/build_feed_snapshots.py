@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.feed import feed_snapshots
+
+
+class Command(BaseCommand):
+    help = 'Renders the materialized article feed pages (overall and per category) into the feed cache'
+
+    def handle(self, *args, **kwargs):
+        count = feed_snapshots.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f'Rendered {count} feeds'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from blog.related import rebuild_related_articles
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the related-articles table for every published article'
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write('Building related articles...')
+        count = rebuild_related_articles()
+        self.stdout.write(self.style.SUCCESS(f'Stored {count} related-article links'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.changes import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Deletes article tombstones older than BLOG_CHANGES_RETENTION_DAYS (sync tokens that old get a 410)'
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} tombstones'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the article full-text search index from the database'
+
+    def handle(self, *args, **kwargs):
+        backend = get_search_backend()
+        self.stdout.write(f'Rebuilding search index with {backend.__class__.__name__}...')
+
+        with transaction.atomic():
+            count = backend.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} published articles'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Recounts the admin dashboard counters from the tables and corrects any drift (run periodically, e.g. from cron)'
+
+    def handle(self, *args, **kwargs):
+        drift = reconcile()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Counters are in sync'))
+            return
+        for key, (stored, actual) in sorted(drift.items()):
+            self.stdout.write(f'  {key}: {stored} -> {actual}')
+        self.stdout.write(self.style.WARNING(f'Corrected {len(drift)} counters'))
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from blog.scheduler import Scheduler, cache_is_shared
+
+
+class Command(BaseCommand):
+    help = 'Publishes scheduled drafts (publish_at) as they become due, checking every --tick seconds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tick', type=float, default=None,
+                            help='Seconds between checks (default: BLOG_SCHEDULER_TICK)')
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help='Articles published per transaction (default: BLOG_SCHEDULER_BATCH_SIZE)')
+        parser.add_argument('--once', action='store_true', help='Publish what is due now and exit')
+
+    def handle(self, *args, **options):
+        if not cache_is_shared():
+            self.stderr.write(self.style.WARNING(
+                'The cache is per-process (locmem): web processes will serve scheduled articles only '
+                'once their cached responses expire (BLOG_CACHE_TIMEOUT). Configure a shared cache '
+                'backend for immediate updates.'
+            ))
+        scheduler = Scheduler(tick=options['tick'], batch_size=options['batch_size'], sleep=self.sleep,
+                              log=self.stdout.write)
+        if options['once']:
+            published = scheduler.run_once()
+            self.stdout.write(self.style.SUCCESS(f'Published {published} scheduled articles'))
+            return
+        self.stdout.write(f'Publishing scheduled articles every {scheduler.tick}s (Ctrl+C to stop)')
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            pass
+
+    @staticmethod
+    def sleep(seconds):
+        # Don't hold on to a connection the server may drop while idle
+        close_old_connections()
+        time.sleep(seconds)
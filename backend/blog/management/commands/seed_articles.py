@@ -1,12 +1,40 @@
 import datetime
-from django.core.management.base import BaseCommand
+import secrets
+import time
+from multiprocessing import Pool
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
 from blog.models import Category, Article
+from blog.cache import ARTICLES, CATEGORIES, bump_content_version, response_cache
+from blog import feed
+from blog.counters import reconcile as reconcile_counters
+from blog.feed import feed_snapshots
+from blog.search import get_search_backend
+from blog.synthetic import generate_users, generate_categories, generate_articles_batch
 from django.contrib.auth.models import User
 
 class Command(BaseCommand):
-    help = 'Seeds the database with initial categories and articles'
+    help = 'Seeds the database with initial categories and articles, or with a synthetic corpus (--count)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=0,
+                            help='Generate N synthetic articles instead of the fixed sample data')
+        parser.add_argument('--users', type=int, default=100, help='Synthetic authors to create')
+        parser.add_argument('--categories', type=int, default=20, help='Synthetic categories to create')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Articles per bulk insert / transaction')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Processes generating article batches in parallel (inserts stay in this process)')
+        parser.add_argument('--content-words', type=int, default=300, help='Average words per article body')
+        parser.add_argument('--published-ratio', type=float, default=0.8)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for reproducible corpora')
+        parser.add_argument('--skip-search-index', action='store_true',
+                            help='Do not rebuild the search index afterwards')
 
     def handle(self, *args, **kwargs):
+        if kwargs['count']:
+            return self.seed_synthetic(**kwargs)
+
         self.stdout.write(self.style.SUCCESS('Seeding database with articles...'))
         
         # Delete existing data
@@ -184,12 +212,13 @@ class Command(BaseCommand):
             }
         ]
         
+        author = User.objects.get(username='admin')
         for article_data in articles_data:
             date_obj = datetime.datetime.strptime(article_data['date'], '%Y-%m-%d').date()
             article = Article.objects.create(
                 title=article_data['title'],
                 excerpt=article_data['excerpt'],
-                author=User.objects.get(username='admin'),
+                author=author,
                 date=date_obj,
                 read_time=article_data['readTime'],
                 category=categories[article_data['categoryId']],
@@ -198,4 +227,83 @@ class Command(BaseCommand):
             )
             self.stdout.write(f"  - {article.title}")
         
-        self.stdout.write(self.style.SUCCESS('Database seeded successfully!')) 
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS('Database seeded successfully!'))
+
+    def seed_synthetic(self, count, users, categories, batch_size, workers, content_words,
+                       published_ratio, seed, skip_search_index, **kwargs):
+        """
+        Add a synthetic corpus next to the existing data. Articles are
+        generated in batches (optionally by a pool of worker processes) and
+        written with bulk_create, one transaction per batch.
+        """
+        if users < 1 or categories < 1 or batch_size < 1 or workers < 1:
+            raise CommandError('--users, --categories, --batch-size and --workers must be positive')
+
+        tag = secrets.token_hex(3)
+        started = time.perf_counter()
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeding {count} synthetic articles ({users} users, {categories} categories, run {tag})...'
+        ))
+
+        unusable_password = make_password(None)
+        with transaction.atomic():
+            User.objects.bulk_create(
+                (
+                    User(username=username, email=email, first_name=first_name,
+                         last_name=last_name, password=unusable_password)
+                    for username, email, first_name, last_name in generate_users(users, tag)
+                ),
+                batch_size=batch_size
+            )
+            Category.objects.bulk_create(
+                (Category(name=name, description=description) for name, description in generate_categories(categories, tag)),
+                batch_size=batch_size
+            )
+        # bulk_create does not return ids on every backend; read them back
+        user_ids = list(User.objects.filter(username__startswith=f'seed_{tag}_').order_by('id').values_list('id', flat=True))
+        category_ids = list(Category.objects.filter(name__endswith=f'({tag})').order_by('id').values_list('id', flat=True))
+
+        batches = [
+            (start, min(batch_size, count - start), tag, seed, users, categories, content_words, published_ratio)
+            for start in range(0, count, batch_size)
+        ]
+        created = 0
+        pool = Pool(workers) if workers > 1 else None
+        try:
+            rows_iter = pool.imap(generate_articles_batch, batches) if pool else map(generate_articles_batch, batches)
+            for rows in rows_iter:
+                with transaction.atomic():
+                    Article.objects.bulk_create(
+                        (
+                            Article(
+                                title=title, excerpt=excerpt, content=content,
+                                author_id=user_ids[author_index], category_id=category_ids[category_index],
+                                date=date, read_time=read_time, image=image, status=status,
+                            )
+                            for title, excerpt, content, author_index, category_index, date, read_time, image, status in rows
+                        ),
+                        batch_size=batch_size
+                    )
+                created += len(rows)
+                rate = created / (time.perf_counter() - started)
+                self.stdout.write(f'  {created}/{count} articles ({rate:,.0f} rows/s)')
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        # bulk_create bypasses the model signals that maintain these
+        bump_content_version(ARTICLES)
+        response_cache.invalidate(ARTICLES, CATEGORIES)
+        reconcile_counters()
+        if feed.enabled():
+            feed_snapshots.rebuild_all()
+        if not skip_search_index:
+            self.stdout.write('Rebuilding search index...')
+            with transaction.atomic():
+                get_search_backend().rebuild()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {created} articles in {time.perf_counter() - started:.1f}s. '
+            'Run build_related_articles to refresh related articles.'
+        ))
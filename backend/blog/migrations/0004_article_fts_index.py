@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def create_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Article = apps.get_model('blog', 'Article')
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS blog_article_fts USING fts5("
+            "title, excerpt, content, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        cursor.executemany(
+            "INSERT INTO blog_article_fts (rowid, title, excerpt, content) VALUES (%s, %s, %s, %s)",
+            list(Article.objects.filter(status='published').values_list('id', 'title', 'excerpt', 'content'))
+        )
+
+
+def drop_fts_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS blog_article_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_alter_article_read_time'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def dedupe_titles(apps, schema_editor):
+    """
+    Suffix duplicate titles with the article id so the unique constraint applies
+    """
+    Article = apps.get_model('blog', 'Article')
+    duplicates = (
+        Article.objects.values('title')
+        .annotate(count=models.Count('id'))
+        .filter(count__gt=1)
+        .values_list('title', flat=True)
+    )
+    for title in list(duplicates):
+        for article in Article.objects.filter(title=title).order_by('id')[1:]:
+            article.title = f"{title[:190]} ({article.id})"
+            article.save(update_fields=['title'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_related_article'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_titles, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', '-date', '-id'], name='article_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['category', 'status', '-date', '-id'], name='article_category_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-created_at'], name='article_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', 'updated_at'], name='article_status_updated_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='article',
+            constraint=models.UniqueConstraint(fields=('title',), name='unique_article_title'),
+        ),
+    ]
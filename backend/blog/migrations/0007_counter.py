@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def initialize_counters(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    Category = apps.get_model('blog', 'Category')
+    Article = apps.get_model('blog', 'Article')
+    Counter = apps.get_model('blog', 'Counter')
+
+    counters = [
+        Counter(key='users:normal', value=User.objects.filter(is_staff=False).count()),
+        Counter(key='users:admin', value=User.objects.filter(is_staff=True).count()),
+        Counter(key='articles:total', value=Article.objects.count()),
+        Counter(key='articles:draft', value=Article.objects.filter(status='draft').count()),
+        Counter(key='articles:published', value=Article.objects.filter(status='published').count()),
+        Counter(key='categories:total', value=Category.objects.count()),
+    ]
+    for category in Category.objects.annotate(article_count=models.Count('articles')):
+        counters.append(Counter(
+            key=f'articles:category:{category.id}', category_id=category.id, value=category.article_count
+        ))
+    Counter.objects.bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('blog', '0006_article_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Counter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='blog.category')),
+            ],
+        ),
+        migrations.RunPython(initialize_counters, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models import Case, CharField, F, Q, Value, When
+from django.db.models.functions import Concat
 from django.contrib.auth.models import User
+from django.utils import timezone
 # Create your models here.
 
 class Category(models.Model):
@@ -13,6 +16,45 @@ class Category(models.Model):
         verbose_name_plural = "Categories"
 
 
+class ArticleQuerySet(models.QuerySet):
+
+    # Columns read by ArticleListSerializer / ArticleSerializer and the ETag validators
+    LISTING_FIELDS = (
+        'id', 'title', 'excerpt', 'date', 'read_time', 'image', 'status', 'updated_at',
+        'category__id', 'category__name', 'category__description',
+        'author__id', 'author__username', 'author__first_name', 'author__last_name',
+    )
+
+    def published(self):
+        return self.filter(status='published')
+
+    def for_listing(self):
+        """
+        Join category and author in the same query and load only the columns
+        the public serializers need, so a page costs one query whatever its size
+        """
+        return self.select_related('category', 'author').only(*self.LISTING_FIELDS)
+
+    # Columns of listing_values() rows, read by ArticleListValuesSerializer
+    LISTING_VALUES = (
+        'id', 'title', 'excerpt', 'date', 'read_time', 'image',
+        'category_id', 'category__name', 'category__description', 'author_name',
+    )
+
+    def listing_values(self, *extra):
+        """
+        Listing rows as named tuples, with the author's display name ("first
+        last", or the username when either is blank) computed in SQL. Extra
+        columns are appended for callers that need them (e.g. cursors).
+        """
+        return self.annotate(author_name=Case(
+            When(Q(author__first_name='') | Q(author__last_name=''), then=F('author__username')),
+            # Concat coalesces NULL parts to ''
+            default=Concat('author__first_name', Value(' '), 'author__last_name'),
+            output_field=CharField(),
+        )).values_list(*self.LISTING_VALUES, *extra, named=True)
+
+
 class Article(models.Model):
     title = models.CharField(max_length=200)
     excerpt = models.TextField()
@@ -25,7 +67,100 @@ class Article(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=10, choices=[('draft', 'Draft'), ('published', 'Published')], default='draft')
+    # Drafts are published by the run_scheduler command once this is due
+    publish_at = models.DateTimeField(null=True, blank=True)
+    # Picked by admins for the home page (see blog.featured)
+    featured = models.BooleanField(default=False)
+
+    objects = ArticleQuerySet.as_manager()
 
+    class Meta:
+        indexes = [
+            # public listing / keyset pagination: status filter, newest first
+            models.Index(fields=['status', '-date', '-id'], name='article_status_date_idx'),
+            # category pages and related-article candidates
+            models.Index(fields=['category', 'status', '-date', '-id'], name='article_category_status_idx'),
+            # admin listing
+            models.Index(fields=['-created_at'], name='article_created_at_idx'),
+            # count/max(updated_at) behind the list ETag, answered from the index alone
+            models.Index(fields=['status', 'updated_at'], name='article_status_updated_idx'),
+            # due scheduled drafts, oldest first
+            models.Index(fields=['status', 'publish_at', 'id'], name='article_status_publish_at_idx'),
+            # home page: featured first, then newest
+            models.Index(fields=['status', '-featured', '-date', '-id'], name='article_featured_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['title'], name='unique_article_title'),
+        ]
 
     def __str__(self):
         return self.title
+
+
+
+class RelatedArticle(models.Model):
+    """
+    Precomputed "related articles" of an article, best score first.
+    Maintained by blog.related; read by the article detail endpoint.
+    """
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='related_by')
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['article', 'related'], name='unique_related_article'),
+        ]
+        indexes = [
+            models.Index(fields=['article', '-score'], name='related_article_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id} -> {self.related_id} ({self.score:.3f})"
+
+
+
+class Counter(models.Model):
+    """
+    Maintained row counts behind the admin dashboard stats.
+    Kept up to date by blog.signals and corrected by reconcile_counters.
+    """
+    key = models.CharField(max_length=100, unique=True)
+    category = models.ForeignKey(Category, null=True, blank=True, on_delete=models.CASCADE, related_name='+')
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
+
+
+class ArticleTombstone(models.Model):
+    """
+    A published article that was deleted or unpublished, so delta-sync
+    clients can drop it. Written by blog.signals and blog.bulk; read by the
+    changes endpoint (see blog.changes).
+    """
+    article_id = models.IntegerField()
+    removed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['removed_at', 'id'], name='tombstone_removed_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.article_id} removed {self.removed_at:%Y-%m-%d %H:%M:%S}"
+
+
+class ContentVersion(models.Model):
+    """
+    A number bumped, in the writing transaction, by every change to what a
+    response cache scope serves, including the ones that leave the article
+    rows alone (category and author renames, related-article rebuilds).
+    Shared by every process, unlike the cache generations; the article
+    ETags are built from it (see blog.cache.Validators).
+    """
+    scope = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.scope} v{self.value}"
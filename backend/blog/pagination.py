@@ -0,0 +1,142 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class ArticleCursorPagination(BasePagination):
+    """
+    Keyset pagination over (date, id), newest first.
+
+    The cursor carries the (date, id) of the last article on the previous
+    page, so every page is a single indexed range scan no matter how deep
+    the client has paged. Relevance-ranked lists (search) reuse the same
+    opaque cursor, carrying a position in the ranked list instead.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.page_size = getattr(settings, 'BLOG_PAGE_SIZE', 12)
+        self.max_page_size = getattr(settings, 'BLOG_MAX_PAGE_SIZE', 100)
+        self.next_cursor = None
+        self.request = None
+        self.current_page_size = self.page_size
+
+    @staticmethod
+    def query_params(request):
+        # DRF requests expose query_params; plain (async) Django requests GET
+        return getattr(request, 'query_params', request.GET)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(self.query_params(request)[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = self.query_params(request).get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            return json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def encode_cursor(position):
+        return base64.urlsafe_b64encode(json.dumps(position, separators=(',', ':')).encode()).decode('ascii')
+
+    def page_queryset(self, queryset, request):
+        """
+        Order and cursor-filter ``queryset``, sliced to one row past the page
+        so ``finish_page`` can tell whether there is a next page. Split from
+        ``paginate_queryset`` so async views can evaluate the slice themselves.
+        """
+        self.request = request
+        self.current_page_size = page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        queryset = queryset.order_by('-date', '-id')
+        if cursor is not None:
+            try:
+                date = datetime.date.fromisoformat(cursor['d'])
+                last_id = int(cursor['i'])
+            except (KeyError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            queryset = queryset.filter(Q(date__lt=date) | Q(date=date, id__lt=last_id))
+
+        return queryset[:page_size + 1]
+
+    def finish_page(self, articles):
+        page_size = self.current_page_size
+        if len(articles) > page_size:
+            articles = articles[:page_size]
+            last = articles[-1]
+            self.next_cursor = self.encode_cursor({'d': last.date.isoformat(), 'i': last.id})
+        else:
+            self.next_cursor = None
+        return articles
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.finish_page(list(self.page_queryset(queryset, request)))
+
+    def paginate_ranked(self, fetch, request):
+        """
+        Paginate a relevance-ranked result. ``fetch(offset, limit)`` must
+        return at most ``limit`` items starting at ``offset``.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        offset = 0
+        if cursor is not None:
+            try:
+                offset = int(cursor['o'])
+            except (KeyError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            if offset < 0:
+                raise NotFound(self.invalid_cursor_message)
+
+        items = list(fetch(offset, page_size + 1))
+        if len(items) > page_size:
+            items = items[:page_size]
+            self.next_cursor = self.encode_cursor({'o': offset + page_size})
+        else:
+            self.next_cursor = None
+        return items
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,176 @@
+import math
+import re
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from .cache import ARTICLES, bump_content_version, response_cache
+from .models import Article, RelatedArticle
+from .search import get_search_backend
+
+STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have how in into is it its of on or
+that the their this to was were what when where which who why will with you your
+""".split())
+
+
+def tokenize(*texts):
+    return {
+        word for text in texts for word in re.findall(r'\w+', text.lower())
+        if len(word) > 2 and word not in STOP_WORDS
+    }
+
+
+def related_count():
+    return getattr(settings, 'BLOG_RELATED_COUNT', 3)
+
+
+def score(tokens, category_id, other_tokens, other_category_id):
+    """
+    Relatedness of two articles: a fixed bonus for sharing a category plus
+    the cosine overlap of their title/excerpt terms
+    """
+    value = getattr(settings, 'BLOG_RELATED_CATEGORY_WEIGHT', 0.5) if category_id == other_category_id else 0.0
+    if tokens and other_tokens:
+        value += len(tokens & other_tokens) / math.sqrt(len(tokens) * len(other_tokens))
+    return value
+
+
+def rebuild_related_articles():
+    """
+    Recompute the whole related-articles table in memory. Candidates of an
+    article are the other articles of its category and every article that
+    shares a term with it, skipping terms too common to be informative.
+    """
+    articles = {
+        article_id: (tokenize(title, excerpt), category_id)
+        for article_id, title, excerpt, category_id in Article.objects.published().values_list(
+            'id', 'title', 'excerpt', 'category_id'
+        ).iterator()
+    }
+    postings = defaultdict(list)
+    by_category = defaultdict(list)
+    for article_id, (tokens, category_id) in articles.items():
+        for token in tokens:
+            postings[token].append(article_id)
+        by_category[category_id].append(article_id)
+    max_postings = max(50, len(articles) // 10)
+    limit = related_count()
+
+    rows = []
+    for article_id, (tokens, category_id) in articles.items():
+        candidates = set(by_category[category_id][-max_postings:])
+        for token in tokens:
+            if len(postings[token]) <= max_postings:
+                candidates.update(postings[token])
+        candidates.discard(article_id)
+        scored = sorted(
+            ((score(tokens, category_id, *articles[other]), other) for other in candidates),
+            reverse=True
+        )[:limit]
+        rows.extend(
+            RelatedArticle(article_id=article_id, related_id=other, score=value)
+            for value, other in scored if value > 0
+        )
+
+    with transaction.atomic():
+        RelatedArticle.objects.all().delete()
+        RelatedArticle.objects.bulk_create(rows, batch_size=2000)
+        # Detail payloads embed the lists
+        bump_content_version(ARTICLES)
+        transaction.on_commit(lambda: response_cache.invalidate(ARTICLES))
+    return len(rows)
+
+
+def _candidates(article, tokens):
+    """
+    Recent articles of the same category plus the best full-text matches on
+    the article's terms, as {id: (tokens, category_id)}
+    """
+    limit = getattr(settings, 'BLOG_RELATED_CANDIDATES', 200)
+    ids = set(
+        Article.objects.published().filter(category_id=article.category_id)
+        .order_by('-date', '-id').values_list('id', flat=True)[:limit]
+    )
+    ids.update(get_search_backend().match_any(tokens, limit=limit))
+    ids.discard(article.id)
+    return {
+        other_id: (tokenize(title, excerpt), category_id)
+        for other_id, title, excerpt, category_id in Article.objects.published().filter(
+            id__in=ids
+        ).values_list('id', 'title', 'excerpt', 'category_id')
+    }
+
+
+def _refresh(article_id):
+    article = Article.objects.published().filter(id=article_id).only('id', 'title', 'excerpt', 'category_id').first()
+    RelatedArticle.objects.filter(article_id=article_id).delete()
+    if article is None:
+        return {}
+    tokens = tokenize(article.title, article.excerpt)
+    candidates = _candidates(article, tokens)
+    scores = {
+        other_id: score(tokens, article.category_id, *candidate)
+        for other_id, candidate in candidates.items()
+    }
+    best = sorted(((value, other_id) for other_id, value in scores.items() if value > 0), reverse=True)
+    RelatedArticle.objects.bulk_create(
+        RelatedArticle(article_id=article_id, related_id=other_id, score=value)
+        for value, other_id in best[:related_count()]
+    )
+    return scores
+
+
+def update_related_articles(article_id, affected_ids=()):
+    """
+    Incrementally update the table after an article was saved or deleted:
+    recompute its own list, drop it from lists it no longer belongs to and
+    insert it into the candidates' lists where it now beats their weakest
+    entry. ``affected_ids`` are articles whose lists contained it before.
+    """
+    affected_ids = set(affected_ids) | set(
+        RelatedArticle.objects.filter(related_id=article_id).values_list('article_id', flat=True)
+    )
+    affected_ids.discard(article_id)
+    RelatedArticle.objects.filter(related_id=article_id).delete()
+
+    scores = _refresh(article_id)
+    limit = related_count()
+
+    existing = defaultdict(list)
+    for owner_id, value, related_id in RelatedArticle.objects.filter(
+        article_id__in=list(scores)
+    ).values_list('article_id', 'score', 'related_id'):
+        existing[owner_id].append((value, related_id))
+
+    new_rows = []
+    for owner_id, value in scores.items():
+        if owner_id in affected_ids or value <= 0:
+            continue
+        if len(existing[owner_id]) < limit:
+            new_rows.append(RelatedArticle(article_id=owner_id, related_id=article_id, score=value))
+        elif (value, article_id) > min(existing[owner_id]):
+            # The saved article beats this owner's weakest entry (newer wins
+            # ties, as in the full rebuild); recompute it
+            affected_ids.add(owner_id)
+    RelatedArticle.objects.bulk_create(new_rows)
+
+    for owner_id in affected_ids:
+        _refresh(owner_id)
+
+
+def update_related_articles_many(article_ids, affected_ids=()):
+    """
+    ``update_related_articles`` for a batch of changed articles. Past
+    ``BLOG_RELATED_BULK_REBUILD`` articles a full rebuild is cheaper than
+    the incremental updates.
+    """
+    article_ids = list(article_ids)
+    if len(article_ids) > getattr(settings, 'BLOG_RELATED_BULK_REBUILD', 100):
+        rebuild_related_articles()
+        return
+    for article_id in article_ids:
+        update_related_articles(article_id)
+    for owner_id in set(affected_ids) - set(article_ids):
+        _refresh(owner_id)
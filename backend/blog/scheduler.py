@@ -0,0 +1,88 @@
+"""
+Scheduled publishing: drafts whose ``publish_at`` is due are published in
+batches by the ``run_scheduler`` command.
+
+The clock and the sleep function are injectable so the loop can be driven
+by a fake clock in tests.
+
+The scheduler runs in its own process, so the cache invalidations it makes
+only reach the web processes through a shared cache backend (Redis,
+Memcached, a FileBasedCache). With a per-process cache such as locmem the
+web processes pick up scheduled publishes as their cached responses and
+home feed expire (``BLOG_CACHE_TIMEOUT``); their suggestion indexes check
+the database every ``BLOG_SUGGEST_REFRESH_INTERVAL`` seconds.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+
+from . import bulk
+from .models import Article
+
+
+def due_article_ids(now, limit):
+    """
+    Ids of the oldest due scheduled drafts, read from the
+    (status, publish_at, id) index
+    """
+    return list(
+        Article.objects.filter(status='draft', publish_at__lte=now)
+        .order_by('publish_at', 'id').values_list('id', flat=True)[:limit]
+    )
+
+
+def publish_due_articles(now=None, batch_size=None):
+    """
+    Publish every draft due at ``now`` and return how many were published.
+    Each batch is one ``bulk.set_article_status`` transaction, so caches,
+    indexes and feeds are refreshed once per batch.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, 'BLOG_SCHEDULER_BATCH_SIZE', 500)
+    published = 0
+    while True:
+        ids = due_article_ids(now, batch_size)
+        if not ids:
+            return published
+        results = bulk.set_article_status(ids, 'published')
+        published += sum(1 for result in results.values() if result == bulk.UPDATED)
+        if len(ids) < batch_size:
+            return published
+
+
+def cache_is_shared():
+    """
+    False when the response cache lives in this process only
+    """
+    return not isinstance(caches[getattr(settings, 'BLOG_CACHE_ALIAS', 'default')], LocMemCache)
+
+
+class Scheduler:
+    """
+    Long-running loop publishing due drafts every ``tick`` seconds
+    """
+
+    def __init__(self, tick=None, batch_size=None, clock=timezone.now, sleep=time.sleep, log=None):
+        self.tick = tick or getattr(settings, 'BLOG_SCHEDULER_TICK', 30)
+        self.batch_size = batch_size
+        self.clock = clock
+        self.sleep = sleep
+        self.log = log or (lambda message: None)
+
+    def run_once(self):
+        now = self.clock()
+        published = publish_due_articles(now, self.batch_size)
+        if published:
+            self.log(f'{now.isoformat()}: published {published} scheduled articles')
+        return published
+
+    def run(self, max_ticks=None):
+        ticks = 0
+        while max_ticks is None or ticks < max_ticks:
+            self.run_once()
+            ticks += 1
+            if max_ticks is None or ticks < max_ticks:
+                self.sleep(self.tick)
@@ -0,0 +1,251 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import Article
+
+
+class BaseSearchBackend:
+    """
+    Interface every article search backend has to implement.
+
+    A backend keeps its own index of published articles in sync through
+    ``index`` and ``remove`` and answers ``search`` with a list of article
+    ids ordered by relevance.
+    """
+
+    def is_available(self):
+        return True
+
+    def index(self, article):
+        raise NotImplementedError
+
+    def remove(self, article_id):
+        raise NotImplementedError
+
+    def index_many(self, articles):
+        """
+        ``index`` for a batch of articles; backends can do it in fewer statements
+        """
+        for article in articles:
+            self.index(article)
+
+    def remove_many(self, article_ids):
+        for article_id in article_ids:
+            self.remove(article_id)
+
+    def rebuild(self, queryset=None):
+        raise NotImplementedError
+
+    def search(self, term, limit=None, offset=0, within=None):
+        """
+        Ranked ids of the articles matching ``term``, restricted to the
+        ``within`` queryset (e.g. the list filters) when one is given
+        """
+        raise NotImplementedError
+
+    def filter(self, queryset, term):
+        """
+        ``queryset`` narrowed to the articles matching ``term``, unranked,
+        for aggregates over the whole result (facet counts)
+        """
+        raise NotImplementedError
+
+    def match_any(self, tokens, limit):
+        """
+        Ids of the articles best matching any of ``tokens``. Optional: used
+        to find related-article candidates outside the article's category.
+        """
+        return []
+
+
+class IContainsSearchBackend(BaseSearchBackend):
+    """
+    Index-less backend that scans title, excerpt and content with icontains.
+    Used when no real full-text index is available for the database.
+    """
+
+    def index(self, article):
+        pass
+
+    def remove(self, article_id):
+        pass
+
+    def rebuild(self, queryset=None):
+        return 0
+
+    def search(self, term, limit=None, offset=0, within=None):
+        queryset = Article.objects.all() if within is None else within
+        ids = self.filter(queryset.filter(status='published'), term).order_by('-date', '-id').values_list(
+            'id', flat=True
+        )
+        if limit:
+            return list(ids[offset:offset + limit])
+        return list(ids[offset:])
+
+    def filter(self, queryset, term):
+        return queryset.filter(
+            Q(title__icontains=term) |
+            Q(excerpt__icontains=term) |
+            Q(content__icontains=term)
+        )
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """
+    Inverted index stored in an SQLite FTS5 virtual table (see migration 0004).
+    Results are ranked with BM25, with matches in the title weighted higher
+    than the excerpt and the excerpt higher than the body.
+    """
+
+    table = 'blog_article_fts'
+    weights = (10.0, 4.0, 1.0)  # title, excerpt, content
+
+    def is_available(self):
+        if connection.vendor != 'sqlite':
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [self.table]
+            )
+            return cursor.fetchone() is not None
+
+    def index(self, article):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [article.id])
+            if article.status != 'published':
+                return
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, excerpt, content) VALUES (%s, %s, %s, %s)",
+                [article.id, article.title, article.excerpt, article.content]
+            )
+
+    def remove(self, article_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [article_id])
+
+    # Stay below SQLite's bound-parameter limit in the IN (...) lists
+    batch_size = 500
+
+    def index_many(self, articles):
+        articles = list(articles)
+        self.remove_many([article.id for article in articles])
+        rows = [
+            (article.id, article.title, article.excerpt, article.content)
+            for article in articles if article.status == 'published'
+        ]
+        if rows:
+            with connection.cursor() as cursor:
+                self._insert_many(cursor, rows)
+
+    def remove_many(self, article_ids):
+        article_ids = list(article_ids)
+        with connection.cursor() as cursor:
+            for start in range(0, len(article_ids), self.batch_size):
+                batch = article_ids[start:start + self.batch_size]
+                cursor.execute(
+                    f"DELETE FROM {self.table} WHERE rowid IN ({', '.join(['%s'] * len(batch))})", batch
+                )
+
+    def rebuild(self, queryset=None):
+        if queryset is None:
+            queryset = Article.objects.all()
+        rows = queryset.filter(status='published').values_list('id', 'title', 'excerpt', 'content')
+        count = 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            batch = []
+            for row in rows.iterator(chunk_size=2000):
+                batch.append(row)
+                if len(batch) == 2000:
+                    self._insert_many(cursor, batch)
+                    count += len(batch)
+                    batch = []
+            if batch:
+                self._insert_many(cursor, batch)
+                count += len(batch)
+            cursor.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('optimize')")
+        return count
+
+    def _insert_many(self, cursor, rows):
+        cursor.executemany(
+            f"INSERT INTO {self.table} (rowid, title, excerpt, content) VALUES (%s, %s, %s, %s)",
+            rows
+        )
+
+    def search(self, term, limit=None, offset=0, within=None):
+        match = self.build_match_expression(term)
+        if not match:
+            return []
+        title_w, excerpt_w, content_w = self.weights
+        sql = f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s"
+        params = [match]
+        if within is not None:
+            within_sql, within_params = within.order_by().values('id').query.sql_with_params()
+            sql += f" AND rowid IN ({within_sql})"
+            params.extend(within_params)
+        sql += f" ORDER BY bm25({self.table}, {title_w}, {excerpt_w}, {content_w})"
+        if limit or offset:
+            sql += " LIMIT %s OFFSET %s"
+            params.extend([limit or -1, offset])
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def filter(self, queryset, term):
+        match = self.build_match_expression(term)
+        if not match:
+            return queryset.none()
+        return queryset.filter(id__in=RawSQL(f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [match]))
+
+    def match_any(self, tokens, limit):
+        if not tokens:
+            return []
+        match = ' OR '.join(f'"{token}"' for token in tokens)
+        title_w, excerpt_w, content_w = self.weights
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s "
+                f"ORDER BY bm25({self.table}, {title_w}, {excerpt_w}, {content_w}) LIMIT %s",
+                [match, limit]
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    @staticmethod
+    def build_match_expression(term):
+        """
+        Turn free user input into a safe FTS5 query: every word becomes a
+        quoted prefix token, so "reac hoo" matches "React Hooks".
+        """
+        tokens = re.findall(r'\w+', term.lower())
+        return ' '.join(f'"{token}"*' for token in tokens)
+
+
+_backend = None
+
+
+def get_search_backend():
+    """
+    Return the configured search backend, falling back to the icontains scan
+    when the configured index is not available on this database.
+    """
+    global _backend
+    if _backend is None:
+        backend_class = import_string(getattr(
+            settings, 'BLOG_SEARCH_BACKEND', 'blog.search.SQLiteFTS5SearchBackend'
+        ))
+        backend = backend_class()
+        if not backend.is_available():
+            backend = IContainsSearchBackend()
+        _backend = backend
+    return _backend
+
+
+def reset_search_backend():
+    global _backend
+    _backend = None
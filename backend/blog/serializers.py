@@ -39,4 +39,39 @@ class ArticleListSerializer(serializers.ModelSerializer):
     def get_author(self, obj):
         if obj.author.first_name and obj.author.last_name:
             return f"{obj.author.first_name} {obj.author.last_name}"
-        return obj.author.username
\ No newline at end of file
+        return obj.author.username
+
+
+class ArticleListValuesSerializer:
+    """
+    Read-only fast path for ArticleListSerializer.
+
+    Builds the same dicts straight from ``Article.objects.listing_values()``
+    rows instead of model instances, skipping the per-row field machinery
+    of the nested category serializer and the author method field.
+    """
+
+    def __init__(self, instance, many=True):
+        self.instance = instance
+
+    @staticmethod
+    def to_representation(row):
+        return {
+            'id': row.id,
+            'title': row.title,
+            'excerpt': row.excerpt,
+            'author': row.author_name,
+            'date': row.date.isoformat(),
+            'read_time': row.read_time,
+            'image': row.image,
+            'category': {
+                'id': row.category_id,
+                'name': row.category__name,
+                'description': row.category__description,
+            },
+        }
+
+    @property
+    def data(self):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in self.instance]
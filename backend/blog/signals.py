@@ -0,0 +1,347 @@
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from . import counters, events, feed
+from .changes import record_tombstones
+from .cache import ARTICLES, CATEGORIES, USERS, bump_content_version, response_cache
+from .featured import featured_articles
+from .feed import feed_snapshots
+from .models import Category, Article, RelatedArticle
+from .related import update_related_articles
+from .search import get_search_backend
+from .suggest import suggestion_index
+
+_bulk_operation = ContextVar('blog_bulk_operation', default=False)
+
+
+@contextmanager
+def bulk_operation():
+    """
+    Mute the per-article receivers below while ``blog.bulk`` changes a
+    batch of articles; it does the same maintenance once for the batch
+    """
+    token = _bulk_operation.set(True)
+    try:
+        yield
+    finally:
+        _bulk_operation.reset(token)
+
+
+def unless_bulk(receiver_function):
+    @functools.wraps(receiver_function)
+    def wrapper(*args, **kwargs):
+        if not _bulk_operation.get():
+            return receiver_function(*args, **kwargs)
+    return wrapper
+
+
+@receiver(post_save, sender=Article)
+@unless_bulk
+def index_article(sender, instance, raw=False, **kwargs):
+    """
+    Keep the search and suggestion indexes in sync with the saved article
+    """
+    if raw:
+        return
+    get_search_backend().index(instance)
+    suggestion_index.update_article(instance)
+
+
+@receiver(post_delete, sender=Article)
+@unless_bulk
+def unindex_article(sender, instance, **kwargs):
+    """
+    Drop a deleted article from the search and suggestion indexes
+    """
+    get_search_backend().remove(instance.id)
+    suggestion_index.remove_article(instance.id)
+
+
+@receiver(post_save, sender=Article)
+@unless_bulk
+def refresh_related_articles(sender, instance, raw=False, **kwargs):
+    """
+    Incrementally update the precomputed related-articles table
+    """
+    if raw:
+        return
+    update_related_articles(instance.id)
+
+
+@receiver(pre_delete, sender=Article)
+@unless_bulk
+def remember_related_owners(sender, instance, **kwargs):
+    # The cascade removes these rows before post_delete, so note which
+    # articles listed this one and need a replacement entry
+    instance._related_owner_ids = list(
+        RelatedArticle.objects.filter(related_id=instance.id).values_list('article_id', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Article)
+@unless_bulk
+def refresh_related_after_delete(sender, instance, **kwargs):
+    update_related_articles(instance.id, getattr(instance, '_related_owner_ids', ()))
+
+
+@receiver(post_save, sender=Category)
+def index_category(sender, instance, raw=False, **kwargs):
+    """
+    Keep category name suggestions in sync with the saved category
+    """
+    if raw:
+        return
+    suggestion_index.update_category(instance)
+
+
+@receiver(post_delete, sender=Category)
+def unindex_category(sender, instance, **kwargs):
+    """
+    Drop a deleted category from the suggestion index
+    """
+    suggestion_index.remove_category(instance.id)
+
+
+def invalidate_after_commit(*scopes):
+    """
+    Drop cached responses once the change is visible to other connections,
+    so a concurrent request cannot re-cache the old data
+    """
+    if ARTICLES in scopes:
+        # Here, not on commit: the ETags must change together with the data
+        bump_content_version(ARTICLES)
+
+    def invalidate():
+        response_cache.invalidate(*scopes)
+        if ARTICLES in scopes and featured_articles.cache_enabled():
+            # Keep the home page warm
+            featured_articles.rebuild()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@unless_bulk
+def invalidate_article_responses(sender, **kwargs):
+    invalidate_after_commit(ARTICLES)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_responses(sender, **kwargs):
+    # Article payloads embed their category
+    invalidate_after_commit(ARTICLES, CATEGORIES)
+
+
+# User fields article payloads embed (the author's display name)
+AUTHOR_NAME_FIELDS = frozenset(('username', 'first_name', 'last_name'))
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_responses(sender, created, update_fields=None, **kwargs):
+    # Skip login bookkeeping
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    # A new user has no articles yet, and partial saves of other fields
+    # leave the display name alone; both still change the user counts
+    if created or (update_fields and not AUTHOR_NAME_FIELDS.intersection(update_fields)):
+        invalidate_after_commit(USERS)
+    else:
+        invalidate_after_commit(ARTICLES, USERS)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_user_counts(sender, **kwargs):
+    invalidate_after_commit(USERS)
+
+
+def rebuild_feeds_after_commit(*feeds):
+    """
+    Re-render feed snapshots once the change is committed; ``None`` means
+    every feed
+    """
+    if not feed.enabled():
+        return
+    if None in feeds:
+        transaction.on_commit(feed_snapshots.rebuild_all)
+    else:
+        transaction.on_commit(lambda: [feed_snapshots.rebuild(name) for name in dict.fromkeys(feeds)])
+
+
+@receiver(post_save, sender=Article)
+@receiver(post_delete, sender=Article)
+@unless_bulk
+def rebuild_article_feeds(sender, instance, **kwargs):
+    # _counted still holds the category the article was loaded with, so a
+    # move re-renders the category it left as well
+    old_category_id = getattr(instance, '_counted', (None, None))[1]
+    feeds = [feed.ALL, instance.category_id]
+    if old_category_id is not None:
+        feeds.append(old_category_id)
+    rebuild_feeds_after_commit(*feeds)
+
+
+@receiver(post_save, sender=Category)
+def rebuild_category_feeds(sender, instance, created, **kwargs):
+    # Every page embeds the category, so a rename touches the "all" feed too
+    if not created:
+        rebuild_feeds_after_commit(feed.ALL, instance.id)
+
+
+@receiver(post_delete, sender=Category)
+def drop_category_feed(sender, instance, **kwargs):
+    # Its articles were deleted in the cascade, which rebuilt the rest
+    if feed.enabled():
+        transaction.on_commit(lambda: feed_snapshots.remove(instance.id))
+
+
+@receiver(post_save, sender=User)
+def rebuild_author_feeds(sender, instance, update_fields=None, created=False, **kwargs):
+    if created or (update_fields and not AUTHOR_NAME_FIELDS.intersection(update_fields)):
+        return
+    # Only the feeds the author's published articles appear in
+    category_ids = set(
+        Article.objects.published().filter(author=instance).values_list('category_id', flat=True).distinct()
+    )
+    if category_ids:
+        rebuild_feeds_after_commit(feed.ALL, *category_ids)
+
+
+# Tombstones for the changes endpoint (blog.changes)
+
+@receiver(post_save, sender=Article)
+@unless_bulk
+def record_unpublish(sender, instance, created, raw=False, **kwargs):
+    # _counted still holds the status the article was loaded with
+    if created or raw:
+        return
+    if getattr(instance, '_counted', (None, None))[0] == 'published' and instance.status != 'published':
+        record_tombstones([instance.id])
+
+
+@receiver(post_delete, sender=Article)
+@unless_bulk
+def record_delete(sender, instance, **kwargs):
+    if instance.status == 'published':
+        record_tombstones([instance.id])
+
+
+# Change events for the admin stream (blog.events)
+
+@receiver(post_save, sender=Article)
+@unless_bulk
+def publish_article_event(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        events.broadcaster.publish_after_commit(
+            events.ARTICLE, events.CREATED if created else events.UPDATED, [instance], events.article_state
+        )
+
+
+@receiver(post_save, sender=Category)
+def publish_category_event(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        events.broadcaster.publish_after_commit(
+            events.CATEGORY, events.CREATED if created else events.UPDATED, [instance], events.category_state
+        )
+
+
+@receiver(post_save, sender=User)
+def publish_user_event(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    events.broadcaster.publish_after_commit(
+        events.USER, events.CREATED if created else events.UPDATED, [instance], events.user_state
+    )
+
+
+@receiver(post_delete, sender=Article)
+@unless_bulk
+def publish_article_delete_event(sender, instance, **kwargs):
+    events.broadcaster.publish_after_commit(events.ARTICLE, events.DELETED, [instance])
+
+
+@receiver(post_delete, sender=Category)
+def publish_category_delete_event(sender, instance, **kwargs):
+    events.broadcaster.publish_after_commit(events.CATEGORY, events.DELETED, [instance])
+
+
+@receiver(post_delete, sender=User)
+def publish_user_delete_event(sender, instance, **kwargs):
+    events.broadcaster.publish_after_commit(events.USER, events.DELETED, [instance])
+
+
+# Dashboard counters. post_init remembers the counted fields as loaded
+# (reading __dict__ so deferred fields never trigger a query), which lets
+# post_save tell a publish, category move or is_staff change from a no-op.
+
+@receiver(post_init, sender=Article)
+def remember_article_counted_fields(sender, instance, **kwargs):
+    instance._counted = (instance.__dict__.get('status'), instance.__dict__.get('category_id'))
+
+
+@receiver(post_save, sender=Article)
+@unless_bulk
+def count_article(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    status, category_id = instance.status, instance.category_id
+    if created:
+        counters.adjust(counters.ARTICLES, 1)
+        counters.adjust(counters.ARTICLES_BY_STATUS.get(status), 1)
+        counters.adjust(counters.category_key(category_id), 1)
+    else:
+        old_status, old_category_id = instance._counted
+        if old_status is not None and old_status != status:
+            counters.adjust(counters.ARTICLES_BY_STATUS.get(old_status), -1)
+            counters.adjust(counters.ARTICLES_BY_STATUS.get(status), 1)
+        if old_category_id is not None and old_category_id != category_id:
+            counters.adjust(counters.category_key(old_category_id), -1)
+            counters.adjust(counters.category_key(category_id), 1)
+    instance._counted = (status, category_id)
+
+
+@receiver(post_delete, sender=Article)
+@unless_bulk
+def uncount_article(sender, instance, **kwargs):
+    counters.adjust(counters.ARTICLES, -1)
+    counters.adjust(counters.ARTICLES_BY_STATUS.get(instance.status), -1)
+    counters.adjust(counters.category_key(instance.category_id), -1)
+
+
+@receiver(post_save, sender=Category)
+def count_category(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.add_category(instance)
+
+
+@receiver(post_delete, sender=Category)
+def uncount_category(sender, instance, **kwargs):
+    counters.adjust(counters.CATEGORIES, -1)
+
+
+@receiver(post_init, sender=User)
+def remember_user_counted_fields(sender, instance, **kwargs):
+    instance._counted_is_staff = instance.__dict__.get('is_staff')
+
+
+@receiver(post_save, sender=User)
+def count_user(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        counters.adjust(counters.user_key(instance.is_staff), 1)
+    elif instance._counted_is_staff is not None and instance._counted_is_staff != instance.is_staff:
+        counters.adjust(counters.user_key(instance._counted_is_staff), -1)
+        counters.adjust(counters.user_key(instance.is_staff), 1)
+    instance._counted_is_staff = instance.is_staff
+
+
+@receiver(post_delete, sender=User)
+def uncount_user(sender, instance, **kwargs):
+    counters.adjust(counters.user_key(instance.is_staff), -1)
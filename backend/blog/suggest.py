@@ -0,0 +1,227 @@
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+
+from .models import Category, Article
+
+
+def normalize(text):
+    return ' '.join(re.findall(r'\w+', text.lower()))
+
+
+class SuggestionIndex:
+    """
+    In-process prefix index used for search-as-you-type suggestions.
+
+    Every published article contributes one key per word of its title (the
+    title from that word onwards), so "hoo" and "react ho" both find
+    "Mastering React Hooks". Keys live in a sorted list that is searched
+    with bisect. Category names are kept in a second sorted list and
+    expand to the articles of the matching category.
+
+    Signals keep the index current for writes made by this process. Writes
+    made elsewhere (other workers, ``run_scheduler``) are caught by
+    comparing ``data_version()`` with the one read at build time, at most
+    every ``BLOG_SUGGEST_REFRESH_INTERVAL`` seconds, and rebuilding when it
+    moved; local writes re-read the version once they commit, so they don't
+    count. Category renames made elsewhere are not detected this way.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._built = False
+        self._title_keys = []        # sorted (key, article_id)
+        self._category_keys = []     # sorted (key, category_id)
+        self._titles = {}            # article_id -> title
+        self._article_keys = {}      # article_id -> [keys]
+        self._article_category = {}  # article_id -> category_id
+        self._category_articles = {}  # category_id -> sorted [article_id]
+        self._category_names = {}    # category_id -> key
+        self._version = None
+        self._checked_at = 0.0
+
+    @staticmethod
+    def title_keys(title):
+        words = normalize(title).split()
+        return [' '.join(words[i:]) for i in range(len(words))]
+
+    @staticmethod
+    def data_version():
+        """
+        Article count and last update: moves with every article write or
+        delete, whichever process made it
+        """
+        version = Article.objects.aggregate(count=Count('id'), updated_at=Max('updated_at'))
+        return version['count'], version['updated_at']
+
+    def build(self):
+        # Read first, so a write racing the build triggers another one
+        version = self.data_version()
+        title_keys = []
+        titles = {}
+        article_keys = {}
+        article_category = {}
+        category_articles = {}
+        articles = Article.objects.filter(status='published').values_list('id', 'title', 'category_id')
+        for article_id, title, category_id in articles.iterator():
+            keys = self.title_keys(title)
+            title_keys.extend((key, article_id) for key in keys)
+            titles[article_id] = title
+            article_keys[article_id] = keys
+            article_category[article_id] = category_id
+            category_articles.setdefault(category_id, []).append(article_id)
+        for ids in category_articles.values():
+            ids.sort()
+        category_names = {
+            category_id: normalize(name)
+            for category_id, name in Category.objects.values_list('id', 'name')
+        }
+
+        with self._lock:
+            self._title_keys = sorted(title_keys)
+            self._category_keys = sorted((key, category_id) for category_id, key in category_names.items())
+            self._titles = titles
+            self._article_keys = article_keys
+            self._article_category = article_category
+            self._category_articles = category_articles
+            self._category_names = category_names
+            self._version = version
+            self._checked_at = time.monotonic()
+            self._built = True
+
+    def clear(self):
+        """
+        Drop the index; it is rebuilt from the database on the next query
+        """
+        with self._lock:
+            self._built = False
+
+    def _ensure_built(self):
+        if not self._built:
+            self.build()
+        elif time.monotonic() - self._checked_at >= getattr(settings, 'BLOG_SUGGEST_REFRESH_INTERVAL', 30):
+            self._checked_at = time.monotonic()
+            if self.data_version() != self._version:
+                self.build()
+
+    def _remove_article(self, article_id):
+        for key in self._article_keys.pop(article_id, []):
+            self._discard(self._title_keys, (key, article_id))
+        self._titles.pop(article_id, None)
+        category_id = self._article_category.pop(article_id, None)
+        if category_id is not None:
+            self._discard(self._category_articles.get(category_id, []), article_id)
+
+    @staticmethod
+    def _discard(sorted_list, item):
+        position = bisect_left(sorted_list, item)
+        if position < len(sorted_list) and sorted_list[position] == item:
+            del sorted_list[position]
+
+    def _refresh_version_on_commit(self):
+        """
+        Local writes are applied incrementally; once they commit, adopt the
+        version they produced so only other processes' writes cause a rebuild
+        """
+        def refresh():
+            if self._built:
+                self._version = self.data_version()
+        transaction.on_commit(refresh)
+
+    def update_article(self, article):
+        self.update_articles([article])
+
+    def update_articles(self, articles):
+        if not self._built:
+            return
+        with self._lock:
+            for article in articles:
+                self._remove_article(article.id)
+                if article.status != 'published':
+                    continue
+                keys = self.title_keys(article.title)
+                for key in keys:
+                    insort(self._title_keys, (key, article.id))
+                self._titles[article.id] = article.title
+                self._article_keys[article.id] = keys
+                self._article_category[article.id] = article.category_id
+                insort(self._category_articles.setdefault(article.category_id, []), article.id)
+        self._refresh_version_on_commit()
+
+    def remove_article(self, article_id):
+        self.remove_articles([article_id])
+
+    def remove_articles(self, article_ids):
+        if not self._built:
+            return
+        with self._lock:
+            for article_id in article_ids:
+                self._remove_article(article_id)
+        self._refresh_version_on_commit()
+
+    def update_category(self, category):
+        if not self._built:
+            return
+        with self._lock:
+            self._remove_category(category.id)
+            key = normalize(category.name)
+            self._category_names[category.id] = key
+            insort(self._category_keys, (key, category.id))
+
+    def remove_category(self, category_id):
+        if not self._built:
+            return
+        with self._lock:
+            self._remove_category(category_id)
+            self._category_articles.pop(category_id, None)
+
+    def _remove_category(self, category_id):
+        key = self._category_names.pop(category_id, None)
+        if key is not None:
+            self._discard(self._category_keys, (key, category_id))
+
+    @staticmethod
+    def _prefix_scan(keys, prefix):
+        position = bisect_left(keys, (prefix,))
+        while position < len(keys) and keys[position][0].startswith(prefix):
+            yield keys[position][1]
+            position += 1
+
+    def suggest(self, term, limit=5):
+        """
+        Return up to ``limit`` ``{'id', 'title'}`` dicts whose title or
+        category name starts with ``term`` at a word boundary
+        """
+        self._ensure_built()
+        prefix = normalize(term)
+        if not prefix:
+            return []
+
+        found = []
+        seen = set()
+        with self._lock:
+            for article_id in self._prefix_scan(self._title_keys, prefix):
+                if article_id not in seen:
+                    seen.add(article_id)
+                    found.append(article_id)
+                    if len(found) == limit:
+                        break
+            if len(found) < limit:
+                for category_id in self._prefix_scan(self._category_keys, prefix):
+                    for article_id in reversed(self._category_articles.get(category_id, [])):
+                        if article_id not in seen:
+                            seen.add(article_id)
+                            found.append(article_id)
+                            if len(found) == limit:
+                                break
+                    if len(found) == limit:
+                        break
+            return [{'id': article_id, 'title': self._titles[article_id]} for article_id in found]
+
+
+suggestion_index = SuggestionIndex()
@@ -0,0 +1,108 @@
+"""
+Synthetic blog corpus generator used by ``seed_articles --count`` and the
+benchmarks. Pure Python on purpose (no Django imports) so batches can be
+generated in worker processes.
+"""
+import datetime
+import random
+
+TOPICS = (
+    'react', 'django', 'python', 'javascript', 'design', 'architecture', 'database',
+    'cache', 'search', 'security', 'testing', 'cloud', 'kubernetes', 'docker',
+    'performance', 'accessibility', 'typescript', 'api', 'graphql', 'rust',
+    'machine learning', 'data', 'devops', 'mobile', 'css', 'animation', 'product',
+)
+TITLE_PATTERNS = (
+    'The Future of {0}',
+    'Mastering {0} and {1}',
+    'A Practical Guide to {0}',
+    '{0} Best Practices',
+    'Why {0} Matters for {1}',
+    'Scaling {0} in Production',
+    'Lessons Learned from {0}',
+    'Building {0} with {1}',
+    'Introduction to {0}',
+    '{0} vs {1}: A Comparison',
+)
+WORDS = (
+    'lorem ipsum dolor sit amet consectetur adipiscing elit sed eiusmod tempor '
+    'incididunt labore dolore magna aliqua enim minim veniam quis nostrud '
+    'exercitation ullamco laboris nisi aliquip commodo consequat system user '
+    'request response latency throughput index query model view component state '
+    'server client render deploy release feature team product design pattern'
+).split()
+FIRST_NAMES = ('Sarah', 'Michael', 'Emma', 'David', 'Olivia', 'James', 'Emily', 'Daniel', 'Sofia', 'Lucas')
+LAST_NAMES = ('Johnson', 'Chen', 'Wilson', 'Brown', 'Martinez', 'Parker', 'Garcia', 'Kim', 'Novak', 'Rossi')
+IMAGES = (
+    'https://images.unsplash.com/photo-1498050108023-c5249f4df085?w=800&auto=format&fit=crop',
+    'https://images.unsplash.com/photo-1633356122544-f134324a6cee?w=800&auto=format&fit=crop',
+    'https://images.unsplash.com/photo-1561070791-2526d30994b5?w=800&auto=format&fit=crop',
+    'https://images.unsplash.com/photo-1555066931-4365d14bab8c?w=800&auto=format&fit=crop',
+)
+START_DATE = datetime.date(2015, 1, 1)
+DATE_SPAN_DAYS = 365 * 10
+
+
+def sentence(rng, words):
+    text = ' '.join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def generate_users(count, tag):
+    """
+    (username, email, first_name, last_name) tuples
+    """
+    rng = random.Random(f'users-{tag}')
+    return [
+        (
+            f'seed_{tag}_{number}',
+            f'seed_{tag}_{number}@example.com',
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+        )
+        for number in range(count)
+    ]
+
+
+def generate_categories(count, tag):
+    """
+    (name, description) tuples
+    """
+    return [
+        (f'{TOPICS[number % len(TOPICS)].title()} {number // len(TOPICS) + 1} ({tag})',
+         f'Articles about {TOPICS[number % len(TOPICS)]}')
+        for number in range(count)
+    ]
+
+
+def generate_articles(start, count, tag, seed, user_count, category_count, content_words, published_ratio):
+    """
+    Rows for articles ``start .. start + count - 1`` as tuples of
+    (title, excerpt, content, author_index, category_index, date, read_time,
+    image, status). Deterministic for a given seed and start, so batches can
+    be generated independently by worker processes.
+    """
+    rng = random.Random(f'{seed}-{start}')
+    rows = []
+    for number in range(start, start + count):
+        category_index = rng.randrange(category_count)
+        topic = TOPICS[category_index % len(TOPICS)]
+        title = rng.choice(TITLE_PATTERNS).format(topic.title(), rng.choice(TOPICS).title())
+        words = max(content_words + rng.randint(-content_words // 3, content_words // 3), 1)
+        content = ' '.join(sentence(rng, 12) for _ in range(max(words // 12, 1)))
+        rows.append((
+            f'{title} #{tag}-{number}',
+            sentence(rng, 18),
+            content,
+            rng.randrange(user_count),
+            category_index,
+            START_DATE + datetime.timedelta(days=rng.randrange(DATE_SPAN_DAYS)),
+            max(words // 200, 1),
+            rng.choice(IMAGES),
+            'published' if rng.random() < published_ratio else 'draft',
+        ))
+    return rows
+
+
+def generate_articles_batch(arguments):
+    return generate_articles(*arguments)
@@ -1,3 +1,1368 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import decimal
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.functional import lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from accounts.custom.authentication import user_cache
+from accounts.custom.serializers import CustomTokenObtainPairSerializer
+from core.parsers import FastJSONParser
+from core.profiling import RequestProfile, fingerprint
+from core.renderers import FastJSONRenderer
+
+from . import bulk, counters
+from .models import Category, Article, ArticleTombstone, Counter, RelatedArticle
+from .related import rebuild_related_articles
+from .cache import ARTICLES, response_cache
+from .changes import changes_since, encode_token
+from .events import broadcaster
+from .feed import feed_snapshots
+from .scheduler import Scheduler
+from .search import get_search_backend
+from .serializers import ArticleListSerializer, ArticleListValuesSerializer
+from .suggest import suggestion_index
+
+
+def create_article(author, category, **kwargs):
+    data = {
+        'title': 'Untitled',
+        'excerpt': 'excerpt',
+        'content': 'content',
+        'date': datetime.date(2024, 3, 15),
+        'read_time': 5,
+        'image': 'https://example.com/image.jpg',
+        'status': 'published',
+    }
+    data.update(kwargs)
+    return Article.objects.create(author=author, category=category, **data)
+
+
+class BlogTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('author', first_name='Sarah', last_name='Johnson')
+        cls.category = Category.objects.create(name='Programming', description='Programming articles')
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+
+
+class SearchTests(BlogTestCase):
+
+    def test_search_ranks_title_matches_first(self):
+        body_match = create_article(self.author, self.category, title='Body', content='react hooks in depth')
+        title_match = create_article(self.author, self.category, title='Mastering React Hooks')
+
+        response = self.client.get('/api/blog/articles/search/', {'q': 'react'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([a['id'] for a in response.data['results']], [title_match.id, body_match.id])
+
+    def test_search_matches_word_prefixes(self):
+        article = create_article(self.author, self.category, title='Mastering React Hooks')
+
+        response = self.client.get('/api/blog/articles/search/', {'q': 'mast hoo'})
+
+        self.assertEqual([a['id'] for a in response.data['results']], [article.id])
+
+    def test_index_follows_save_and_delete(self):
+        article = create_article(self.author, self.category, title='Scalable Django', status='draft')
+        self.assertEqual(get_search_backend().search('scalable'), [])
+
+        article.status = 'published'
+        article.save()
+        self.assertEqual(get_search_backend().search('scalable'), [article.id])
+
+        article.delete()
+        self.assertEqual(get_search_backend().search('scalable'), [])
+
+    def test_search_without_results_returns_404(self):
+        response = self.client.get('/api/blog/articles/search/', {'q': 'nothing'})
+
+        self.assertEqual(response.status_code, 404)
+
+
+class PaginationTests(BlogTestCase):
+
+    def collect_pages(self, url, params):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), params['page_size'])
+            ids.extend(a['id'] for a in response.data['results'])
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_list_walks_all_pages_newest_first(self):
+        articles = [
+            create_article(self.author, self.category, title=f'Article {i}', date=datetime.date(2024, 3, 1 + i // 2))
+            for i in range(7)
+        ]
+        create_article(self.author, self.category, title='Draft', status='draft')
+
+        ids = self.collect_pages('/api/blog/articles/', {'page_size': 3})
+
+        expected = sorted(articles, key=lambda a: (a.date, a.id), reverse=True)
+        self.assertEqual(ids, [a.id for a in expected])
+
+    def test_list_filters_by_category(self):
+        other = Category.objects.create(name='Design', description='Design articles')
+        article = create_article(self.author, other, title='Design systems')
+        create_article(self.author, self.category, title='Clean Code')
+
+        response = self.client.get('/api/blog/articles/', {'category': other.id})
+
+        self.assertEqual([a['id'] for a in response.data['results']], [article.id])
+
+    def test_search_pages_keep_relevance_order(self):
+        for i in range(5):
+            create_article(self.author, self.category, title=f'Django tip {i}')
+
+        ids = self.collect_pages('/api/blog/articles/search/', {'q': 'django', 'page_size': 2})
+
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(len(set(ids)), 5)
+
+    def test_related_excludes_article_and_drafts(self):
+        article = create_article(self.author, self.category, title='Main')
+        related = create_article(self.author, self.category, title='Sibling')
+        create_article(self.author, self.category, title='Draft sibling', status='draft')
+
+        response = self.client.get(f'/api/blog/articles/{article.id}/related/')
+
+        self.assertEqual([a['id'] for a in response.data['results']], [related.id])
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get('/api/blog/articles/', {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, 404)
+
+
+class SuggestTests(BlogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        suggestion_index.clear()
+
+    def test_suggest_matches_title_word_prefixes(self):
+        article = create_article(self.author, self.category, title='Mastering React Hooks')
+        create_article(self.author, self.category, title='Hidden Draft', status='draft')
+
+        response = self.client.get('/api/blog/articles/suggest/', {'q': 'react ho'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [{'id': article.id, 'title': 'Mastering React Hooks'}])
+
+    def test_suggest_matches_category_names(self):
+        article = create_article(self.author, self.category, title='Clean Code')
+
+        response = self.client.get('/api/blog/articles/suggest/', {'q': 'prog'})
+
+        self.assertEqual([a['id'] for a in response.data], [article.id])
+
+    def test_suggest_caps_results(self):
+        for i in range(12):
+            create_article(self.author, self.category, title=f'Django tip {i}')
+
+        self.assertEqual(len(self.client.get('/api/blog/articles/suggest/', {'q': 'django'}).data), 5)
+        self.assertEqual(len(self.client.get('/api/blog/articles/suggest/', {'q': 'django', 'limit': 50}).data), 10)
+
+    def test_index_follows_article_and_category_signals(self):
+        article = create_article(self.author, self.category, title='Scalable Django')
+        self.assertEqual(len(suggestion_index.suggest('scal')), 1)
+
+        article.title = 'Resilient Django'
+        article.save()
+        self.assertEqual(suggestion_index.suggest('scal'), [])
+        self.assertEqual(suggestion_index.suggest('resil'), [{'id': article.id, 'title': 'Resilient Django'}])
+
+        self.category.name = 'Backend'
+        self.category.save()
+        self.assertEqual(len(suggestion_index.suggest('backe')), 1)
+
+        article.delete()
+        self.assertEqual(suggestion_index.suggest('resil'), [])
+
+    def test_index_picks_up_writes_from_other_processes(self):
+        create_article(self.author, self.category, title='Scalable Django')
+        draft = create_article(self.author, self.category, title='Scheduled Django', status='draft')
+        self.assertEqual(len(suggestion_index.suggest('django')), 1)
+
+        # A queryset update sends no signals, like a write made by run_scheduler
+        Article.objects.filter(id=draft.id).update(status='published', updated_at=timezone.now())
+        with self.assertNumQueries(0):
+            self.assertEqual(len(suggestion_index.suggest('django')), 1)
+        with override_settings(BLOG_SUGGEST_REFRESH_INTERVAL=0):
+            self.assertEqual(len(suggestion_index.suggest('django')), 2)
+            with self.assertNumQueries(1):
+                self.assertEqual(len(suggestion_index.suggest('django')), 2)
+
+    @override_settings(BLOG_SUGGEST_REFRESH_INTERVAL=0)
+    def test_local_writes_do_not_trigger_a_rebuild(self):
+        article = create_article(self.author, self.category, title='Scalable Django')
+        self.assertEqual(len(suggestion_index.suggest('django')), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            article.title = 'Resilient Django'
+            article.save()
+            bulk.set_article_status([article.id], 'draft')
+            bulk.set_article_status([article.id], 'published')
+        # Only the version check: the index already has these changes
+        with self.assertNumQueries(1):
+            self.assertEqual(suggestion_index.suggest('resil'), [{'id': article.id, 'title': 'Resilient Django'}])
+
+
+class QueryBudgetTests(BlogTestCase):
+    """
+    Public read endpoints must cost a fixed number of queries, whatever the
+    page size. A failure here usually means a new serializer field without
+    a matching select_related/only() on the queryset.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.authors = [User.objects.create_user(f'author{i}') for i in range(3)]
+        cls.articles = [
+            create_article(cls.authors[i % 3], cls.category, title=f'Django article {i}')
+            for i in range(20)
+        ]
+
+    def setUp(self):
+        super().setUp()
+        suggestion_index.build()
+
+    def assert_budget(self, queries, url, params=None):
+        for page_size in (1, 20):
+            with self.assertNumQueries(queries):
+                response = self.client.get(url, {'page_size': page_size, **(params or {})})
+            self.assertEqual(response.status_code, 200)
+
+    def test_list_budget(self):
+        # count/max(updated_at) and the content version for the validators +
+        # the page itself
+        self.assert_budget(3, '/api/blog/articles/')
+
+    def test_category_filter_budget(self):
+        self.assert_budget(3, '/api/blog/articles/', {'category': self.category.id})
+
+    def test_search_budget(self):
+        # ranked ids from the index + one projected fetch of the page
+        self.assert_budget(2, '/api/blog/articles/search/', {'q': 'django'})
+
+    def test_retrieve_budget(self):
+        self.assert_budget(3, f'/api/blog/articles/{self.articles[0].id}/')
+
+    def test_related_budget(self):
+        self.assert_budget(2, f'/api/blog/articles/{self.articles[0].id}/related/')
+
+    def test_suggest_budget(self):
+        self.assert_budget(0, '/api/blog/articles/suggest/', {'q': 'django'})
+
+    def test_categories_budget(self):
+        self.assert_budget(1, '/api/blog/categories/')
+
+
+class ResponseCacheTests(BlogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_user('admin', is_staff=True)
+        cls.article = create_article(cls.author, cls.category, title='Cached article')
+
+    def test_repeated_reads_are_served_from_cache(self):
+        first = self.client.get('/api/blog/articles/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/blog/articles/')
+
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(second['Content-Type'], 'application/json')
+        self.assertEqual(response_cache.stats()['articles'], {'hits': 1, 'misses': 1})
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get('/api/blog/articles/', {'page_size': 1})
+        with self.assertNumQueries(3):
+            self.client.get('/api/blog/articles/', {'page_size': 2})
+
+    def test_article_save_invalidates_article_responses(self):
+        self.client.get(f'/api/blog/articles/{self.article.id}/')
+        self.client.get('/api/blog/categories/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.title = 'Renamed article'
+            self.article.save()
+
+        response = self.client.get(f'/api/blog/articles/{self.article.id}/')
+        self.assertEqual(response.json()['article']['title'], 'Renamed article')
+        with self.assertNumQueries(0):
+            self.client.get('/api/blog/categories/')
+
+    def test_category_save_invalidates_articles_and_categories(self):
+        self.client.get('/api/blog/articles/')
+        self.client.get('/api/blog/categories/')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Software'
+            self.category.save()
+
+        self.assertEqual(self.client.get('/api/blog/articles/').json()['results'][0]['category']['name'], 'Software')
+        self.assertEqual(self.client.get('/api/blog/categories/').json()[0]['name'], 'Software')
+
+    def test_only_author_name_changes_invalidate_article_responses(self):
+        self.client.get('/api/blog/articles/')
+        generation = response_cache.generation(ARTICLES)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.create_user('newcomer')
+            self.author.email = 'sarah@example.com'
+            self.author.save(update_fields=['email'])
+            self.author.last_login = timezone.now()
+            self.author.save(update_fields=['last_login'])
+        self.assertEqual(response_cache.generation(ARTICLES), generation)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.first_name = 'Sara'
+            self.author.save(update_fields=['first_name'])
+        self.assertNotEqual(response_cache.generation(ARTICLES), generation)
+        self.assertEqual(self.client.get('/api/blog/articles/').json()['results'][0]['author'], 'Sara Johnson')
+
+    def test_admin_publish_toggle_invalidates_list(self):
+        self.assertEqual(len(self.client.get('/api/blog/articles/').json()['results']), 1)
+
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/admin/articles/{self.article.id}/publish/')
+        self.client.force_authenticate(None)
+
+        self.assertEqual(self.client.get('/api/blog/articles/').json()['results'], [])
+
+    def test_errors_are_not_cached(self):
+        self.client.get('/api/blog/articles/999/')
+        with self.assertNumQueries(1):
+            self.client.get('/api/blog/articles/999/')
+
+
+class ConditionalGetTests(BlogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.article = create_article(cls.author, cls.category, title='Validated article')
+
+    def test_list_revalidates_with_etag_without_serializing(self):
+        response = self.client.get('/api/blog/articles/')
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+
+        with self.settings(BLOG_CACHE_ENABLED=False), self.assertNumQueries(2):
+            not_modified = self.client.get('/api/blog/articles/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+
+    def test_list_etag_changes_when_an_older_article_leaves(self):
+        older = create_article(self.author, self.category, title='Older article')
+        Article.objects.filter(id=older.id).update(updated_at=self.article.updated_at - datetime.timedelta(days=1))
+        etag = self.client.get('/api/blog/articles/')['ETag']
+
+        # No signal, as from another process: max(updated_at) stays put
+        Article.objects.filter(id=older.id).update(status='draft')
+        with self.settings(BLOG_CACHE_ENABLED=False):
+            response = self.client.get('/api/blog/articles/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etags_follow_the_database_not_the_process(self):
+        url = f'/api/blog/articles/{self.article.id}/'
+        etag = self.client.get(url)['ETag']
+
+        # Another process's cache generations don't move, ours may: same ETag
+        response_cache.invalidate(ARTICLES)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Renamed'
+            self.category.save()
+        with self.settings(BLOG_CACHE_ENABLED=False):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['article']['category']['name'], 'Renamed')
+
+    def test_cached_response_revalidates_without_queries(self):
+        response = self.client.get(f'/api/blog/articles/{self.article.id}/')
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get(
+                f'/api/blog/articles/{self.article.id}/', HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_if_modified_since(self):
+        response = self.client.get(f'/api/blog/articles/{self.article.id}/')
+
+        with self.settings(BLOG_CACHE_ENABLED=False):
+            not_modified = self.client.get(
+                f'/api/blog/articles/{self.article.id}/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+            )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_edit_changes_etag(self):
+        etag = self.client.get(f'/api/blog/articles/{self.article.id}/')['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.excerpt = 'Updated excerpt'
+            self.article.save()
+
+        response = self.client.get(f'/api/blog/articles/{self.article.id}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class RelatedArticlesTests(BlogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.design = Category.objects.create(name='Design', description='Design articles')
+
+    def create(self, category, title, status='published'):
+        return create_article(self.author, category, title=title, excerpt=title, status=status)
+
+    def related_ids(self, article):
+        response = self.client.get(f'/api/blog/articles/{article.id}/')
+        return [a['id'] for a in response.data['relatedArticles']]
+
+    def test_scores_term_overlap_and_category(self):
+        article = self.create(self.category, 'Django REST framework caching')
+        close = self.create(self.category, 'Caching Django REST responses')
+        same_category = self.create(self.category, 'Python packaging')
+        cross_category = self.create(self.design, 'Caching design tokens with Django')
+        self.create(self.design, 'Colour theory')
+
+        self.assertEqual(self.related_ids(article), [close.id, same_category.id, cross_category.id])
+
+    @override_settings(BLOG_RELATED_COUNT=4)
+    def test_details_show_the_configured_count(self):
+        article = self.create(self.category, 'Django caching')
+        for number in range(5):
+            self.create(self.category, f'Django caching part {number}')
+
+        self.assertEqual(len(self.related_ids(article)), 4)
+        response = self.client.get(f'/api/blog/async/articles/{article.id}/')
+        self.assertEqual(len(response.json()['relatedArticles']), 4)
+
+    def test_drafts_are_never_related(self):
+        article = self.create(self.category, 'Django tips')
+        self.create(self.category, 'More Django tips', status='draft')
+
+        self.assertEqual(self.related_ids(article), [])
+
+    def test_table_follows_saves_and_deletes(self):
+        article = self.create(self.category, 'Django signals')
+        other = self.create(self.design, 'Colour theory')
+        self.assertEqual(self.related_ids(article), [])
+
+        other.title = 'Django signals in depth'
+        other.save()
+        cache.clear()
+        self.assertEqual(self.related_ids(article), [other.id])
+
+        other.delete()
+        self.assertFalse(RelatedArticle.objects.filter(article=article).exists())
+
+    def test_rebuild_matches_incremental_updates(self):
+        for title in ('Django caching', 'Django search', 'React hooks', 'React state', 'Caching search results'):
+            self.create(self.category, title)
+        incremental = set(RelatedArticle.objects.values_list('article_id', 'related_id'))
+
+        rebuild_related_articles()
+
+        self.assertEqual(set(RelatedArticle.objects.values_list('article_id', 'related_id')), incremental)
+
+    def test_rebuild_moves_the_article_etags_on(self):
+        article = self.create(self.category, 'Django caching')
+        url = f'/api/blog/articles/{article.id}/'
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rebuild_related_articles()
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class CounterTests(BlogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_user('admin', is_staff=True)
+
+    def stats(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get('/api/admin/stats/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_stats_follow_creates_updates_and_deletes(self):
+        design = Category.objects.create(name='Design', description='Design articles')
+        article = create_article(self.author, self.category, title='Counted', status='draft')
+        create_article(self.author, design, title='Also counted')
+
+        article.status = 'published'
+        article.category = design
+        article.save()
+        self.author.is_staff = True
+        self.author.save()
+
+        stats = self.stats()
+        self.assertEqual(stats['normalUsers'], 0)
+        self.assertEqual(stats['adminUsers'], 2)
+        self.assertEqual(stats['articles'], 2)
+        self.assertEqual(stats['publishedArticles'], 2)
+        self.assertEqual(stats['draftArticles'], 0)
+        self.assertEqual(stats['categories'], 2)
+        self.assertEqual(
+            {(entry['name'], entry['articles']) for entry in stats['articlesPerCategory']},
+            {('Programming', 0), ('Design', 2)}
+        )
+
+        design.delete()
+        stats = self.stats()
+        self.assertEqual((stats['articles'], stats['publishedArticles'], stats['categories']), (0, 0, 1))
+        self.assertEqual(counters.reconcile(), {})
+
+    def test_stats_are_one_query(self):
+        create_article(self.author, self.category, title='Counted')
+        self.client.force_authenticate(self.admin)
+
+        with self.assertNumQueries(1):
+            self.client.get('/api/admin/stats/')
+
+    def test_reconcile_corrects_drift(self):
+        create_article(self.author, self.category, title='Counted')
+        Counter.objects.filter(key=counters.ARTICLES).update(value=42)
+
+        self.assertEqual(counters.reconcile(), {counters.ARTICLES: (42, 1)})
+        self.assertEqual(self.stats()['articles'], 1)
+
+
+class AsyncViewTests(BlogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.articles = [
+            create_article(self.author, self.category, title=f'React Article {number}',
+                           date=datetime.date(2024, 1, number + 1))
+            for number in range(3)
+        ]
+
+    def test_list_matches_sync_view(self):
+        with self.settings(BLOG_CACHE_ENABLED=False):
+            sync = self.client.get('/api/blog/articles/', {'page_size': 2})
+            response = self.client.get('/api/blog/async/articles/', {'page_size': 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], sync.json()['results'])
+        self.assertTrue(response.has_header('ETag'))
+
+        following = self.client.get(response.json()['next'].replace('http://testserver', ''))
+        self.assertEqual([a['id'] for a in following.json()['results']], [self.articles[0].id])
+
+    def test_detail_and_search_match_sync_views(self):
+        article = self.articles[1]
+        with self.settings(BLOG_CACHE_ENABLED=False):
+            for sync_path, async_path, params in (
+                (f'/api/blog/articles/{article.id}/', f'/api/blog/async/articles/{article.id}/', {}),
+                ('/api/blog/articles/search/', '/api/blog/async/articles/search/', {'q': 'react'}),
+            ):
+                sync = self.client.get(sync_path, params)
+                response = self.client.get(async_path, params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), sync.json())
+
+    def test_errors_match_sync_views(self):
+        self.assertEqual(self.client.get('/api/blog/async/articles/999999/').status_code, 404)
+        self.assertEqual(self.client.get('/api/blog/async/articles/', {'category': 'x'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/blog/async/articles/', {'cursor': '!!'}).status_code, 404)
+        self.assertEqual(self.client.get('/api/blog/async/articles/search/').status_code, 400)
+        self.assertEqual(self.client.post('/api/blog/async/articles/').status_code, 405)
+
+    def test_responses_are_cached(self):
+        self.client.get('/api/blog/async/articles/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/blog/async/articles/')
+        self.assertEqual(len(response.json()['results']), 3)
+
+
+class FeedSnapshotTests(BlogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.other = Category.objects.create(name='Design', description='Design articles')
+        for number in range(5):
+            create_article(self.author, self.category if number % 2 else self.other,
+                           title=f'Feed Article {number}', date=datetime.date(2024, 1, number + 1))
+        settings = self.settings(BLOG_FEED_SNAPSHOTS=True, BLOG_PAGE_SIZE=2, BLOG_CACHE_ENABLED=False)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def get_pages(self, params):
+        pages, path = [], '/api/blog/articles/'
+        while path:
+            response = self.client.get(path, params)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.json())
+            path, params = pages[-1]['next'], {}
+        return pages
+
+    def test_snapshot_pages_match_live_pages_without_queries(self):
+        live = self.get_pages({})
+        live_category = self.get_pages({'category': self.other.id})
+        feed_snapshots.rebuild_all()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_pages({}), live)
+            self.assertEqual(self.get_pages({'category': self.other.id}), live_category)
+
+    def test_edits_rerender_affected_feeds(self):
+        feed_snapshots.rebuild_all()
+        article = Article.objects.get(title='Feed Article 4')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            article.title = 'Renamed Article'
+            article.category = self.category
+            article.save()
+
+        with self.assertNumQueries(0):
+            first = self.client.get('/api/blog/articles/', {'category': self.category.id}).json()
+            other = self.client.get('/api/blog/articles/', {'category': self.other.id}).json()
+        self.assertEqual(first['results'][0]['title'], 'Renamed Article')
+        self.assertNotIn(article.id, [a['id'] for a in other['results']])
+
+    def test_only_author_renames_rerender_feeds(self):
+        reader = User.objects.create_user('reader')
+        with mock.patch.object(feed_snapshots, 'rebuild') as rebuild, self.captureOnCommitCallbacks(execute=True):
+            self.author.email = 'sarah@example.com'
+            self.author.save(update_fields=['email'])
+            reader.first_name = 'Reader'
+            reader.save()
+        rebuild.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.first_name = 'Sara'
+            self.author.save(update_fields=['first_name'])
+        with self.assertNumQueries(0):
+            results = self.client.get('/api/blog/articles/').json()['results']
+        self.assertEqual(results[0]['author'], 'Sara Johnson')
+
+    def test_other_requests_fall_back_to_the_database(self):
+        feed_snapshots.rebuild_all()
+        response = self.client.get('/api/blog/articles/', {'page_size': 3})
+        self.assertEqual(len(response.json()['results']), 3)
+        self.assertEqual(self.client.get('/api/blog/articles/', {'category': 'x'}).status_code, 400)
+
+
+class ValuesSerializerTests(BlogTestCase):
+
+    def test_matches_model_serializer(self):
+        username_only = User.objects.create_user('nobody', first_name='Only')
+        create_article(self.author, self.category, title='Full Name')
+        create_article(username_only, self.category, title='Username', date=datetime.date(2024, 1, 2))
+        queryset = Article.objects.published().order_by('id')
+
+        self.assertEqual(
+            ArticleListValuesSerializer(queryset.listing_values(), many=True).data,
+            ArticleListSerializer(queryset.for_listing(), many=True).data,
+        )
+
+
+class FastJSONTests(BlogTestCase):
+
+    def test_renders_like_drf(self):
+        data = {
+            'aware': datetime.datetime(2024, 3, 15, 10, 30, 5, 123456, tzinfo=datetime.timezone.utc),
+            'naive': datetime.datetime(2024, 3, 15, 10, 30),
+            'date': datetime.date(2024, 3, 15),
+            'time': datetime.time(10, 30),
+            'decimal': decimal.Decimal('1.10'),
+            'uuid': uuid.UUID(int=1),
+            'lazy': lazy(lambda: 'lazy', str)(),
+            'separators': 'line\u2028paragraph\u2029 caf\u00e9',
+            1: [1.5, None, True, (2, 3)],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            FastJSONRenderer().render(data, 'application/json; indent=4'),
+            JSONRenderer().render(data, 'application/json; indent=4'),
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+    def test_parses_like_drf(self):
+        body = '{"title": "caf\u00e9", "tags": [1, 2.5, null]}'.encode()
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), {'title': 'caf\u00e9', 'tags': [1, 2.5, None]})
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"value": NaN}'))
+
+
+class AdminArticleListTests(BlogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_user('admin', is_staff=True)
+        cls.design = Category.objects.create(name='Design', description='Design articles')
+        for number in range(5):
+            create_article(cls.admin if number % 2 else cls.author, cls.design if number < 2 else cls.category,
+                           title=f'Admin Article {number}', status='draft' if number == 4 else 'published')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.admin)
+
+    def test_rows_are_paginated_without_content(self):
+        with self.assertNumQueries(2):  # count + page
+            response = self.client.get('/api/admin/articles/', {'page_size': 2})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual([a['title'] for a in response.data['results']], ['Admin Article 4', 'Admin Article 3'])
+        self.assertNotIn('content', response.data['results'][0])
+        self.assertEqual(response.data['results'][0]['category_data']['name'], 'Programming')
+        self.assertEqual(response.data['results'][0]['author_name'], 'Sarah Johnson')
+
+        detail = self.client.get(f"/api/admin/articles/{response.data['results'][0]['id']}/")
+        self.assertEqual(detail.data['content'], 'content')
+
+    def test_filters_and_ordering(self):
+        def titles(**params):
+            response = self.client.get('/api/admin/articles/', params)
+            self.assertEqual(response.status_code, 200)
+            return [a['title'] for a in response.data['results']]
+
+        self.assertEqual(titles(status='draft'), ['Admin Article 4'])
+        self.assertEqual(titles(category=self.design.id, ordering='title'), ['Admin Article 0', 'Admin Article 1'])
+        self.assertEqual(titles(author=self.admin.id, ordering='-title'), ['Admin Article 3', 'Admin Article 1'])
+        self.assertEqual(titles(search='article 2'), ['Admin Article 2'])
+        self.assertEqual(self.client.get('/api/admin/articles/', {'category': 'x'}).status_code, 400)
+        for value in ('99999999999999999999999', '\u00b2'):
+            self.assertEqual(self.client.get('/api/admin/articles/', {'author': value}).status_code, 400, value)
+        self.assertEqual(self.client.get('/api/admin/articles/', {'status': 'gone'}).status_code, 400)
+
+
+class AdminUserListTests(BlogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_user('admin', email='admin@example.com', is_staff=True)
+        cls.inactive = User.objects.create_user('zoe', email='zoe@example.com', is_active=False)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.admin)
+
+    def usernames(self, **params):
+        response = self.client.get('/api/admin/users/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data['count'], [user['username'] for user in response.data['results']]
+
+    def test_rows_are_paginated_without_password(self):
+        with self.assertNumQueries(2):  # counters + page
+            response = self.client.get('/api/admin/users/', {'page_size': 2})
+
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual([user['username'] for user in response.data['results']], ['zoe', 'admin'])
+        self.assertNotIn('password', response.data['results'][0])
+        self.assertNotIn('password', self.client.get(f'/api/admin/users/{self.admin.id}/').data)
+
+    def test_filters_and_search(self):
+        self.assertEqual(self.usernames(is_staff='true'), (1, ['admin']))
+        self.assertEqual(self.usernames(is_staff='false'), (2, ['zoe', 'author']))
+        self.assertEqual(self.usernames(is_active='false'), (1, ['zoe']))
+        self.assertEqual(self.usernames(search='ZO'), (1, ['zoe']))
+        self.assertEqual(self.usernames(search='admin@'), (1, ['admin']))
+        self.assertEqual(self.client.get('/api/admin/users/', {'is_active': 'maybe'}).status_code, 400)
+
+    def test_filtered_counts_are_cached_until_a_user_changes(self):
+        self.usernames(is_active='true')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.usernames(is_active='true'), (2, ['admin', 'author']))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.inactive.is_active = True
+            self.inactive.save()
+        self.assertEqual(self.usernames(is_active='true')[0], 3)
+
+
+class BulkOperationTests(BlogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_user('admin', is_staff=True)
+        cls.design = Category.objects.create(name='Design', description='Design articles')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.admin)
+        self.drafts = [
+            create_article(self.author, self.category, title=f'Bulk Draft {number}', excerpt=f'bulk {number}',
+                           status='draft')
+            for number in range(3)
+        ]
+        self.published = create_article(self.author, self.category, title='Bulk Published', excerpt='bulk')
+
+    def bulk(self, path, **data):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(path, data, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return {item['id']: item['result'] for item in response.data['results']}
+
+    def test_publish_reports_per_item_and_keeps_derived_data_in_sync(self):
+        self.client.get('/api/blog/articles/')  # cached before the change
+        ids = [article.id for article in self.drafts] + [self.published.id, 999999]
+
+        results = self.bulk('/api/admin/articles/bulk/', action='publish', ids=ids)
+
+        self.assertEqual(results, {
+            **{article.id: 'updated' for article in self.drafts},
+            self.published.id: 'unchanged', 999999: 'not_found',
+        })
+        self.assertEqual(counters.reconcile(), {})
+        self.assertEqual(len(self.client.get('/api/blog/articles/').data['results']), 4)
+        self.assertIn(self.drafts[0].id, get_search_backend().search('draft'))
+        self.assertTrue(suggestion_index.suggest('bulk draft'))
+        self.assertTrue(RelatedArticle.objects.filter(article=self.drafts[0]).exists())
+        self.assertGreater(Article.objects.get(id=self.drafts[0].id).updated_at, self.drafts[0].updated_at)
+
+    def test_move_and_delete(self):
+        results = self.bulk('/api/admin/articles/bulk/', action='move',
+                            ids=[self.published.id, self.drafts[0].id], category=self.design.id)
+        self.assertEqual(set(results.values()), {'updated'})
+        self.assertEqual(Article.objects.filter(category=self.design).count(), 2)
+
+        results = self.bulk('/api/admin/articles/bulk/', action='delete', ids=[self.published.id, self.drafts[1].id])
+        self.assertEqual(set(results.values()), {'deleted'})
+        self.assertEqual(counters.reconcile(), {})
+        self.assertEqual(get_search_backend().search('bulk'), [])
+        self.assertFalse(Article.objects.filter(id=self.published.id).exists())
+
+        response = self.client.post('/api/admin/articles/bulk/', {'action': 'move', 'ids': [1]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_deactivate_users_in_constant_queries(self):
+        users = [User.objects.create_user(f'bulk{number}') for number in range(6)]
+
+        def deactivate(batch):
+            with CaptureQueriesContext(connection) as queries:
+                results = self.bulk('/api/admin/users/bulk/', action='deactivate',
+                                    ids=[user.id for user in batch] + [self.admin.id])
+            return results, len(queries)
+
+        small, small_queries = deactivate(users[:2])
+        large, large_queries = deactivate(users[2:])
+        self.assertEqual(small_queries, large_queries)
+        self.assertEqual(large[self.admin.id], 'skipped')
+        self.assertEqual(User.objects.filter(is_active=False).count(), 6)
+
+
+class FakeClock:
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += datetime.timedelta(seconds=seconds)
+
+
+class SchedulerTests(BlogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeClock(timezone.now())
+        self.scheduled = [
+            create_article(self.author, self.category, title=f'Scheduled {number}', status='draft',
+                           publish_at=self.clock.now + datetime.timedelta(minutes=minutes))
+            for number, minutes in enumerate((0, 1, 1, 1, 10))
+        ]
+        self.unscheduled = create_article(self.author, self.category, title='Unscheduled', status='draft')
+
+    def published_titles(self):
+        return set(Article.objects.published().values_list('title', flat=True))
+
+    def test_publishes_due_drafts_in_batches_as_the_clock_advances(self):
+        self.client.get('/api/blog/articles/')  # cached before the scheduler runs
+        scheduler = Scheduler(tick=60, batch_size=2, clock=self.clock, sleep=self.clock.sleep)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            scheduler.run(max_ticks=1)
+        self.assertEqual(self.published_titles(), {'Scheduled 0'})
+        self.assertEqual(len(self.client.get('/api/blog/articles/').data['results']), 1)
+
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            scheduler.run(max_ticks=2)
+        self.assertEqual(self.published_titles(), {'Scheduled 0', 'Scheduled 1', 'Scheduled 2', 'Scheduled 3'})
+        batches = [query for query in queries if query['sql'].startswith('UPDATE "blog_article" SET "status"')]
+        self.assertEqual(len(batches), 2)
+        self.assertFalse(Article.objects.filter(status='published', publish_at__isnull=False).exists())
+
+        self.clock.sleep(600)
+        scheduler.run_once()
+        self.assertEqual(Article.objects.filter(status='draft').get(), self.unscheduled)
+        self.assertEqual(counters.reconcile(), {})
+
+    def test_admin_sets_publish_at(self):
+        admin = User.objects.create_user('admin', is_staff=True)
+        self.client.force_authenticate(admin)
+        response = self.client.patch(f'/api/admin/articles/{self.unscheduled.id}/',
+                                     {'publish_at': '2030-01-01T09:00:00Z'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        response = self.client.get('/api/admin/articles/?ordering=publish_at')
+        self.assertEqual(response.data['results'][-1]['publish_at'], '2030-01-01T09:00:00Z')
+
+    def test_admin_unschedules_a_draft(self):
+        admin = User.objects.create_user('admin', is_staff=True)
+        self.client.force_authenticate(admin)
+        draft = self.scheduled[0]
+        response = self.client.patch(f'/api/admin/articles/{draft.id}/', {'publish_at': None}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertIsNone(response.data['publish_at'])
+
+        Scheduler(tick=60, batch_size=10, clock=self.clock, sleep=self.clock.sleep).run_once()
+        draft.refresh_from_db()
+        self.assertEqual(draft.status, 'draft')
+        self.assertIsNone(draft.publish_at)
+
+
+class FeaturedArticlesTests(BlogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.articles = [
+            create_article(self.author, self.category, title=f'Home {day}', date=datetime.date(2024, 3, day))
+            for day in range(1, 6)
+        ]
+        create_article(self.author, self.category, title='Featured draft', status='draft', featured=True)
+
+    def titles(self):
+        response = self.client.get('/api/blog/articles/featured/')
+        self.assertEqual(response.status_code, 200)
+        return [article['title'] for article in response.json()['results']]
+
+    def test_featured_first_then_latest_in_one_indexed_query(self):
+        Article.objects.filter(id=self.articles[0].id).update(featured=True)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.titles(), ['Home 1', 'Home 5', 'Home 4'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles(), ['Home 1', 'Home 5', 'Home 4'])
+
+        plan = str(Article.objects.published().order_by('-featured', '-date', '-id')[:3].explain())
+        self.assertIn('article_featured_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_rebuilt_after_admin_change(self):
+        self.titles()
+        self.client.force_authenticate(User.objects.create_user('admin', is_staff=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/admin/articles/{self.articles[1].id}/', {'featured': True},
+                                         format='json')
+        self.assertTrue(response.data['featured'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles(), ['Home 2', 'Home 5', 'Home 4'])
+
+    def test_unfeatured_by_admin(self):
+        Article.objects.filter(id=self.articles[0].id).update(featured=True)
+        self.assertEqual(self.titles(), ['Home 1', 'Home 5', 'Home 4'])
+        self.client.force_authenticate(User.objects.create_user('admin', is_staff=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f'/api/admin/articles/{self.articles[0].id}/', {'featured': False},
+                                         format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertFalse(Article.objects.get(id=self.articles[0].id).featured)
+        self.assertEqual(self.titles(), ['Home 5', 'Home 4', 'Home 3'])
+
+    @override_settings(BLOG_CACHE_TIMEOUT=60)
+    def test_entry_expires_and_skips_response_cache_stats(self):
+        self.titles()
+        self.titles()
+        self.assertEqual(response_cache.stats()['articles'], {'hits': 0, 'misses': 0})
+        # Written by another process: only the timeout brings it in here
+        Article.objects.filter(id=self.articles[0].id).update(featured=True)
+        self.assertEqual(self.titles(), ['Home 5', 'Home 4', 'Home 3'])
+        later = time.time() + 61
+        with mock.patch('django.core.cache.backends.locmem.time.time', return_value=later):
+            self.assertEqual(self.titles(), ['Home 1', 'Home 5', 'Home 4'])
+
+
+class FilterFacetTests(BlogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.design = Category.objects.create(name='Design', description='Design articles')
+        cls.other_author = User.objects.create_user('other')
+        cls.march = [
+            create_article(cls.author, cls.category, title=f'Python March {day}', date=datetime.date(2024, 3, day))
+            for day in (1, 2, 3)
+        ]
+        cls.april = create_article(cls.other_author, cls.category, title='Python April', date=datetime.date(2024, 4, 1))
+        cls.design_article = create_article(cls.author, cls.design, title='Python Design',
+                                            date=datetime.date(2024, 4, 2))
+        create_article(cls.author, cls.design, title='Python Draft', status='draft')
+
+    def ids(self, path, **params):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return {article['id'] for article in response.json()['results']}
+
+    def test_author_and_date_filters(self):
+        self.assertEqual(self.ids('/api/blog/articles/', author=self.other_author.id), {self.april.id})
+        self.assertEqual(
+            self.ids('/api/blog/articles/', date_from='2024-03-02', date_to='2024-04-01'),
+            {self.march[1].id, self.march[2].id, self.april.id}
+        )
+        self.assertEqual(self.client.get('/api/blog/articles/', {'date_to': '04/01/2024'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/blog/articles/', {'author': 'x'}).status_code, 400)
+        for value in ('99999999999999999999999', '\u00b2', '0', '-3'):
+            self.assertEqual(self.client.get('/api/blog/articles/', {'category': value}).status_code, 400, value)
+            self.assertEqual(
+                self.client.get('/api/blog/articles/search/', {'q': 'x', 'author': value}).status_code, 400, value
+            )
+        with self.settings(BLOG_FEED_SNAPSHOTS=True):
+            self.assertEqual(self.client.get('/api/blog/articles/', {'category': '\u00b2'}).status_code, 400)
+
+    def test_facets_in_one_grouped_query(self):
+        with self.assertNumQueries(4):  # max(updated_at), the content version, the page, the facets
+            response = self.client.get('/api/blog/articles/', {'category': self.category.id, 'facets': 'true'})
+        facets = response.json()['facets']
+        self.assertEqual(facets['categories'], [
+            {'id': self.design.id, 'name': 'Design', 'count': 1},
+            {'id': self.category.id, 'name': 'Programming', 'count': 4},
+        ])
+        self.assertEqual(facets['months'], [{'month': '2024-04', 'count': 1}, {'month': '2024-03', 'count': 3}])
+        self.assertNotIn('facets', self.client.get('/api/blog/articles/').json())
+
+    def test_filtered_search_paginates_within_the_filter(self):
+        params = {'q': 'python', 'category': self.design.id, 'page_size': 1, 'facets': 'true'}
+        response = self.client.get('/api/blog/articles/search/', params)
+        self.assertEqual([article['id'] for article in response.json()['results']], [self.design_article.id])
+        self.assertIsNone(response.json()['next'])
+        self.assertEqual(sum(entry['count'] for entry in response.json()['facets']['categories']), 5)
+
+        self.assertEqual(
+            self.ids('/api/blog/articles/search/', q='python', date_from='2024-04-01'),
+            {self.april.id, self.design_article.id}
+        )
+        with self.settings(BLOG_CACHE_ENABLED=False):
+            self.assertEqual(
+                self.client.get('/api/blog/async/articles/search/', params).json(),
+                self.client.get('/api/blog/articles/search/', params).json()
+            )
+
+
+@override_settings(BLOG_CHANGES_SETTLE=0)
+class ChangesTests(BlogTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.articles = [
+            create_article(self.author, self.category, title=f'Sync {number}') for number in range(5)
+        ]
+
+    def sync(self, token=None):
+        response = self.client.get('/api/blog/articles/changes/', {'since': token} if token else {})
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_initial_sync_drains_in_pages(self):
+        with self.settings(BLOG_CHANGES_LIMIT=2):
+            seen, token, more = [], None, True
+            while more:
+                page = self.sync(token)
+                seen += [article['id'] for article in page['changed']]
+                token, more = page['token'], page['more']
+        self.assertEqual(seen, [article.id for article in self.articles])
+        page = self.sync(token)
+        self.assertEqual((page['changed'], page['deleted'], page['more']), ([], [], False))
+
+    def test_returns_only_changes_and_tombstones(self):
+        token = self.sync()['token']
+        edited, unpublished, deleted, bulk_unpublished, republished = self.articles
+        deleted_id = deleted.id
+
+        edited.title = 'Sync edited'
+        edited.save()
+        unpublished.status = 'draft'
+        unpublished.save()
+        deleted.delete()
+        bulk.set_article_status([bulk_unpublished.id, republished.id], 'draft')
+        bulk.set_article_status([republished.id], 'published')
+        create_article(self.author, self.category, title='Sync draft', status='draft')
+
+        with self.assertNumQueries(2):
+            page = self.sync(token)
+        self.assertEqual([article['title'] for article in page['changed']], ['Sync edited', 'Sync 4'])
+        self.assertEqual(sorted(page['deleted']), sorted([unpublished.id, deleted_id, bulk_unpublished.id]))
+        self.assertEqual(self.sync(page['token'])['changed'], [])
+
+    def test_recent_writes_wait_for_the_settle_window(self):
+        token = self.sync()['token']
+        self.articles[0].save()
+        with self.settings(BLOG_CHANGES_SETTLE=60):
+            self.assertEqual(self.sync(token)['changed'], [])
+        self.assertEqual(len(self.sync(token)['changed']), 1)
+
+    def test_bulk_batches_are_stamped_when_they_commit(self):
+        # A slow batch: the maintenance ends well after it started
+        maintenance_done = []
+        after_changes = bulk._after_article_changes
+
+        def slow_after_changes(*args, **kwargs):
+            after_changes(*args, **kwargs)
+            maintenance_done.append(timezone.now())
+
+        published, removed = self.articles[0], self.articles[1]
+        with mock.patch.object(bulk, '_after_article_changes', slow_after_changes):
+            bulk.set_article_status([published.id, removed.id], 'draft')
+            bulk.set_article_status([published.id], 'published')
+
+        published.refresh_from_db()
+        self.assertGreaterEqual(published.updated_at, maintenance_done[-1])
+        tombstone = ArticleTombstone.objects.get(article_id=removed.id)
+        self.assertGreaterEqual(tombstone.removed_at, maintenance_done[0])
+
+        # A token handed out while the batch was running still finds both
+        token = changes_since(now=maintenance_done[0])['token']
+        page = self.sync(token)
+        self.assertIn(published.id, [article['id'] for article in page['changed']])
+        self.assertIn(removed.id, page['deleted'])
+
+    def test_bad_and_expired_tokens(self):
+        self.assertEqual(self.client.get('/api/blog/articles/changes/', {'since': 'nope'}).status_code, 400)
+        for naive in ({'c': None, 'd': None, 'at': '2024-03-15T12:00:00'},
+                      {'c': ['2024-03-15T12:00:00', 1], 'd': None, 'at': '2024-03-15T12:00:00+00:00'}):
+            response = self.client.get('/api/blog/articles/changes/', {'since': encode_token(naive)})
+            self.assertEqual(response.status_code, 400)
+        token = self.sync()['token']
+        with self.settings(BLOG_CHANGES_RETENTION_DAYS=0):
+            self.assertEqual(self.client.get('/api/blog/articles/changes/', {'since': token}).status_code, 410)
+
+
+class EventStreamTests(BlogTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_user('admin', is_staff=True)
+
+    def token(self, user):
+        return str(CustomTokenObtainPairSerializer.get_token(user).access_token)
+
+    def test_subscribers_each_get_committed_changes(self):
+        article = create_article(self.author, self.category, title='Streamed', status='draft')
+
+        def change():
+            with self.captureOnCommitCallbacks(execute=True):
+                bulk.set_article_status([article.id], 'published')
+                self.category.name = 'Code'
+                self.category.save()
+
+        async def scenario():
+            subscriptions = [broadcaster.subscribe(), broadcaster.subscribe()]
+            try:
+                await sync_to_async(change)()
+                return [[(await subscription.get(1))[1] for _ in range(2)] for subscription in subscriptions]
+            finally:
+                for subscription in subscriptions:
+                    broadcaster.unsubscribe(subscription)
+
+        first, second = async_to_sync(scenario)()
+        self.assertEqual(first, second)
+        self.assertEqual(first, [
+            {'type': 'article', 'id': article.id, 'action': 'updated',
+             'state': {'title': 'Streamed', 'status': 'published', 'featured': False, 'category': self.category.id}},
+            {'type': 'category', 'id': self.category.id, 'action': 'updated', 'state': {'name': 'Code'}},
+        ])
+        self.assertEqual(broadcaster.subscriber_count, 0)
+
+    @override_settings(BLOG_EVENTS_QUEUE_SIZE=2)
+    def test_slow_subscriber_is_told_to_reset(self):
+        async def scenario():
+            subscription = broadcaster.subscribe()
+            try:
+                # Published from another thread, as by a sync view
+                publisher = threading.Thread(
+                    target=lambda: [broadcaster.publish({'type': 'user', 'id': n}) for n in range(3)]
+                )
+                publisher.start()
+                await sync_to_async(publisher.join, thread_sensitive=False)()
+                await asyncio.sleep(0)
+                return [(await subscription.get(0.1) or (None, None))[1] for _ in range(2)]
+            finally:
+                broadcaster.unsubscribe(subscription)
+
+        self.assertEqual(async_to_sync(scenario)(), [{'type': 'reset'}, None])
+
+    def test_stream_needs_a_staff_token_and_asgi(self):
+        async def status(**params):
+            response = await self.async_client.get('/api/admin/events/', params)
+            return response.status_code
+
+        self.assertEqual(async_to_sync(status)(), 401)
+        self.assertEqual(async_to_sync(status)(token='garbage'), 401)
+        self.assertEqual(async_to_sync(status)(token=self.token(self.author)), 403)
+        self.assertEqual(self.client.get('/api/admin/events/', {'token': self.token(self.admin)}).status_code, 501)
+
+    def test_stream_delivers_events(self):
+        async def scenario():
+            response = await self.async_client.get('/api/admin/events/', {'token': self.token(self.admin)})
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            chunks = aiter(response.streaming_content)
+            received = [await anext(chunks), await anext(chunks)]
+            broadcaster.publish({'type': 'article', 'id': 7, 'action': 'deleted'})
+            received.append(await anext(chunks))
+            await chunks.aclose()
+            return [chunk.decode() if isinstance(chunk, bytes) else chunk for chunk in received]
+
+        retry, ready, event = async_to_sync(scenario)()
+        self.assertEqual(retry, 'retry: 5000\n\n')
+        self.assertIn('"type":"ready"', ready)
+        data = json.loads(event.split('data: ', 1)[1])
+        self.assertEqual(data, {'type': 'article', 'id': 7, 'action': 'deleted'})
+        self.assertEqual(broadcaster.subscriber_count, 0)
+
+
+class ProfilerTests(BlogTestCase):
+
+    @override_settings(BLOG_PROFILING=True)
+    def test_timings_in_header_and_log(self):
+        create_article(self.author, self.category, title='Profiled')
+        with self.assertLogs('core.profiling', 'INFO') as logs:
+            response = self.client.get('/api/blog/articles/')
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        for metric in ('total;dur=', 'db;dur=', 'serialize;dur='):
+            self.assertIn(metric, timing)
+
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertEqual(entry['path'], '/api/blog/articles/')
+        self.assertEqual(entry['status'], 200)
+        self.assertGreater(entry['db_queries'], 0)
+        self.assertIn(f'"{entry["db_queries"]} queries"', timing)
+        self.assertNotIn('profile', entry)
+
+    @override_settings(BLOG_PROFILING=True)
+    def test_tokens_are_not_logged(self):
+        with self.assertLogs('core.profiling', 'INFO') as logs:
+            self.client.get('/api/blog/articles/', {'page_size': 2, 'token': 'secret.jwt.value'})
+        entry = json.loads(logs.records[0].getMessage())
+        self.assertNotIn('secret', logs.output[0])
+        self.assertEqual(entry['path'], '/api/blog/articles/?page_size=2&token=[redacted]')
+
+    def test_disabled_by_default(self):
+        self.assertNotIn('Server-Timing', self.client.get('/api/blog/articles/'))
+
+    def test_repeated_query_shapes_are_reported(self):
+        first = create_article(self.author, self.category, title='First')
+        second = create_article(self.author, self.category, title='Second')
+        with RequestProfile().capture() as profile:
+            Article.objects.get(id=first.id)
+            Article.objects.get(id=second.id)
+            list(Article.objects.filter(id__in=[first.id]))
+            list(Article.objects.filter(id__in=[first.id, second.id]))
+        self.assertEqual(profile.query_count, 4)
+        self.assertEqual([entry['count'] for entry in profile.duplicates()], [2, 2])
+        self.assertEqual(fingerprint('SELECT 1 WHERE id IN (%s, %s, %s)'), 'SELECT 1 WHERE id IN (...)')
+
+    def test_sampled_requests_are_dumped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(BLOG_PROFILING=True, BLOG_PROFILING_SAMPLE_RATE=1, BLOG_PROFILING_DIR=directory):
+                with self.assertLogs('core.profiling', 'INFO') as logs:
+                    self.client.get('/api/blog/categories/')
+            entry = json.loads(logs.records[0].getMessage())
+            self.assertTrue(entry['profile'].endswith('.prof'))
+            self.assertTrue(entry['profile'].startswith(directory))
+            self.assertTrue(os.path.exists(entry['profile']))
+
+
+class BenchmarkSearchTests(BlogTestCase):
+
+    def test_generated_titles_stay_unique_when_the_text_repeats(self):
+        # Three words make 6-word titles repeat within a few hundred rows
+        output = io.StringIO()
+        call_command('benchmark_search', articles=300, vocabulary=3, queries=2, stdout=output)
+        self.assertIn('300 published articles', output.getvalue())
+        self.assertEqual(Article.objects.count(), 0)
+
+
+class SeedSyntheticTests(BlogTestCase):
+
+    def seed(self, count, **options):
+        call_command('seed_articles', count=count, users=7, categories=4, batch_size=100,
+                     published_ratio=0.5, stdout=io.StringIO(), **options)
+
+    def test_seeds_a_consistent_corpus_in_batches(self):
+        self.seed(250)
+        self.assertEqual(Article.objects.count(), 250)
+        self.assertEqual(User.objects.count(), 1 + 7)
+        self.assertEqual(Category.objects.count(), 1 + 4)
+        self.assertEqual(len(set(Article.objects.values_list('title', flat=True))), 250)
+        self.assertEqual(set(Article.objects.values_list('author_id', flat=True)) & {self.author.id}, set())
+
+        by_status = dict(Article.objects.values_list('status').annotate(count=Count('id')).order_by())
+        self.assertEqual(set(by_status), {'draft', 'published'})
+        self.assertTrue(75 <= by_status['published'] <= 175, by_status)
+        self.assertEqual(counters.reconcile(), {})
+
+        # A second run adds its own users, categories and titles next to the first
+        self.seed(30, workers=1, skip_search_index=True)
+        self.assertEqual(Article.objects.count(), 280)
+        self.assertEqual(len(set(Article.objects.values_list('title', flat=True))), 280)
+        self.assertEqual(counters.reconcile(), {})
+
+
+@override_settings(ALLOWED_HOSTS=['127.0.0.1'])
+class BenchmarkApiTests(TransactionTestCase):
+    """
+    Transactional: the benchmark's server threads need to see committed rows
+    """
+
+    def test_runs_with_a_throwaway_admin(self):
+        author = User.objects.create_user('author')
+        category = Category.objects.create(name='Programming')
+        create_article(author, category, title='Benchmarked')
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results.json')
+            call_command('benchmark_api', requests=4, token_requests=1, concurrency=2, output=output,
+                         scenarios=['articles_list', 'admin_articles', 'token_obtain'], stdout=io.StringIO())
+            with open(output) as results:
+                scenarios = json.load(results)['scenarios']
+        self.assertEqual({name: summary['errors'] for name, summary in scenarios.items()},
+                         {'articles_list': 0, 'admin_articles': 0, 'token_obtain': 0})
+        self.assertEqual(list(User.objects.values_list('username', flat=True)), ['author'])
@@ -1,5 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import CategoryViewSet, ArticleViewSet
 
 # Create a router for DRF ViewSets
@@ -8,5 +9,10 @@ router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'articles', ArticleViewSet, basename='article')
 
 urlpatterns = [
+    # Async read path for ASGI deployments, same responses as the viewset
+    path('async/articles/', async_views.article_list, name='async-article-list'),
+    path('async/articles/search/', async_views.article_search, name='async-article-search'),
+    path('async/articles/<int:pk>/', async_views.article_detail, name='async-article-detail'),
     path('', include(router.urls)),
-] 
\ No newline at end of file
+]
+ 
\ No newline at end of file
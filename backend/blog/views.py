@@ -1,17 +1,28 @@
-from django.db.models import Q
+from django.conf import settings
+from django.db.models import Count, Max
 from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAdminUser
 
+from .cache import ARTICLES, CATEGORIES, CachedResponseMixin, Validators
+from .changes import changes_since
+from .featured import featured_articles
+from .filters import facet_counts, filter_articles, is_filtered, wants_facets
+from .feed import feed_snapshots
 from .models import Category, Article
-from .serializers import CategorySerializer, ArticleSerializer, ArticleListSerializer
+from .serializers import CategorySerializer, ArticleSerializer, ArticleListSerializer, ArticleListValuesSerializer
+from .pagination import ArticleCursorPagination
+from .related import related_count
+from .search import get_search_backend
+from .suggest import suggestion_index
 from rest_framework.views import APIView
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """
     API endpoint for retrieving categories
     """
+    cache_scope = CATEGORIES
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
 
@@ -26,14 +37,57 @@ class CategoryViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes]
 
 
-class ArticleViewSet(viewsets.ReadOnlyModelViewSet):
+class ArticleViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for retrieving articles
     """
-    queryset = Article.objects.filter(status='published').select_related('category')
+    cache_scope = ARTICLES
+    # changes: answers move with the settle cutoff, not only with writes.
+    # featured: keeps its own entry (blog.featured), rebuilt on invalidation.
+    uncached_actions = ('changes', 'featured')
+    queryset = Article.objects.published().for_listing()
+    pagination_class = ArticleCursorPagination
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ['list', 'search']:
+            queryset = filter_articles(queryset, self.request.query_params)
+        return queryset
+
+    def add_facets(self, response, queryset):
+        """
+        Attach the facets block when the client asked for it (?facets=true).
+        ``queryset`` is the result before the list filters.
+        """
+        params = self.request.query_params
+        if wants_facets(params):
+            response.data['facets'] = facet_counts(filter_articles(queryset, params, category=False), params)
+        return response
+    
+    def list(self, request, *args, **kwargs):
+        """
+        Paginated list of published articles, revalidated with ETag/Last-Modified
+        """
+        if request.accepted_renderer.format == 'json':
+            snapshot = feed_snapshots.response(request)
+            if snapshot is not None:
+                return snapshot
+
+        # The count catches deletes and unpublishes that max(updated_at)
+        # misses; both come from article_status_updated_idx
+        summary = self.filter_queryset(self.get_queryset()).aggregate(
+            count=Count('id'), last_modified=Max('updated_at')
+        )
+        validators = Validators(ARTICLES, request, summary['last_modified'], summary['count'])
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()).listing_values())
+        response = self.get_paginated_response(ArticleListValuesSerializer(page, many=True).data)
+        return validators.apply(self.add_facets(response, Article.objects.published()))
     
     def get_serializer_class(self):
-        if self.action == 'list':
+        if self.action in ['list', 'related']:
             return ArticleListSerializer
         return ArticleSerializer
     
@@ -50,44 +104,101 @@ class ArticleViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Search in title, excerpt and content
-        search_results = Article.objects.filter(
-            Q(title__icontains=search_term) | 
-            Q(excerpt__icontains=search_term) | 
-            Q(content__icontains=search_term)
-        ).select_related('category')
+        # Look the term up in the full-text index, best matches first
+        backend = get_search_backend()
+        within = self.get_queryset() if is_filtered(request.query_params) else None
+        paginator = self.paginator
+        ranked_ids = paginator.paginate_ranked(
+            lambda offset, limit: backend.search(search_term, limit=limit, offset=offset, within=within),
+            request
+        )
+        positions = {article_id: position for position, article_id in enumerate(ranked_ids)}
+        search_results = sorted(
+            self.get_queryset().filter(id__in=ranked_ids).listing_values(),
+            key=lambda article: positions[article.id]
+        )
         
-        if search_results.count() == 0:
+        if not search_results and paginator.decode_cursor(request) is None:
             return Response(
                 {"error": "No articles found!"}, 
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        serializer = ArticleListSerializer(search_results, many=True)
-        return Response(serializer.data)
+        serializer = ArticleListValuesSerializer(search_results, many=True)
+        response = paginator.get_paginated_response(serializer.data)
+        return self.add_facets(response, backend.filter(Article.objects.published(), search_term))
+    
+    @action(detail=False, methods=['get'])
+    def featured(self, request):
+        """
+        Home page articles: featured first, then the latest (see blog.featured)
+        """
+        if request.accepted_renderer.format == 'json':
+            return featured_articles.response(request)
+        return Response(featured_articles.data())
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Articles changed, deleted or unpublished since ?since=<token> (see blog.changes)
+        """
+        return Response(changes_since(request.query_params.get('since')))
+
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """
+        Search-as-you-type suggestions (id and title only) for the header search
+        """
+        max_limit = getattr(settings, 'BLOG_SUGGEST_MAX_LIMIT', 10)
+        try:
+            limit = int(request.query_params.get('limit', getattr(settings, 'BLOG_SUGGEST_LIMIT', 5)))
+        except ValueError:
+            return Response(
+                {"error": "limit must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, max_limit))
+
+        return Response(suggestion_index.suggest(request.query_params.get('q', ''), limit=limit))
+    
+    @action(detail=True, methods=['get'])
+    def related(self, request, pk=None):
+        """
+        Paginated list of published articles from the same category
+        """
+        instance = self.get_object()
+        related_articles = self.get_queryset().filter(
+            category_id=instance.category_id
+        ).exclude(
+            id=instance.id
+        ).listing_values()
+        page = self.paginate_queryset(related_articles)
+        serializer = ArticleListValuesSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
     
     def retrieve(self, request, *args, **kwargs):
         """
         Get a single article with related articles
         """
         instance = self.get_object()
+        validators = Validators(ARTICLES, request, instance.updated_at, instance.id)
+        not_modified = validators.not_modified(request)
+        if not_modified is not None:
+            return not_modified
+        
         serializer = self.get_serializer(instance)
         
-        # Find related articles in the same category
-        related_articles = Article.objects.filter(
-            category=instance.category
-        ).exclude(
-            id=instance.id
-        ).select_related(
-            'category'
-        )[:3]  # Limit to 3 related articles
+        # Precomputed related articles, best match first (see blog.related)
+        related_articles = self.get_queryset().filter(
+            related_by__article_id=instance.id
+        ).order_by('-related_by__score').listing_values()[:related_count()]
         
-        related_serializer = ArticleListSerializer(related_articles, many=True)
+        related_serializer = ArticleListValuesSerializer(related_articles, many=True)
         
         # Format response to match existing API
-        return Response({
+        return validators.apply(Response({
             'article': serializer.data,
             'relatedArticles': related_serializer.data
-        })
+        }))
 
 
@@ -0,0 +1,25 @@
+"""
+JSON parser backed by orjson, registered in ``REST_FRAMEWORK``. Falls back
+to DRF's stdlib parser when orjson is not installed, for non-UTF-8 bodies
+and when ``STRICT_JSON`` is off (orjson never accepts NaN/Infinity).
+"""
+import codecs
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+
+from .renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        if (orjson is None or not self.strict
+                or codecs.lookup(get_encoding(parser_context)).name != 'utf-8'):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
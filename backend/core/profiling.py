@@ -0,0 +1,198 @@
+"""
+Opt-in request profiler.
+
+``ProfilerMiddleware`` is always listed in ``MIDDLEWARE`` but removes
+itself at startup (``MiddlewareNotUsed``) unless ``BLOG_PROFILING`` is on,
+so it costs nothing when disabled. When enabled, every request gets
+
+- a ``Server-Timing`` header (total, db and serialize durations, shown in
+  the browser's network panel), and
+- one JSON log line on the ``core.profiling`` logger with the query count,
+  SQL time, serializer time and the query shapes run more than once
+  (N+1 candidates).
+
+A ``BLOG_PROFILING_SAMPLE_RATE`` fraction of requests is additionally run
+under cProfile and dumped to ``BLOG_PROFILING_DIR`` (open the ``.prof``
+files with ``python -m pstats`` or snakeviz).
+
+The middleware is sync-only: Django then runs async views through
+``async_to_sync`` from the middleware's thread, which is also where their
+``sync_to_async`` ORM calls run, so their queries are counted too.
+"""
+import cProfile
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger('core.profiling')
+
+# Serializer classes whose ``data`` property counts as serializer time
+SERIALIZER_CLASSES = (
+    'rest_framework.serializers.BaseSerializer',
+    'blog.serializers.ArticleListValuesSerializer',
+)
+
+_current_profile = ContextVar('request_profile', default=None)
+
+# Query parameters carrying credentials (the admin stream's JWT), which
+# must not reach the log
+SENSITIVE_PARAMS = frozenset(('token',))
+
+IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """
+    The shape of a query: parameters are already placeholders, so only
+    IN lists of different lengths and whitespace need folding
+    """
+    return WHITESPACE.sub(' ', IN_LIST.sub('IN (...)', sql)).strip()
+
+
+def loggable_path(request):
+    """
+    The request path and query string with sensitive parameter values
+    replaced
+    """
+    if SENSITIVE_PARAMS.isdisjoint(request.GET):
+        return request.get_full_path()
+    query = request.GET.copy()
+    for name in SENSITIVE_PARAMS.intersection(query):
+        query.setlist(name, ['[redacted]'] * len(query.getlist(name)))
+    return f'{request.path}?{query.urlencode(safe="[]")}'
+
+
+class RequestProfile:
+
+    def __init__(self):
+        self.queries = Counter()
+        self.db_time = 0.0
+        self.serialize_time = 0.0
+        self.serializing = False
+
+    @property
+    def query_count(self):
+        return sum(self.queries.values())
+
+    def duplicates(self, limit=5):
+        return [
+            {'sql': sql, 'count': count}
+            for sql, count in self.queries.most_common(limit) if count > 1
+        ]
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries[fingerprint(sql)] += 1
+
+    @contextmanager
+    def capture(self):
+        """
+        Record the queries run on every connection of this thread and the
+        serializer time of this context
+        """
+        token = _current_profile.set(self)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self.execute_wrapper))
+                yield self
+        finally:
+            _current_profile.reset(token)
+
+
+def timed_data(data):
+    """
+    Wrap a serializer ``data`` property so it adds to the current profile's
+    serializer time (nested ``.data`` calls are counted once)
+    """
+    def fget(serializer):
+        profile = _current_profile.get()
+        if profile is None or profile.serializing:
+            return data.fget(serializer)
+        profile.serializing = True
+        started = time.perf_counter()
+        try:
+            return data.fget(serializer)
+        finally:
+            profile.serialize_time += time.perf_counter() - started
+            profile.serializing = False
+    fget.profiled = True
+    return property(fget)
+
+
+def instrument_serializers():
+    for path in SERIALIZER_CLASSES:
+        serializer_class = import_string(path)
+        data = serializer_class.__dict__['data']
+        if not getattr(data.fget, 'profiled', False):
+            serializer_class.data = timed_data(data)
+
+
+class ProfilerMiddleware:
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'BLOG_PROFILING', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        instrument_serializers()
+
+    def __call__(self, request):
+        sample_rate = getattr(settings, 'BLOG_PROFILING_SAMPLE_RATE', 0)
+        profiler = cProfile.Profile() if sample_rate and random.random() < sample_rate else None
+
+        started = time.perf_counter()
+        with RequestProfile().capture() as profile:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        total = time.perf_counter() - started
+
+        response['Server-Timing'] = ', '.join((
+            f'total;dur={total * 1000:.1f}',
+            f'db;dur={profile.db_time * 1000:.1f};desc="{profile.query_count} queries"',
+            f'serialize;dur={profile.serialize_time * 1000:.1f}',
+        ))
+        entry = {
+            'method': request.method,
+            'path': loggable_path(request),
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_queries': profile.query_count,
+            'db_ms': round(profile.db_time * 1000, 2),
+            'serialize_ms': round(profile.serialize_time * 1000, 2),
+            'duplicate_queries': profile.duplicates(),
+        }
+        if profiler is not None:
+            entry['profile'] = str(self.dump(profiler, request))
+        logger.info(json.dumps(entry))
+        return response
+
+    @staticmethod
+    def dump(profiler, request):
+        directory = Path(getattr(settings, 'BLOG_PROFILING_DIR', 'profiles'))
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r'[^\w]+', '-', request.path).strip('-') or 'root'
+        path = directory / f'{time.strftime("%Y%m%d-%H%M%S")}-{request.method}-{slug}-{uuid.uuid4().hex[:8]}.prof'
+        profiler.dump_stats(path)
+        return path
@@ -0,0 +1,41 @@
+"""
+JSON renderer backed by orjson, registered in ``REST_FRAMEWORK``.
+
+The output matches DRF's ``JSONRenderer`` byte for byte: dates, times and
+decimals go through DRF's own encoder, and anything orjson cannot produce
+identically (indented output for the browsable API, ``UNICODE_JSON`` or
+``COMPACT_JSON`` turned off, integers beyond 64 bits) is rendered by the
+stdlib path. When orjson is not installed every call takes that path.
+
+One difference remains: orjson writes NaN and infinities as ``null``,
+where the strict stdlib path raises ``ValueError``.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def __init__(self):
+        self._default = self.encoder_class().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self._default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same strict JavaScript subset as the stdlib path
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return ret
+
@@ -36,6 +36,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost so it times everything; removes itself unless BLOG_PROFILING is on
+    'core.profiling.ProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -79,6 +81,18 @@ DATABASES = {
     }
 }
 
+# Cache
+# Swap the backend for a shared one (e.g. Redis or Memcached) when running
+# more than one worker or run_scheduler, so invalidations reach every
+# process. With this per-process cache, other processes only see a write
+# once their cached responses expire (BLOG_CACHE_TIMEOUT).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blog',
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -112,10 +126,21 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    # JWTAuthentication with an in-process user cache instead of a query per request
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.custom.authentication.CachedJWTAuthentication',
+    ],
+    # orjson-backed JSON, same output as DRF's renderer (stdlib fallback)
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
-} 
+}
 
 # Allow requests from the frontend development server
 CORS_ALLOWED_ORIGINS = [
@@ -171,4 +196,80 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 
     'JTI_CLAIM': 'jti',
-}
\ No newline at end of file
+}
+
+# Seconds CachedJWTAuthentication trusts a cached user row. Changes made in
+# another process are picked up when this runs out (or the token's claims
+# no longer match).
+BLOG_AUTH_USER_CACHE_TIMEOUT = 30
+
+# Blog search settings
+BLOG_SEARCH_BACKEND = 'blog.search.SQLiteFTS5SearchBackend'
+BLOG_SUGGEST_LIMIT = 5
+BLOG_SUGGEST_MAX_LIMIT = 10
+# Seconds between checks of the suggestion index against the database, so
+# articles written by other processes (e.g. run_scheduler) show up
+BLOG_SUGGEST_REFRESH_INTERVAL = 30
+
+# Public article listing pagination
+BLOG_PAGE_SIZE = 12
+BLOG_MAX_PAGE_SIZE = 100
+
+# Articles on the home page (/api/blog/articles/featured/)
+BLOG_FEATURED_COUNT = 3
+
+# Delta sync (/api/blog/articles/changes/): changes per response, seconds
+# a write may take to commit, and how long tombstones (and tokens) last
+BLOG_CHANGES_LIMIT = 500
+BLOG_CHANGES_SETTLE = 2
+BLOG_CHANGES_RETENTION_DAYS = 30
+
+# Admin tables (numbered pages)
+BLOG_ADMIN_PAGE_SIZE = 20
+BLOG_ADMIN_MAX_PAGE_SIZE = 100
+BLOG_ADMIN_BULK_MAX_IDS = 1000
+
+# Admin change stream (/api/admin/events/, ASGI only): events a slow client
+# may fall behind before it is told to refetch, and seconds between keepalives
+BLOG_EVENTS_QUEUE_SIZE = 100
+BLOG_EVENTS_KEEPALIVE = 15
+
+# Request profiler (core.profiling): Server-Timing header and a JSON log
+# line per request, plus a cProfile dump for the sampled fraction
+BLOG_PROFILING = os.environ.get('BLOG_PROFILING', '0') == '1'
+BLOG_PROFILING_SAMPLE_RATE = float(os.environ.get('BLOG_PROFILING_SAMPLE_RATE', '0'))
+BLOG_PROFILING_DIR = BASE_DIR / 'profiles'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.profiling': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Public blog response cache
+# Benchmarks start servers with BLOG_CACHE_ENABLED=0 to measure uncached reads
+BLOG_CACHE_ENABLED = os.environ.get('BLOG_CACHE_ENABLED', '1') != '0'
+BLOG_CACHE_ALIAS = 'default'
+BLOG_CACHE_TIMEOUT = 300
+
+# Precomputed related articles
+BLOG_RELATED_COUNT = 3
+BLOG_RELATED_CANDIDATES = 200
+BLOG_RELATED_CATEGORY_WEIGHT = 0.5
+# Bulk admin operations touching more articles rebuild the table instead
+BLOG_RELATED_BULK_REBUILD = 100
+
+# Materialized article feed (pre-rendered list pages, see blog.feed). The
+# cache must be shared by all server processes, e.g. a FileBasedCache.
+BLOG_FEED_SNAPSHOTS = False
+BLOG_FEED_SNAPSHOT_PAGES = 5
+BLOG_FEED_CACHE_ALIAS = 'default'
+
+# Scheduled publishing (run_scheduler)
+BLOG_SCHEDULER_TICK = 30
+BLOG_SCHEDULER_BATCH_SIZE = 500
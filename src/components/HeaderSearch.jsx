@@ -33,10 +33,10 @@ const HeaderSearch = () => {
       }
       
       try {
-        const response = await fetch(`http://localhost:8000/api/blog/articles/search?q=${encodeURIComponent(searchTerm)}`);
+        const response = await fetch(`http://localhost:8000/api/blog/articles/suggest/?q=${encodeURIComponent(searchTerm)}&limit=5`);
         if (response.ok) {
           const data = await response.json();
-          setRecommendations(data.slice(0, 5)); // Limit to 5 suggestions
+          setRecommendations(data);
         }
       } catch (error) {
         console.error('Error fetching recommendations:', error);
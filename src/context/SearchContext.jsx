@@ -35,7 +35,7 @@ export const SearchProvider = ({ children }) => {
       } else if (!response.ok) {
         throw new Error('Search failed');
       }
-      setSearchResults(data);
+      setSearchResults(data.results || []);
     } catch (error) {
       console.error('Search error:', error);
     } finally {
@@ -0,0 +1,26 @@
+import { useEffect, useRef } from 'react';
+
+// Subscribes to the admin change stream (/api/admin/events/, served by the
+// ASGI deployment) and calls onEvent for events about `type`, plus "reset"
+// events, which mean the page should refetch what it shows.
+const useAdminEvents = (type, onEvent) => {
+  const handler = useRef(onEvent);
+  handler.current = onEvent;
+
+  useEffect(() => {
+    const access = JSON.parse(localStorage.getItem('tokens'))?.access;
+    if (!access || typeof EventSource === 'undefined') return;
+
+    // EventSource can't send an Authorization header
+    const source = new EventSource(`http://localhost:8000/api/admin/events/?token=${encodeURIComponent(access)}`);
+    source.onmessage = (message) => {
+      const event = JSON.parse(message.data);
+      if (event.type === type || event.type === 'reset') {
+        handler.current(event);
+      }
+    };
+    return () => source.close();
+  }, [type]);
+};
+
+export default useAdminEvents;
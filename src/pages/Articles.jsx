@@ -13,10 +13,21 @@ export default function ArticlesWithPagination() {
   const location = useLocation();
   const { setArticleData } = useContext(ArticleContext);
   const { searchTerm, searchResults, isSearching, clearSearch, errorMessage, isError: isSearchError } = useContext(SearchContext);
-  const { data: articles, isLoading, isError } = useHttp('http://localhost:8000/api/blog/articles');
-  const [visibleArticles, setVisibleArticles] = useState(6);
+  const [category, setCategory] = useState(null);
+  // The first page also carries the per-category counts for the filter bar
+  const { data: firstPage, isLoading, isError } = useHttp(
+    `http://localhost:8000/api/blog/articles/?page_size=6&facets=true${category ? `&category=${category}` : ''}`
+  );
+  const categoryFacets = firstPage.facets?.categories || [];
+  const [articles, setArticles] = useState([]);
+  const [nextPageUrl, setNextPageUrl] = useState(null);
   const [isLoadingMore, setIsLoadingMore] = useState(false);
 
+  useEffect(() => {
+    setArticles(firstPage.results || []);
+    setNextPageUrl(firstPage.next || null);
+  }, [firstPage]);
+
   useEffect(() => {
     setArticleData(articles);
     
@@ -32,26 +43,33 @@ export default function ArticlesWithPagination() {
     }
   }, [location.state, searchTerm]);
 
-  // Load more articles handler with animation delay
-  const handleLoadMore = () => {
+  // Load the next page of articles from the cursor returned by the API
+  const handleLoadMore = async () => {
+    if (!nextPageUrl) return;
     setIsLoadingMore(true);
     
-    // Add a small delay to make the loading animation visible
-    setTimeout(() => {
-      setVisibleArticles(prev => prev + 6);
+    try {
+      // Later pages don't need the counts again
+      const url = new URL(nextPageUrl);
+      url.searchParams.delete('facets');
+      const response = await fetch(url);
+      if (response.ok) {
+        const page = await response.json();
+        setArticles(prev => [...prev, ...page.results]);
+        setNextPageUrl(page.next);
+      }
+    } catch (error) {
+      console.error('Error loading more articles:', error);
+    } finally {
       setIsLoadingMore(false);
-    }, 800);
+    }
   };
 
-  const displayArticles = searchResults?.length > 0 
+  const displayedArticles = searchResults?.length > 0 
     ? searchResults 
     : articles;
-  
-  const displayedArticles = searchResults?.length > 0  
-    ? displayArticles 
-    : displayArticles ? displayArticles.slice(0, visibleArticles) : [];
     
-  const hasMoreArticles = !searchResults?.length && articles && visibleArticles < articles.length;
+  const hasMoreArticles = !searchResults?.length && Boolean(nextPageUrl);
   const isShowingSearchResults = searchResults?.length > 0;
 
   if (isSearchError && errorMessage == "No articles found!") {
@@ -91,6 +109,27 @@ export default function ArticlesWithPagination() {
         </motion.div>
       </div>
       
+      {/* Category filter */}
+      {!isShowingSearchResults && categoryFacets.length > 0 && (
+        <div className="flex flex-wrap gap-2 mb-8">
+          <button
+            onClick={() => setCategory(null)}
+            className={`px-4 py-2 rounded-full text-sm transition-colors ${category === null ? 'bg-blue-500 text-white' : 'bg-gray-100 hover:bg-gray-200 text-gray-700'}`}
+          >
+            All
+          </button>
+          {categoryFacets.map(facet => (
+            <button
+              key={facet.id}
+              onClick={() => setCategory(facet.id)}
+              className={`px-4 py-2 rounded-full text-sm transition-colors ${category === facet.id ? 'bg-blue-500 text-white' : 'bg-gray-100 hover:bg-gray-200 text-gray-700'}`}
+            >
+              {facet.name} ({facet.count})
+            </button>
+          ))}
+        </div>
+      )}
+
       {/* Search Results Header for Global Search */}
       {isShowingSearchResults && (
         <motion.div 
@@ -129,7 +168,7 @@ export default function ArticlesWithPagination() {
             animate={{ opacity: 1, y: 0 }}
             transition={{ 
               duration: 0.5, 
-              delay: index < visibleArticles - 6 ? 0.1 * (index % 6) : 0.1 * (index % 6) + 0.5
+              delay: index < displayedArticles.length - 6 ? 0.1 * (index % 6) : 0.1 * (index % 6) + 0.5
             }}
             layout
           >
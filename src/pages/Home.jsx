@@ -8,7 +8,8 @@ import ArticleCart from '../components/ArticleCart';
 
 const Home = () => {
   const { setArticleData } = useContext(ArticleContext);
-  const { data: featuredArticles } = useHttp('http://localhost:8000/api/blog/articles');
+  const { data } = useHttp('http://localhost:8000/api/blog/articles/featured/');
+  const featuredArticles = data.results || [];
 
 
   useEffect(() => {
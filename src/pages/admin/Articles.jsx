@@ -1,6 +1,7 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useMemo, useCallback } from 'react';
 import { motion } from 'framer-motion';
 import useAuthHttp from '../../hooks/useAuthHttp';
+import useAdminEvents from '../../hooks/useAdminEvents';
 import SpinLoader from '../../components/loaders/SpinLoader';
 import AdminSomethingWentWrong from '../../components/admin/errors/AdminSomethingWentWrong';
 import { showSuccessToast, showErrorToast } from '../../utils/toastNotifs';
@@ -15,13 +16,8 @@ import {
 
 const Articles = () => {
   const navigate = useNavigate();
-  const [articlesList, setArticlesList] = useState([]);
-  const [filteredArticles, setFilteredArticles] = useState([]);
   const [searchQuery, setSearchQuery] = useState('');
-  const [firstLastIndex, setFirstLastIndex] = useState({
-    firstIndex: null,
-    lastIndex: null
-  });
+  const [debouncedSearch, setDebouncedSearch] = useState('');
   const [filters, setFilters] = useState({
     status: 'all',       // 'all', 'published', 'draft'
     category: 'all'      // 'all', or category id
@@ -32,13 +28,37 @@ const Articles = () => {
   const [deleteModalOpen, setDeleteModalOpen] = useState(false);
   const [articleToDelete, setArticleToDelete] = useState(null);
 
+  // Filtering, search and pagination happen on the server
+  const articlesUrl = useMemo(() => {
+    const params = new URLSearchParams({ page: currentPage, page_size: articlesPerPage });
+    if (filters.status !== 'all') params.set('status', filters.status);
+    if (filters.category !== 'all') params.set('category', filters.category);
+    if (debouncedSearch.trim()) params.set('search', debouncedSearch.trim());
+    return `http://localhost:8000/api/admin/articles/?${params}`;
+  }, [currentPage, articlesPerPage, filters, debouncedSearch]);
+
   // Fetch articles
   const { 
     data: articlesData, 
     isError: isArticlesError, 
     isLoading: isArticlesLoading, 
     sendRequest: fetchArticles 
-  } = useAuthHttp('http://localhost:8000/api/admin/articles/');
+  } = useAuthHttp(articlesUrl);
+
+  // Live changes from other tabs and admins: patch rows in place, refetch
+  // the page when rows come or go
+  const [rowPatches, setRowPatches] = useState({});
+  useEffect(() => setRowPatches({}), [articlesData]);
+  useAdminEvents('article', useCallback((event) => {
+    if (event.action === 'updated') {
+      setRowPatches(prev => ({ ...prev, [event.id]: event.state }));
+    } else {
+      fetchArticles();
+    }
+  }, [fetchArticles]));
+
+  // Total article count from the dashboard counters
+  const { data: statsData } = useAuthHttp('http://localhost:8000/api/admin/stats/');
 
   // Delete article hook
   const {
@@ -111,14 +131,11 @@ const Articles = () => {
     }
   }, [categoriesData]);
 
-  // Load articles
+  // Debounce search so typing doesn't send a request per keystroke
   useEffect(() => {
-    if (articlesData) {
-      let articles = Array.isArray(articlesData) ? articlesData : [];
-      setArticlesList(articles);
-      setFilteredArticles(articles);
-    }
-  }, [articlesData]);
+    const timer = setTimeout(() => setDebouncedSearch(searchQuery), 300);
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
 
   // Save current state when it changes
   useEffect(() => {
@@ -128,55 +145,12 @@ const Articles = () => {
     sessionStorage.setItem('adminArticleListSearch', searchQuery);
   }, [currentPage, filters, articlesPerPage, searchQuery]);
 
-  // Apply filters and search
-  useEffect(() => {
-    if (articlesList.length > 0) {
-      let result = [...articlesList];
-      
-      // Apply search filter
-      if (searchQuery.trim()) {
-        const query = searchQuery.toLowerCase();
-        result = result.filter(article => 
-          article.title.toLowerCase().includes(query) ||
-          (article.excerpt && article.excerpt.toLowerCase().includes(query)) ||
-          (article.content && article.content.toLowerCase().includes(query))
-        );
-      }
-      
-      // Apply status filter
-      if (filters.status !== 'all') {
-        result = result.filter(article => article.status === filters.status);
-      }
-      
-      // Apply category filter
-      if (filters.category !== 'all') {
-        result = result.filter(article => article.category.toString() === filters.category);
-      }
-      
-      setFilteredArticles(() => {
-        if (articlesPerPage >= result.length) {
-          setCurrentPage(1);
-        }
-        return result;
-      });
-    }
-  }, [filters, articlesList, searchQuery]);
-
-  // Apply pagination
-  useEffect(() => {
-    if (filteredArticles.length > 0) {
-      const indexOfLastArticle = currentPage * articlesPerPage;
-      const indexOfFirstArticle = indexOfLastArticle - articlesPerPage;
-      
-      setFirstLastIndex({
-        firstIndex: indexOfFirstArticle,
-        lastIndex: indexOfLastArticle
-      });
-    }
-  }, [filteredArticles, currentPage, articlesPerPage]);
-   
   // Calculate pagination controls
-  const totalPages = Math.ceil(filteredArticles.length / articlesPerPage);
+  const articles = (articlesData?.results || []).map(article =>
+    rowPatches[article.id] ? { ...article, ...rowPatches[article.id] } : article
+  );
+  const totalCount = articlesData?.count || 0;
+  const totalPages = Math.ceil(totalCount / articlesPerPage);
   
   const handlePageChange = (pageNumber) => {
     setCurrentPage(pageNumber);
@@ -192,11 +166,18 @@ const Articles = () => {
       ...prev,
       [filterType]: value
     }));
+    setCurrentPage(1);
+  };
+
+  const handleSearchChange = (query) => {
+    setSearchQuery(query);
+    setCurrentPage(1);
   };
 
   const handleClearFilters = () => {
     setFilters({ status: 'all', category: 'all' });
     setSearchQuery('');
+    setCurrentPage(1);
   };
 
   const handleArticleEdit = (articleId) => {
@@ -274,7 +255,8 @@ const Articles = () => {
     }
   };
 
-  if (isArticlesLoading || isCategoriesLoading) {
+  // Keep the table (and the search box focus) while later pages load
+  if ((isArticlesLoading && !articlesData?.results) || isCategoriesLoading) {
     return <SpinLoader />;
   }
 
@@ -297,7 +279,7 @@ const Articles = () => {
           </svg>
         }
         searchQuery={searchQuery}
-        onSearchChange={setSearchQuery}
+        onSearchChange={handleSearchChange}
         searchPlaceholder="Search articles..."
       >
         <Link
@@ -313,8 +295,8 @@ const Articles = () => {
         onFilterChange={handleFilterChange}
         onClearFilters={handleClearFilters}
         filterConfig={getArticleFilterConfig()}
-        totalItems={articlesList.length}
-        filteredItems={filteredArticles.length}
+        totalItems={statsData?.articles ?? totalCount}
+        filteredItems={totalCount}
         searchQuery={searchQuery}
       />
       
@@ -343,7 +325,7 @@ const Articles = () => {
             </tr>
           </thead>
           <tbody className="bg-white divide-y divide-gray-200">
-            {filteredArticles.slice(firstLastIndex.firstIndex, firstLastIndex.lastIndex).map((article) => (
+            {articles.map((article) => (
               <tr key={article.id} className="hover:bg-gray-50">
                 <td className="px-6 py-4">
                   <div className="text-sm font-medium text-gray-900">{article.title}</div>
@@ -387,7 +369,7 @@ const Articles = () => {
                 </td>
               </tr>
             ))}
-            {filteredArticles.length === 0 && (
+            {articles.length === 0 && (
               <tr>
                 <td colSpan="6" className="px-6 py-4 text-center text-gray-500">
                   No articles found
@@ -398,12 +380,12 @@ const Articles = () => {
         </table>
       </div>
 
-      {filteredArticles.length > 0 && (
+      {totalCount > 0 && (
         <AdminPagination
           currentPage={currentPage}
           totalPages={totalPages}
           itemsPerPage={articlesPerPage}
-          totalItems={filteredArticles.length}
+          totalItems={totalCount}
           onPageChange={handlePageChange}
           onItemsPerPageChange={handlePageSizeChange}
         />
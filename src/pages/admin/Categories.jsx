@@ -1,6 +1,7 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useCallback } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import useAuthHttp from '../../hooks/useAuthHttp';
+import useAdminEvents from '../../hooks/useAdminEvents';
 import SpinLoader from '../../components/loaders/SpinLoader';
 import AdminSomethingWentWrong from '../../components/admin/errors/AdminSomethingWentWrong';
 import { showSuccessToast, showErrorToast } from '../../utils/toastNotifs';
@@ -35,6 +36,18 @@ const Categories = () => {
     isLoading,
     sendRequest: fetchCategories
   } = useAuthHttp('http://localhost:8000/api/blog/categories/');
+
+  // Live changes from other tabs and admins: rename in place, refetch when
+  // categories come or go
+  useAdminEvents('category', useCallback((event) => {
+    if (event.action === 'updated') {
+      setCategoriesList(prev => prev.map(category =>
+        category.id === event.id ? { ...category, ...event.state } : category
+      ));
+    } else {
+      fetchCategories();
+    }
+  }, [fetchCategories]));
   
 
   // Restore pagination and search state from sessionStorage when component mounts
@@ -32,12 +32,12 @@ const Dashboard = () => {
     isError: articlesError,
     errorMessage: articlesErrorMessage,
     data: articles,
-  } = useAuthHttp('http://localhost:8000/api/admin/articles/');
+  } = useAuthHttp('http://localhost:8000/api/admin/articles/?page_size=5');
 
   useEffect(() => {
-    if (articles) {
-      // Get 5 most recent articles
-      setRecentArticles(articles.slice(0, 5));
+    if (articles?.results) {
+      // 5 most recent articles (the list is newest first)
+      setRecentArticles(articles.results);
     }
   }, [articles]);
 
@@ -49,10 +49,10 @@ const Dashboard = () => {
     return <AdminSomethingWentWrong message={statsErrorMessage || profileErrorMessage || articlesErrorMessage} />;
   }
 
-  // Simulate article status distribution
+  // Article status distribution from the dashboard counters
   const articleStatusData = [
-    { name: 'Published', value: articles ? articles.filter(a => a.status === 'published').length : 0, color: '#10B981' },
-    { name: 'Draft', value: articles ? articles.filter(a => a.status === 'draft').length : 0, color: '#F59E0B' }
+    { name: 'Published', value: stats?.publishedArticles || 0, color: '#10B981' },
+    { name: 'Draft', value: stats?.draftArticles || 0, color: '#F59E0B' }
   ];
 
   // Calculate system health metrics (simulated)
@@ -1,6 +1,7 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useMemo, useCallback } from 'react';
 import { motion, AnimatePresence } from 'framer-motion';
 import useAuthHttp from '../../hooks/useAuthHttp';
+import useAdminEvents from '../../hooks/useAdminEvents';
 import SpinLoader from '../../components/loaders/SpinLoader';
 import AdminSomethingWentWrong from '../../components/admin/errors/AdminSomethingWentWrong';
 import { showSuccessToast, showErrorToast } from '../../utils/toastNotifs';
@@ -17,26 +18,50 @@ import UsersTable from '../../components/admin/UsersTable';
 const Users = () => {
   const navigate = useNavigate();
   const location = useLocation();
-  const [usersList, setUsersList] = useState([]);
-  const [filteredUsers, setFilteredUsers] = useState([]);
   const [searchQuery, setSearchQuery] = useState('');
-  const [firstLastIndex, setFirstLastIndex] = useState({
-    firstIndex: null,
-    lastIndex: null
-  });
+  const [debouncedSearch, setDebouncedSearch] = useState('');
   const [filters, setFilters] = useState({
     status: 'all', // 'all', 'active', 'inactive'
     type: 'all'    // 'all', 'admin', 'normal'
   });
   const [currentPage, setCurrentPage] = useState(1);
   const [usersPerPage, setUsersPerPage] = useState(5);
+
+  // Filtering, search (username/email prefix) and pagination happen on the server
+  const usersUrl = useMemo(() => {
+    const params = new URLSearchParams({ page: currentPage, page_size: usersPerPage });
+    if (filters.status !== 'all') params.set('is_active', filters.status === 'active');
+    if (filters.type !== 'all') params.set('is_staff', filters.type === 'admin');
+    if (debouncedSearch.trim()) params.set('search', debouncedSearch.trim());
+    return `http://localhost:8000/api/admin/users/?${params}`;
+  }, [currentPage, usersPerPage, filters, debouncedSearch]);
+
   const { 
     data, 
     isError, 
     errorMessage,
     isLoading, 
     sendRequest 
-  } = useAuthHttp('http://localhost:8000/api/admin/users');
+  } = useAuthHttp(usersUrl);
+
+  // Total user count from the dashboard counters
+  const { data: statsData } = useAuthHttp('http://localhost:8000/api/admin/stats/');
+
+  // Live changes from other tabs and admins: patch rows in place, refetch
+  // the page when rows come or go
+  const [rowPatches, setRowPatches] = useState({});
+  useEffect(() => setRowPatches({}), [data]);
+  useAdminEvents('user', useCallback((event) => {
+    if (event.action === 'updated') {
+      const { username, is_active, is_staff } = event.state;
+      setRowPatches(prev => ({
+        ...prev,
+        [event.id]: { username, isActive: is_active, permission: is_staff ? 'admin' : 'user' }
+      }));
+    } else {
+      sendRequest();
+    }
+  }, [sendRequest]));
 
   // Filter configuration for the users page
   const usersFilterConfig = [
@@ -86,18 +111,11 @@ const Users = () => {
     }
   }, []);
 
+  // Debounce search so typing doesn't send a request per keystroke
   useEffect(() => {
-    if (data) {
-      let users = [];
-      if (Array.isArray(data)) {
-        users = data;
-      } else if (data.users) {
-        users = data.users;
-      }
-      setUsersList(users);
-      setFilteredUsers(users);
-    }
-  }, [data]);
+    const timer = setTimeout(() => setDebouncedSearch(searchQuery), 300);
+    return () => clearTimeout(timer);
+  }, [searchQuery]);
 
   // Save current state when it changes
   useEffect(() => {
@@ -107,60 +125,12 @@ const Users = () => {
     sessionStorage.setItem('adminUserListSearch', searchQuery);
   }, [currentPage, filters, usersPerPage, searchQuery]);
 
-  // Apply search and filters when users list, filters, or search query changes
-  useEffect(() => {
-    if (usersList.length > 0) {
-      let result = [...usersList];
-      
-      // Apply search filter
-      if (searchQuery.trim()) {
-        const query = searchQuery.toLowerCase();
-        result = result.filter(user => 
-          user.username.toLowerCase().includes(query) ||
-          (user.email && user.email.toLowerCase().includes(query)) ||
-          (user.first_name && user.first_name.toLowerCase().includes(query)) ||
-          (user.last_name && user.last_name.toLowerCase().includes(query))
-        );
-      }
-      
-      // Apply status filter
-      if (filters.status === 'active') {
-        result = result.filter(user => user.isActive === true);
-      } else if (filters.status === 'inactive') {
-        result = result.filter(user => user.isActive === false);
-      }
-      
-      // Apply type filter
-      if (filters.type === 'admin') {
-        result = result.filter(user => user.permission === 'admin' || user.is_superuser === true);
-      } else if (filters.type === 'normal') {
-        result = result.filter(user => user.permission !== 'admin' && user.is_superuser !== true);
-      }
-      
-      setFilteredUsers(() => {
-        if (usersPerPage >= result.length) {
-          setCurrentPage(1);
-        }
-        return result;
-      });
-    }
-  }, [filters, usersList, searchQuery]);
-
-  // Apply pagination
-  useEffect(() => {
-    if (filteredUsers.length > 0) {
-      const indexOfLastUser = currentPage * usersPerPage;
-      const indexOfFirstUser = indexOfLastUser - usersPerPage;
-      
-      setFirstLastIndex({
-        firstIndex: indexOfFirstUser,
-        lastIndex: indexOfLastUser
-      })
-    }
-  }, [filteredUsers, currentPage, usersPerPage]);
-   
   // Calculate pagination controls
-  const totalPages = Math.ceil(filteredUsers.length / usersPerPage);
+  const users = (data?.results || []).map(user =>
+    rowPatches[user.id] ? { ...user, ...rowPatches[user.id] } : user
+  );
+  const totalCount = data?.count || 0;
+  const totalPages = Math.ceil(totalCount / usersPerPage);
   
   const handlePageChange = (pageNumber) => {
     setCurrentPage(pageNumber);
@@ -171,7 +141,8 @@ const Users = () => {
     setCurrentPage(1); // Reset to first page when page size changes
   };
 
-  if (isLoading) {
+  // Keep the table (and the search box focus) while later pages load
+  if (isLoading && !data?.results) {
     return <SpinLoader />;
   }
 
@@ -184,11 +155,18 @@ const Users = () => {
       ...prev,
       [filterType]: value
     }));
+    setCurrentPage(1);
+  };
+
+  const handleSearchChange = (query) => {
+    setSearchQuery(query);
+    setCurrentPage(1);
   };
 
   const handleClearFilters = () => {
     setFilters({ status: 'all', type: 'all' });
     setSearchQuery('');
+    setCurrentPage(1);
   };
 
   const handleDeactivate = async (userId) => {
@@ -210,15 +188,7 @@ const Users = () => {
         showSuccessToast('User status updated successfully');
         
         // Refresh user list
-        const response = await sendRequest();
-        
-        if (response) {
-          if (Array.isArray(response)) {
-            setUsersList(response);
-          } else if (response.users) {
-            setUsersList(response.users);
-          }
-        }
+        await sendRequest();
       } else {
         showErrorToast('Failed to update user status');
       }
@@ -246,7 +216,7 @@ const Users = () => {
           </svg>
         }
         searchQuery={searchQuery}
-        onSearchChange={setSearchQuery}
+        onSearchChange={handleSearchChange}
         searchPlaceholder="Search users..."
       />
       
@@ -255,26 +225,26 @@ const Users = () => {
         onFilterChange={handleFilterChange}
         onClearFilters={handleClearFilters}
         filterConfig={usersFilterConfig}
-        totalItems={usersList.length}
-        filteredItems={filteredUsers.length}
+        totalItems={statsData ? statsData.normalUsers + statsData.adminUsers : totalCount}
+        filteredItems={totalCount}
         searchQuery={searchQuery}
       />
       
       <div className="overflow-x-auto">
         <UsersTable 
-          filteredUsers={filteredUsers}
-          firstLastIndex={firstLastIndex}
+          filteredUsers={users}
+          firstLastIndex={{ firstIndex: 0, lastIndex: users.length }}
           handleDeactivate={handleDeactivate}
           handleUserEdit={handleUserEdit}
         />
       </div>
 
-      {filteredUsers.length > 0 && (
+      {totalCount > 0 && (
         <AdminPagination
           currentPage={currentPage}
           totalPages={totalPages}
           itemsPerPage={usersPerPage}
-          totalItems={filteredUsers.length}
+          totalItems={totalCount}
           onPageChange={handlePageChange}
           onItemsPerPageChange={handlePageSizeChange}
         />